@@ -6,12 +6,14 @@ CREATE TABLE IF NOT EXISTS events (
     web_url TEXT NOT NULL,
     validator_id VARCHAR(255) NOT NULL,
     event_data JSONB NOT NULL,
-    created_at TIMESTAMPTZ DEFAULT NOW()
+    -- Insert time, not transaction start, so keyset readers (/get_events/ cursors) do not skip late commits
+    created_at TIMESTAMPTZ DEFAULT clock_timestamp()
 );
 
-CREATE INDEX IF NOT EXISTS idx_events_web_url ON events(web_url);
-CREATE INDEX IF NOT EXISTS idx_events_web_agent_id ON events(web_agent_id);
-CREATE INDEX IF NOT EXISTS idx_events_validator_id ON events(validator_id);
+-- Every events query filters on (web_url, web_agent_id, validator_id) and reads newest first.
+-- Existing databases: apply postgres/migrations/001_events_lookup_index.sql
+CREATE INDEX IF NOT EXISTS idx_events_lookup ON events(web_url, web_agent_id, validator_id, created_at DESC);
+-- Large deployments can partition events by day and validator: postgres/migrations/002_events_partitioned.sql
 
 -- Table for storing master data pools (one per project/entity)
 CREATE TABLE IF NOT EXISTS master_datasets (
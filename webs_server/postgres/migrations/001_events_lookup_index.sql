@@ -0,0 +1,30 @@
+-- Replace the single-column events indexes with one composite index on the lookup key.
+--
+-- SELECT_EVENTS_SQL and DELETE_EVENTS_SQL filter on (web_url, web_agent_id, validator_id) and the
+-- select orders by created_at DESC. With three single-column indexes Postgres bitmap-ANDs them and
+-- sorts; the composite index answers both with one index scan, already in created_at DESC order.
+-- web_url-only lookups are still served by its leading column.
+--
+-- Idempotent, and CONCURRENTLY keeps the table writable while the index builds. Run it outside a
+-- transaction block (psql's default autocommit), e.g.:
+--   docker compose exec -T db psql -U webs_user -d autoppia_db -v ON_ERROR_STOP=1 < postgres/migrations/001_events_lookup_index.sql
+
+-- A failed concurrent build leaves an INVALID index behind; drop it so the build is retried
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = 'idx_events_lookup' AND NOT i.indisvalid
+    ) THEN
+        EXECUTE 'DROP INDEX idx_events_lookup';
+    END IF;
+END
+$$;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_lookup ON events (web_url, web_agent_id, validator_id, created_at DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_events_web_url;
+DROP INDEX CONCURRENTLY IF EXISTS idx_events_web_agent_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_events_validator_id;
+
+ANALYZE events;
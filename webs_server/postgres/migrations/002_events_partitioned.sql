@@ -0,0 +1,172 @@
+-- Opt-in: partition events by validator (LIST on validator_id), one partition per validator.
+--
+-- Whole-validator work then touches one table instead of its rows:
+--   * DELETE /reset_events/validator truncates the validator's partition (reset_validator_events).
+--   * Retention (EVENTS_RETENTION_DAYS) drops the partitions of validators with no newer event
+--     (drop_idle_validator_partitions).
+-- Per-key /reset_events/ and the lookups are pruned to the validator's partition.
+--
+-- Partitions are created on demand. A validator without one writes to events_default until the
+-- server's maintenance job (create_pending_validator_partitions) or its first reset gives it one;
+-- create_validator_partition moves its rows out of events_default before attaching, so the attach
+-- never trips over them. The server detects the partitioned table at startup and runs that job.
+--
+-- An existing events table is renamed to events_unpartitioned and its rows are copied over into one
+-- partition per validator; it is left in place, drop it once the new table is verified. Stop the
+-- API (writers) first and run the whole file in one transaction, e.g.:
+--   docker compose exec -T db psql -U webs_user -d autoppia_db -1 -v ON_ERROR_STOP=1 < postgres/migrations/002_events_partitioned.sql
+
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = to_regclass('events')) = 'r' THEN
+        ALTER TABLE events RENAME TO events_unpartitioned;
+        ALTER INDEX IF EXISTS events_pkey RENAME TO events_unpartitioned_pkey;
+        ALTER INDEX IF EXISTS idx_events_lookup RENAME TO idx_events_unpartitioned_lookup;
+    END IF;
+END
+$$;
+
+-- Ids continue from the SERIAL sequence of the old table (events.id stays its owner, so
+-- pg_get_serial_sequence('events', 'id') keeps working for the write-behind id reservation)
+CREATE SEQUENCE IF NOT EXISTS events_id_seq AS integer;
+
+-- Unique constraints on a partitioned table must include the partition key
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER NOT NULL DEFAULT nextval('events_id_seq'),
+    web_agent_id VARCHAR(255) NOT NULL,
+    web_url TEXT NOT NULL,
+    validator_id VARCHAR(255) NOT NULL,
+    event_data JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
+    PRIMARY KEY (id, validator_id)
+) PARTITION BY LIST (validator_id);
+
+ALTER SEQUENCE events_id_seq OWNED BY events.id;
+
+CREATE INDEX IF NOT EXISTS idx_events_lookup ON events (web_url, web_agent_id, validator_id, created_at DESC);
+-- Newest event of a partition (retention) and the rows of one validator in events_default
+CREATE INDEX IF NOT EXISTS idx_events_validator ON events (validator_id, created_at);
+
+-- Rows of validators without a partition yet, so inserts never fail
+CREATE TABLE IF NOT EXISTS events_default PARTITION OF events DEFAULT;
+
+-- Validator ids are free text of up to 255 characters; partitions are named by a hash of them
+CREATE OR REPLACE FUNCTION events_validator_partition(validator varchar)
+RETURNS text
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT 'events_v_' || left(md5(validator), 16)
+$$;
+
+-- Gives validator its partition, moving its rows out of events_default first; returns false when
+-- it already has one.
+CREATE OR REPLACE FUNCTION create_validator_partition(validator varchar)
+RETURNS boolean
+LANGUAGE plpgsql AS $$
+DECLARE
+    part text := events_validator_partition(validator);
+BEGIN
+    -- Every API worker runs the maintenance job; serialize them
+    PERFORM pg_advisory_xact_lock(hashtext('events_partitions'));
+    IF to_regclass(part) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+    -- Holds back writes to events_default (not reads) until the partition is attached, so no row
+    -- of validator lands there after the move
+    LOCK TABLE events_default IN EXCLUSIVE MODE;
+    -- The CHECK constraint lets ATTACH skip scanning the new table
+    EXECUTE format('CREATE TABLE %I (LIKE events INCLUDING DEFAULTS, CHECK (validator_id = %L))', part, validator);
+    EXECUTE format('INSERT INTO %I SELECT * FROM events_default WHERE validator_id = $1', part) USING validator;
+    DELETE FROM events_default WHERE validator_id = validator;
+    EXECUTE format('ALTER TABLE events ATTACH PARTITION %I FOR VALUES IN (%L)', part, validator);
+    RETURN true;
+END
+$$;
+
+-- Gives a partition to every validator with rows in events_default; returns those validators.
+CREATE OR REPLACE FUNCTION create_pending_validator_partitions()
+RETURNS SETOF varchar
+LANGUAGE plpgsql AS $$
+DECLARE
+    validator varchar;
+BEGIN
+    FOR validator IN SELECT DISTINCT validator_id FROM events_default ORDER BY 1 LOOP
+        IF create_validator_partition(validator) THEN
+            RETURN NEXT validator;
+        END IF;
+    END LOOP;
+END
+$$;
+
+-- Drops the partitions whose newest event is older than cutoff (empty partitions, e.g. right after
+-- a reset, are kept); returns the partitions dropped.
+CREATE OR REPLACE FUNCTION drop_idle_validator_partitions(cutoff timestamptz)
+RETURNS SETOF text
+LANGUAGE plpgsql AS $$
+DECLARE
+    part text;
+    newest timestamptz;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('events_partitions'));
+    FOR part IN
+        SELECT c.relname::text
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'events'::regclass
+          AND c.relname ~ '^events_v_[0-9a-f]{16}$'
+        ORDER BY c.relname
+    LOOP
+        -- The equality on validator_id lets max() read the end of idx_events_validator
+        EXECUTE format(
+            'SELECT max(created_at) FROM %1$I WHERE validator_id = (SELECT validator_id FROM %1$I LIMIT 1)',
+            part
+        ) INTO newest;
+        IF newest < cutoff THEN
+            EXECUTE format('DROP TABLE %I', part);
+            RETURN NEXT part;
+        END IF;
+    END LOOP;
+END
+$$;
+
+-- Superseded: the validator reset truncates the validator's partition instead of deleting rows
+DROP FUNCTION IF EXISTS reset_validator_events(varchar);
+
+-- Deletes every stored event of validator. With a partition this is a TRUNCATE, and deleted is the
+-- statistics' live-row estimate (truncated = true); counting would read every row. Otherwise its
+-- rows are deleted from events_default, without being returned, and it gets a partition, so its
+-- later resets truncate.
+CREATE FUNCTION reset_validator_events(validator varchar, OUT deleted bigint, OUT truncated boolean)
+LANGUAGE plpgsql AS $$
+DECLARE
+    part regclass := to_regclass(events_validator_partition(validator));
+BEGIN
+    IF part IS NULL THEN
+        DELETE FROM events_default WHERE validator_id = validator;
+        GET DIAGNOSTICS deleted = ROW_COUNT;
+        PERFORM create_validator_partition(validator);
+        truncated := false;
+    ELSE
+        deleted := GREATEST(pg_stat_get_live_tuples(part), 0);
+        EXECUTE format('TRUNCATE %s', part);
+        truncated := true;
+    END IF;
+END
+$$;
+
+-- One partition per validator of the copied rows (so the copy bypasses events_default), then the copy
+DO $$
+DECLARE
+    validator varchar;
+BEGIN
+    IF to_regclass('events_unpartitioned') IS NOT NULL AND NOT EXISTS (SELECT 1 FROM events) THEN
+        FOR validator IN EXECUTE 'SELECT DISTINCT validator_id FROM events_unpartitioned' LOOP
+            PERFORM create_validator_partition(validator);
+        END LOOP;
+        EXECUTE 'INSERT INTO events (id, web_agent_id, web_url, validator_id, event_data, created_at)
+                 SELECT id, web_agent_id, web_url, validator_id, event_data, COALESCE(created_at, NOW())
+                 FROM events_unpartitioned';
+    END IF;
+END
+$$;
+
+ANALYZE events;
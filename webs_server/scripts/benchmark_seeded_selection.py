@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Benchmark and reproducibility checks for seeded selection.
+
+Times seeded_select, seeded_shuffle, seeded_filter_and_select, seeded_distribution and the
+server's _apply_seeded_selection over synthetic pools (200 to 1M items by default) and writes
+ops/sec, peak traced memory and net allocated blocks per call to a JSON file, so runs from
+different releases can be compared.
+
+Golden outputs (tests/golden/seeded_selection.json) pin the items each seed returns. Every
+engine (the list functions with and without the permutation table, IndexSelector and the
+server path) must reproduce them; non-default SELECTION_MODE / SHUFFLE_MODE intentionally
+change the server's picks and are expected to fail the check.
+
+Usage:
+  python webs_server/scripts/benchmark_seeded_selection.py --output bench.json
+  python webs_server/scripts/benchmark_seeded_selection.py --sizes 200,10000 --min-time 0.2
+  python webs_server/scripts/benchmark_seeded_selection.py --check-golden
+  python webs_server/scripts/benchmark_seeded_selection.py --update-golden
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, Dict, List
+
+# In the image scripts live next to the server modules; locally they are in ../src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import seeded_selector  # noqa: E402
+import server  # noqa: E402
+from data_handler import DataPool  # noqa: E402
+from seeded_selector import (  # noqa: E402
+    SELECTION_MODE_COMPAT,
+    IndexSelector,
+    seeded_distribution,
+    seeded_filter_and_select,
+    seeded_select,
+    seeded_shuffle,
+)
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests", "golden", "seeded_selection.json")
+# Bump when the layout of the results file changes
+RESULTS_FORMAT = 1
+
+METHODS = ("select", "shuffle", "filter", "distribute", "distribute_proportional")
+CATEGORY_KEY = "category"
+FILTER_VALUES = ("c1", "c2")
+DEFAULT_SIZES = (200, 1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_COUNT = 50
+# Seeds cycled through by the timing loop (the 1-999 range requests use, minus the seed=1 bypass)
+BENCH_SEEDS = tuple(range(2, 1000))
+# Golden cases: seeds inside and outside the permutation table range
+GOLDEN_SIZES = (200, 5_000)
+GOLDEN_SEEDS = (1, 2, 42, 999, 1_000, 123_456)
+GOLDEN_COUNT = 20
+
+Engine = Callable[[str, int, int], List[Dict[str, Any]]]
+
+
+def make_pool(size: int, categories: int = 8) -> List[Dict[str, Any]]:
+    """Synthetic items with skewed categories (the last one holds about half the pool)."""
+    names = [f"c{i}" for i in range(categories)]
+    return [{"id": i, CATEGORY_KEY: names[min(i % (2 * categories), categories - 1)], "price": (i * 37) % 1000} for i in range(size)]
+
+
+def _run_functions(pool: List[Dict[str, Any]], method: str, seed: int, count: int) -> List[Dict[str, Any]]:
+    if method == "select":
+        return seeded_select(pool, seed, count)
+    if method == "shuffle":
+        return seeded_shuffle(pool, seed, limit=count)
+    if method == "filter":
+        return seeded_filter_and_select(pool, seed, count, CATEGORY_KEY, list(FILTER_VALUES))
+    return seeded_distribution(pool, seed, CATEGORY_KEY, count, proportional=method == "distribute_proportional")
+
+
+def _run_functions_uncached(pool: List[Dict[str, Any]], method: str, seed: int, count: int) -> List[Dict[str, Any]]:
+    """The list functions with the permutation table disabled: plain random.Random, the reference."""
+    saved = seeded_selector.SEED_PERMUTATION_CACHE_BYTES
+    seeded_selector.SEED_PERMUTATION_CACHE_BYTES = 0
+    try:
+        return _run_functions(pool, method, seed, count)
+    finally:
+        seeded_selector.SEED_PERMUTATION_CACHE_BYTES = saved
+
+
+def _run_selector(selector: IndexSelector, method: str, seed: int, count: int) -> List[Dict[str, Any]]:
+    if method == "select":
+        positions = selector.select(seed, count)
+    elif method == "shuffle":
+        positions = selector.shuffle(seed, limit=count)
+    elif method == "filter":
+        positions = selector.filter_select(seed, count, CATEGORY_KEY, list(FILTER_VALUES))
+    else:
+        positions = selector.distribute(seed, CATEGORY_KEY, count, proportional=method == "distribute_proportional")
+    return selector.materialize(positions)
+
+
+def _run_server(pool: DataPool, method: str, seed: int, count: int) -> List[Dict[str, Any]]:
+    allocation = "proportional" if method == "distribute_proportional" else "equal"
+    return server._apply_seeded_selection(pool, seed, count, method.split("_")[0], CATEGORY_KEY, ",".join(FILTER_VALUES), allocation)
+
+
+# Engine name -> factory binding an engine to a pool (per-pool state such as indexes is built once)
+ENGINES: Dict[str, Callable[[List[Dict[str, Any]]], Engine]] = {
+    "functions": lambda pool: partial(_run_functions, pool),
+    "functions_uncached": lambda pool: partial(_run_functions_uncached, pool),
+    "selector": lambda pool: partial(_run_selector, IndexSelector(pool, SELECTION_MODE_COMPAT)),
+    "server": lambda pool: partial(_run_server, DataPool(pool)),
+}
+
+
+def golden_outputs() -> Dict[str, Any]:
+    """Golden cases computed with the reference engine (functions_uncached)."""
+    cases = []
+    for size in GOLDEN_SIZES:
+        engine = ENGINES["functions_uncached"](make_pool(size))
+        for method in METHODS:
+            for seed in GOLDEN_SEEDS:
+                ids = [item["id"] for item in engine(method, seed, GOLDEN_COUNT)]
+                cases.append({"method": method, "size": size, "seed": seed, "ids": ids})
+    return {"format": 1, "count": GOLDEN_COUNT, "cases": cases}
+
+
+def check_golden(path: str = GOLDEN_PATH) -> List[str]:
+    """Replay every golden case on every engine; returns one message per mismatch (empty when all match)."""
+    with open(path, "r", encoding="utf-8") as f:
+        golden = json.load(f)
+    failures = []
+    engines_by_size: Dict[int, Dict[str, Engine]] = {}
+    for case in golden["cases"]:
+        size = case["size"]
+        if size not in engines_by_size:
+            pool = make_pool(size)
+            engines_by_size[size] = {name: factory(pool) for name, factory in ENGINES.items()}
+        for name, engine in engines_by_size[size].items():
+            ids = [item["id"] for item in engine(case["method"], case["seed"], golden["count"])]
+            if ids != case["ids"]:
+                failures.append(f"{name}: method={case['method']} size={size} seed={case['seed']} differs from golden output")
+    return failures
+
+
+def _measure(engine: Engine, method: str, count: int, min_time: float) -> Dict[str, Any]:
+    """Time engine until min_time has elapsed, then trace one more call for memory."""
+    engine(method, BENCH_SEEDS[0], count)  # build lazy per-pool state outside the timing
+    calls = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time or calls == 0:
+        engine(method, BENCH_SEEDS[calls % len(BENCH_SEEDS)], count)
+        calls += 1
+        elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    blocks_before = sys.getallocatedblocks()
+    result = engine(method, BENCH_SEEDS[calls % len(BENCH_SEEDS)], count)
+    net_blocks = sys.getallocatedblocks() - blocks_before
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    del result
+    return {"calls": calls, "seconds": round(elapsed, 6), "ops_per_sec": round(calls / elapsed, 2), "peak_bytes": peak, "net_blocks": net_blocks}
+
+
+def run_benchmark(sizes: List[int], engines: List[str], count: int = DEFAULT_COUNT, min_time: float = 0.5) -> Dict[str, Any]:
+    """Benchmark every method on every engine and pool size; returns the results document."""
+    results = []
+    for size in sizes:
+        pool = make_pool(size)
+        for name in engines:
+            engine = ENGINES[name](pool)
+            for method in METHODS:
+                record = {"engine": name, "method": method, "size": size, "count": count}
+                record.update(_measure(engine, method, count, min_time))
+                results.append(record)
+                print(f"{name:<19} {method:<24} n={size:<9} {record['ops_per_sec']:>12.1f} ops/s  peak={record['peak_bytes']:>11} B  blocks={record['net_blocks']}")
+        del pool
+    return {
+        "format": RESULTS_FORMAT,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "selection_mode": server.SELECTION_MODE,
+        "shuffle_mode": server.SHUFFLE_MODE,
+        "permutation_cache_bytes": seeded_selector.SEED_PERMUTATION_CACHE_BYTES,
+        "results": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark seeded selection and check golden outputs.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="Comma-separated pool sizes")
+    parser.add_argument("--engines", default=",".join(ENGINES), help=f"Comma-separated engines ({', '.join(ENGINES)})")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="Items selected per call")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds spent timing each case")
+    parser.add_argument("--output", default="seeded_selection_benchmark.json", help="Where to write the JSON results")
+    parser.add_argument("--check-golden", action="store_true", help="Only check every engine against the golden outputs")
+    parser.add_argument("--update-golden", action="store_true", help="Regenerate the golden outputs from the reference engine")
+    args = parser.parse_args()
+
+    if args.update_golden:
+        with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+            json.dump(golden_outputs(), f, indent=1)
+            f.write("\n")
+        print(f"Wrote {GOLDEN_PATH}")
+        return 0
+
+    failures = check_golden()
+    for failure in failures:
+        print(f"GOLDEN MISMATCH {failure}")
+    if args.check_golden or failures:
+        print("Golden outputs match" if not failures else f"{len(failures)} golden mismatch(es)")
+        return 1 if failures else 0
+
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+    unknown = [e for e in engines if e not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engine(s): {', '.join(unknown)}")
+    document = run_benchmark([int(s) for s in args.sizes.split(",") if s.strip()], engines, args.count, args.min_time)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=1)
+        f.write("\n")
+    print(f"Wrote {len(document['results'])} results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Fold JSONL append tails ({entity}.jsonl, written when DATA_APPEND_FORMAT=jsonl) back into their
+JSON array files for every project under BASE_DATA_PATH.
+
+Usage:
+  BASE_DATA_PATH=/app/data python webs_server/scripts/compact_data_files.py
+  BASE_DATA_PATH=/app/data python webs_server/scripts/compact_data_files.py --projects web_5_autocrm
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+# In the image scripts live next to the server modules; locally they are in ../src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import data_handler  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compact JSONL append tails into JSON array files.")
+    parser.add_argument("--projects", default="", help="Comma-separated project keys (default: all)")
+    args = parser.parse_args()
+
+    selected = {p.strip() for p in args.projects.split(",") if p.strip()}
+    total = 0
+    for project_key in sorted(data_handler.get_allowed_project_keys()):
+        if selected and project_key not in selected:
+            continue
+        count = data_handler.compact_jsonl_tails(project_key)
+        if count:
+            print(f"{project_key}: compacted {count} file(s)")
+        total += count
+    print(f"Done: {total} file(s) compacted")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,13 @@ PORT=${PORT:-8080}
 WORKERS=${WORKERS:-4}
 LOG_LEVEL=${LOG_LEVEL:-info}
 KEEP_ALIVE=${KEEP_ALIVE:-30}
+# Packed, memory-mapped pool store shared by all workers (set to empty to disable)
+export SHARED_POOL_STORE_PATH=${SHARED_POOL_STORE_PATH-/tmp/webs_pool_store.bin}
+
+if [ -n "$SHARED_POOL_STORE_PATH" ]; then
+    python shared_pool_store.py "$SHARED_POOL_STORE_PATH" \
+        || echo "Shared pool store build failed; workers will parse data files themselves" >&2
+fi
 
 exec uvicorn server:app \
     --host $HOST \
@@ -9,15 +9,28 @@ Path layout (flat per project):
     {entity}.json          # Data files (e.g. movies.json, restaurants.json)
     {entity}_{timestamp}.json   # Optional rollover files
   All paths in main.json are relative to the project dir (e.g. "./movies.json").
+
+Parsed main.json and data files are cached per worker process and revalidated by (mtime, size),
+so repeated loads of unchanged files do not re-read or re-parse them. load_pool_async does the
+same work on a bounded thread pool so async endpoints never block on file I/O or parsing.
+
+With DATA_APPEND_FORMAT=jsonl, appends go to a newline-delimited tail next to the target file
+({entity}.json -> {entity}.jsonl) instead of rewriting the whole array; loads read the tail right
+after its array file, and compact_jsonl_tails folds tails back into the arrays.
 """
 
 import os
 import re
+import asyncio
 import json
 import fcntl
+import hashlib
 import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, Iterator, List, Optional, Sequence, Tuple
+import orjson
 from loguru import logger
 
 try:
@@ -33,8 +46,20 @@ BASE_PATH = os.getenv("BASE_DATA_PATH", "/app/data")
 # Maximum size for a single data file (10 MB)
 DATA_FILE_MAX_BYTES = int(os.getenv("DATA_FILE_MAX_BYTES", 10 * 1024 * 1024))
 
+# On-disk format for appends: "json" rewrites the array file, "jsonl" appends records to its .jsonl tail
+DATA_APPEND_FORMAT = os.getenv("DATA_APPEND_FORMAT", "json").lower()
+
+# Worker threads for async loads (file stats, reads and parsing off the event loop)
+DATA_LOAD_THREADS = max(1, int(os.getenv("DATA_LOAD_THREADS", "4")))
+
+# Distinct fields= projections memoized per pool; further field lists are encoded on every access
+DATA_POOL_PROJECTIONS_MAX = int(os.getenv("DATA_POOL_PROJECTIONS_MAX", "8"))
+
 _MSG_PATH_OUTSIDE_BASE = "Project path outside base"
 
+# File signature used for cache invalidation: (path, st_mtime_ns, st_size)
+FileSignature = Tuple[str, int, int]
+
 
 def get_main_path(web_name: str) -> str:
     """Return path to main.json for a given web_name."""
@@ -53,7 +78,7 @@ def get_allowed_project_keys() -> List[str]:
     """
     if not os.path.isdir(BASE_PATH):
         return []
-    return [d for d in os.listdir(BASE_PATH) if os.path.isdir(os.path.join(BASE_PATH, d)) and _SAFE_SEGMENT_RE.match(d)]
+    return [d for d in os.listdir(BASE_PATH) if os.path.isdir(os.path.join(BASE_PATH, d)) and is_safe_name(d)]
 
 
 # Safe path segment: alphanumeric, underscore, hyphen (e.g. web_4_autodining, restaurants)
@@ -62,9 +87,14 @@ _SAFE_SEGMENT_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
 _SAFE_FILENAME_RE = re.compile(r"^[a-zA-Z0-9_.-]+$")
 
 
+def is_safe_name(value: str) -> bool:
+    """Whether value is a valid project key or entity type: one safe path segment (alphanumeric, underscore, hyphen)."""
+    return bool(value) and _SAFE_SEGMENT_RE.match(value) is not None
+
+
 def _validate_safe_segment(value: str, name: str = "value") -> None:
     """Raise ValueError if value is not a safe path segment (prevents path traversal)."""
-    if not value or not _SAFE_SEGMENT_RE.match(value):
+    if not is_safe_name(value):
         raise ValueError(f"Invalid {name}: only alphanumeric, underscore, hyphen allowed")
 
 
@@ -134,21 +164,24 @@ def _get_validated_main_io_path(web_name: str) -> Optional[Tuple[str, str]]:
     """
     Resolve main.json path only from allowlisted project keys (not from web_name in path).
     Path is built from BASE_PATH + allowlist entry so CodeQL does not see user input in path.
+    Served from the project path index; only unknown keys trigger a directory scan.
     """
     _validate_safe_segment(web_name, "web_name")
-    allowed = get_allowed_project_keys()
-    if web_name not in allowed:
+    entry = _get_project_paths(web_name)
+    if entry is None:
         return None
-    for main_dir in allowed:
-        if main_dir == web_name:
-            main_path = os.path.join(BASE_PATH, main_dir, "main.json")
-            try:
-                main_io = _path_for_io_under_base(main_path)
-            except ValueError:
-                return None
-            web_base = os.path.dirname(main_path)
-            return (web_base, main_io)
-    return None
+    return (entry.web_base, entry.main_io)
+
+
+def _index_project_main_path(main_dir: str) -> Optional[Tuple[str, str]]:
+    """Build and validate (web_base, main_io) for an allowlisted project directory name."""
+    main_path = os.path.join(BASE_PATH, main_dir, "main.json")
+    try:
+        main_io = _path_for_io_under_base(main_path)
+    except ValueError:
+        return None
+    web_base = os.path.dirname(main_path)
+    return (web_base, main_io)
 
 
 def _get_validated_path_under_base(web_base: str, rel_path: str) -> Optional[str]:
@@ -176,6 +209,94 @@ def _get_validated_path_under_base(web_base: str, rel_path: str) -> Optional[str
     return None
 
 
+# --- Project path index ---
+class _ProjectPaths:
+    """
+    Trusted paths for one project: validated main.json plus main.json entry -> validated data file.
+    files maps each path string from main.json to the result of _get_validated_path_under_base
+    (None when it is outside the project or missing) and is rebuilt when main_sig changes.
+    """
+
+    __slots__ = ("web_base", "main_io", "main_sig", "files")
+
+    def __init__(self, web_base: str, main_io: str):
+        self.web_base = web_base
+        self.main_io = main_io
+        self.main_sig: Optional[FileSignature] = None
+        self.files: Dict[str, Optional[str]] = {}
+
+
+# project key -> _ProjectPaths, valid for the BASE_PATH stored in _PATH_INDEX_BASE
+_PATH_INDEX: Dict[str, _ProjectPaths] = {}
+_PATH_INDEX_BASE: Optional[str] = None
+
+
+def build_path_index() -> int:
+    """
+    Scan BASE_PATH once and (re)build the project path index, including the validated data file
+    paths of every main.json. Called at startup; returns the number of indexed projects.
+    """
+    global _PATH_INDEX_BASE
+    projects: Dict[str, _ProjectPaths] = {}
+    for main_dir in get_allowed_project_keys():
+        validated = _index_project_main_path(main_dir)
+        if validated is None:
+            continue
+        entry = _ProjectPaths(*validated)
+        main_sig = _file_signature(entry.main_io)
+        if main_sig is not None:
+            try:
+                main = _read_main_json_file(main_dir, entry.main_io, main_sig)
+            except (OSError, json.JSONDecodeError) as exc:
+                logger.warning("Skipping unreadable main.json while indexing", extra={"web_name": main_dir, "error": str(exc)})
+                main = None
+            if main is not None:
+                _refresh_project_files(entry, main, main_sig)
+        projects[main_dir] = entry
+    with _CACHE_LOCK:
+        _PATH_INDEX.clear()
+        _PATH_INDEX.update(projects)
+        _PATH_INDEX_BASE = BASE_PATH
+    logger.info("Built data path index", extra={"base_path": BASE_PATH, "projects": len(projects)})
+    return len(projects)
+
+
+def _get_project_paths(web_name: str) -> Optional[_ProjectPaths]:
+    """Return the index entry for web_name; index it on first sight if it is an allowlisted project dir."""
+    if _PATH_INDEX_BASE != BASE_PATH:
+        build_path_index()
+    entry = _PATH_INDEX.get(web_name)
+    if entry is not None:
+        return entry
+    for main_dir in get_allowed_project_keys():
+        if main_dir == web_name:
+            validated = _index_project_main_path(main_dir)
+            if validated is None:
+                return None
+            entry = _ProjectPaths(*validated)
+            with _CACHE_LOCK:
+                _PATH_INDEX[main_dir] = entry
+            return entry
+    return None
+
+
+def _refresh_project_files(entry: _ProjectPaths, main: Dict[str, Any], main_sig: FileSignature) -> Dict[str, Optional[str]]:
+    """Return entry.files for this main.json version, re-validating every referenced path if main.json changed."""
+    if entry.main_sig == main_sig:
+        return entry.files
+    files: Dict[str, Optional[str]] = {}
+    for value in main.values():
+        if not isinstance(value, list):
+            continue
+        for rel_path in value:
+            if isinstance(rel_path, str) and rel_path not in files:
+                files[rel_path] = _get_validated_path_under_base(entry.web_base, rel_path)
+    # Publish files before the signature so readers that see the new signature see the new files
+    entry.files = files
+    entry.main_sig = main_sig
+    return files
+
+
 def _ensure_dir(path: str) -> None:
     """Ensure directory exists, creating it if necessary."""
     try:
@@ -219,6 +340,8 @@ def _parse_json_file_to_items(
             logger.warning("JSON file is empty", extra={"path": path_to_use})
             return None
         with open(path_to_use, "r", encoding="utf-8") as f:
+            if path_to_use.endswith(".jsonl"):
+                return _parse_jsonl_records(f, path_to_use)
             contents = json.load(f)
         if isinstance(contents, list):
             return contents
@@ -233,6 +356,60 @@ def _parse_json_file_to_items(
         return None
 
 
+def _parse_jsonl_records(lines: Any, path: str) -> List[Dict[str, Any]]:
+    """Parse newline-delimited JSON records; skip (and log) lines that are not valid JSON, e.g. a torn tail write."""
+    items: List[Dict[str, Any]] = []
+    for lineno, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping invalid JSONL record in {path}:{lineno}: {e}")
+            continue
+        if isinstance(record, list):
+            items.extend(record)
+        elif isinstance(record, dict):
+            items.append(record)
+    return items
+
+
+def _jsonl_tail_path(path_io: str) -> Optional[str]:
+    """Return the append tail path for a .json array file ({name}.json -> {name}.jsonl), else None."""
+    if not path_io.endswith(".json"):
+        return None
+    return f"{path_io}l"
+
+
+def _append_jsonl_records(tail_io: str, data: List[Dict[str, Any]]) -> None:
+    """
+    Append records to a JSONL tail in O(len(data)): one locked, fsync'd write at the end of the file.
+    If compaction removed the tail while we waited for the lock, reopen so records are not lost.
+    """
+    payload = b"".join(orjson.dumps(item) + b"\n" for item in data)
+    while True:
+        with open(tail_io, "a+b") as f:
+            fd = f.fileno()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                try:
+                    current_ino = os.stat(tail_io).st_ino
+                except FileNotFoundError:
+                    current_ino = None
+                if os.fstat(fd).st_ino != current_ino:
+                    continue
+                size = os.fstat(fd).st_size
+                # Start on a fresh line if a previous writer died mid-record
+                prefix = b"\n" if size and os.pread(fd, 1, size - 1) != b"\n" else b""
+                f.write(prefix + payload)
+                f.flush()
+                os.fsync(fd)
+                return
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+
 def _load_json_file_with_fallback(
     primary_path: str,
     fallback_path: Optional[str],
@@ -324,31 +501,215 @@ def save_data_file(web_name: str, filename: str, data: List[Dict[str, Any]], ent
     with open(main_io, "w", encoding="utf-8") as f:
         json.dump(main, f, indent=2, ensure_ascii=False)
 
+    _evict_written_entity(web_name, entity_type, main_changed=True)
     return file_io
 
 
-def load_all_data(
+# --- Parsed pool cache ---
+class DataPool:
+    """
+    Parsed items for one (web_name, entity_type, mode) load, as returned by load_pool.
+    Pools are cached and shared between requests in this worker: treat items as read-only.
+    A pool may be backed only by encoded item bytes (e.g. a shared_pool_store mapping). Indexing
+    and iteration then decode one item at a time without keeping it, so a selection decodes only
+    the items it returns; only items (the whole list) decodes and keeps every item.
+    """
+
+    __slots__ = ("_items", "signature", "_encoded", "_derived", "_projections")
+
+    def __init__(
+        self,
+        items: Optional[List[Dict[str, Any]]] = None,
+        signature: Tuple[FileSignature, ...] = (),
+        *,
+        encoded: Optional[Sequence[bytes]] = None,
+    ):
+        self._items = items if items is not None or encoded is not None else []
+        self.signature = signature
+        self._encoded = encoded
+        self._derived: Dict[str, Any] = {}
+        self._projections: Dict[Tuple[str, ...], _ProjectedItems] = {}
+
+    def __len__(self) -> int:
+        if self._items is not None:
+            return len(self._items)
+        return len(self._encoded or ())
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if self._items is None and self._encoded is not None:
+            return orjson.loads(self._encoded[index])
+        return self.items[index]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._items is None and self._encoded is not None:
+            return (orjson.loads(raw) for raw in self._encoded)
+        return iter(self.items)
+
+    @property
+    def items(self) -> List[Dict[str, Any]]:
+        """All parsed item dicts; a mapped pool decodes and keeps every item on first access."""
+        if self._items is None:
+            self._items = [orjson.loads(raw) for raw in self._encoded or ()]
+        return self._items
+
+    @property
+    def encoded(self) -> Sequence[bytes]:
+        """orjson bytes of each item (same order as items), encoded once per pool and reused by every response."""
+        if self._encoded is None:
+            self._encoded = [orjson.dumps(item) for item in self.items]
+        return self._encoded
+
+    def projected(self, fields: Tuple[str, ...]) -> Sequence[bytes]:
+        """
+        Encoded items reduced to fields (in that order; missing fields omitted). Items are
+        projected and encoded on first access and kept with the pool, for the first
+        DATA_POOL_PROJECTIONS_MAX distinct field lists; any other list is encoded on every access,
+        like iter_projected, so arbitrary fields= values cannot grow the pool without bound.
+        """
+        projection = self._projections.get(fields)
+        if projection is not None:
+            return projection
+        if len(self._projections) >= DATA_POOL_PROJECTIONS_MAX:
+            return _ProjectedItems(self, fields, memoize=False)
+        return self._projections.setdefault(fields, _ProjectedItems(self, fields))
+
+    def iter_projected(self, fields: Tuple[str, ...]) -> Iterator[bytes]:
+        """Like projected, but encodes items one at a time without keeping them (for streaming whole pools)."""
+        for index in range(len(self)):
+            yield _encode_projection(self[index], fields)
+
+    def derived(self, name: str, build: Callable[[], Any]) -> Any:
+        """
+        Per-pool memo for artifacts computed from the items (selection indexes, groupings).
+        Built on first use and dropped together with the pool when its files change.
+        """
+        value = self._derived.get(name)
+        if value is None:
+            value = self._derived.setdefault(name, build())
+        return value
+
+    @property
+    def version(self) -> str:
+        """Short stable hash of the (path, mtime, size) signatures the pool was built from."""
+        return hashlib.blake2b(repr(self.signature).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _encode_projection(item: Dict[str, Any], fields: Tuple[str, ...]) -> bytes:
+    return orjson.dumps({field: item[field] for field in fields if field in item})
+
+
+class _ProjectedItems(Sequence[bytes]):
+    """Lazily projected orjson bytes for each item of a pool, memoized unless memoize is False (see DataPool.projected)."""
+
+    __slots__ = ("_pool", "_fields", "_encoded")
+
+    def __init__(self, pool: DataPool, fields: Tuple[str, ...], memoize: bool = True):
+        self._pool = pool
+        self._fields = fields
+        self._encoded: Optional[List[Optional[bytes]]] = [None] * len(pool) if memoize else None
+
+    def __len__(self) -> int:
+        return len(self._pool)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if self._encoded is None:
+            return _encode_projection(self._pool[index], self._fields)
+        raw = self._encoded[index]
+        if raw is None:
+            raw = _encode_projection(self._pool[index], self._fields)
+            self._encoded[index] = raw
+        return raw
+
+
+# Cache key: (main_io, entity_type, first_file_only). Entries are reused while the stat
+# signatures of main.json and every referenced data file are unchanged.
+PoolKey = Tuple[str, Optional[str], bool]
+_POOL_CACHE: Dict[PoolKey, DataPool] = {}
+# Parsed main.json per path, keyed by its stat signature
+_MAIN_JSON_CACHE: Dict[str, Tuple[FileSignature, Dict[str, Any]]] = {}
+_CACHE_LOCK = threading.Lock()
+# Optional read-only source of pre-built pools shared by all workers (see shared_pool_store).
+# Any object with get(key, signature) -> Optional[DataPool]; consulted on cache misses only.
+_SHARED_POOL_SOURCE: Optional[Any] = None
+# Bounded pool for load_pool_async: file stats and parsing never run on the event loop
+_LOAD_EXECUTOR = ThreadPoolExecutor(max_workers=DATA_LOAD_THREADS, thread_name_prefix="data-load")
+# Parses in flight, keyed by file signature; concurrent loads of the same file share one future
+_INFLIGHT_PARSES: Dict[FileSignature, "Future[Optional[List[Dict[str, Any]]]]"] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _file_signature(path: str) -> Optional[FileSignature]:
+    """Return (path, mtime_ns, size) for path, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def set_shared_pool_source(source: Optional[Any]) -> None:
+    """Install (or remove, with None) the shared pool source and drop pools cached before it."""
+    global _SHARED_POOL_SOURCE
+    _SHARED_POOL_SOURCE = source
+    with _CACHE_LOCK:
+        _POOL_CACHE.clear()
+
+
+def clear_pool_cache() -> None:
+    """Drop the path index, cached main.json and parsed pools (e.g. in tests)."""
+    global _PATH_INDEX_BASE
+    with _CACHE_LOCK:
+        _POOL_CACHE.clear()
+        _MAIN_JSON_CACHE.clear()
+        _PATH_INDEX.clear()
+        _PATH_INDEX_BASE = None
+
+
+def _evict_written_entity(web_name: str, entity_type: Optional[str], main_changed: bool = False) -> None:
+    """
+    After a write to entity_type's files (every entity when None), drop the pools that contain
+    them: the entity's own and the project's all-entity pools. With main_changed, also forget
+    the parsed main.json and the indexed file paths of the project. Signatures catch most
+    changes on their own; this covers rewrites that keep size and mtime (coarse timestamps).
+    Other projects and entities stay cached.
+    """
+    entry = _PATH_INDEX.get(web_name)
+    if entry is None:
+        return
+    with _CACHE_LOCK:
+        for key in [k for k in _POOL_CACHE if k[0] == entry.main_io and (entity_type is None or k[1] in (entity_type, None))]:
+            del _POOL_CACHE[key]
+        if main_changed:
+            _MAIN_JSON_CACHE.pop(entry.main_io, None)
+            entry.main_sig = None
+
+
+def _is_first_file_only(seed_value: Optional[int]) -> bool:
+    """
+    True when only the first file per entity should be loaded: V2 disabled or seed=1.
+    v2 is disabled when ENABLE_DYNAMIC_V2 is "false", "0", "no", or "off".
+    """
+    v2_disabled_env_flag = os.getenv("ENABLE_DYNAMIC_V2", "false").lower() in {"false", "0", "no", "off"}
+    return v2_disabled_env_flag or seed_value == 1
+
+
+def load_pool(
     web_name: str,
     entity_type: Optional[str] = None,
     *,
     seed_value: Optional[int] = None,
-) -> List[Dict[str, Any]]:
+) -> DataPool:
     """
-    Load and return all JSON objects referenced in main.json for a given web_name.
-    If entity_type is provided, only load files listed under that entity key.
-
-    If V2 DB mode is disabled, loads only the first file per entity (original data).
-    Otherwise, loads all files referenced in main.json (flat layout: paths under project dir).
+    Same selection rules as load_all_data, but returns the cached DataPool (no copy).
+    Files are only re-parsed when main.json or a referenced data file changes (mtime/size).
     """
     _validate_safe_segment(web_name, "web_name")
     if entity_type is not None:
         _validate_safe_segment(entity_type, "entity_type")
 
-    # When V2 disabled: load first file per entity only
-    # v2_disabled is True when ENABLE_DYNAMIC_V2 is "false", "0", "no", or "off"
-    v2_disabled_env_flag = os.getenv("ENABLE_DYNAMIC_V2", "false").lower() in {"false", "0", "no", "off"}
-    force_seed_disabled = seed_value == 1
-    v2_disabled = v2_disabled_env_flag or force_seed_disabled
+    first_file_only = _is_first_file_only(seed_value)
 
     logger.info(
         "Loading data",
@@ -356,60 +717,111 @@ def load_all_data(
             "web_name": web_name,
             "entity_type": entity_type,
             "base_path": BASE_PATH,
-            "v2_disabled": v2_disabled,
+            "v2_disabled": first_file_only,
             "seed_value": seed_value,
         },
     )
+    return _load_pool_cached(web_name, entity_type, first_file_only)
 
-    if v2_disabled:
-        result = _load_first_file_only(web_name, entity_type)
-        logger.debug("load_all_data: branch=first_file_only", extra={"web_name": web_name, "entity_type": entity_type, "count": len(result)})
-        return result
-    result = _load_from_main_json(web_name, entity_type)
-    logger.debug("load_all_data: branch=main_json", extra={"web_name": web_name, "entity_type": entity_type, "count": len(result)})
-    return result
 
+def load_all_data(
+    web_name: str,
+    entity_type: Optional[str] = None,
+    *,
+    seed_value: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Load and return all JSON objects referenced in main.json for a given web_name.
+    If entity_type is provided, only load files listed under that entity key.
 
-def _read_main_json_safe(
+    If V2 DB mode is disabled, loads only the first file per entity (original data).
+    Otherwise, loads all files referenced in main.json (flat layout: paths under project dir).
+    Parsed files are cached per worker (see load_pool); the returned list is a fresh copy.
+    """
+    pool = load_pool(web_name, entity_type, seed_value=seed_value)
+    branch = "first_file_only" if _is_first_file_only(seed_value) else "main_json"
+    logger.debug(f"load_all_data: branch={branch}", extra={"web_name": web_name, "entity_type": entity_type, "count": len(pool)})
+    return list(pool.items)
+
+
+def _read_main_json_cached(
     web_name: str,
     *,
     allow_missing: bool = False,
-) -> Tuple[Optional[str], Optional[str], Optional[Dict[str, Any]]]:
+) -> Tuple[Optional[str], Optional[str], Optional[Dict[str, Any]], Optional[FileSignature]]:
     """
-    Resolve web_name/main.json under BASE_PATH, read it, return (web_base, main_io, main_dict).
-    Returns (None, None, None) if path invalid or read error.
-    When allow_missing=True, returns (web_base, main_io, {}) if file is missing; otherwise (None, None, None).
-    Path used for I/O comes from _get_validated_main_io_path (CodeQL path-injection).
+    Like _read_main_json_safe, but also returns the main.json stat signature and reuses the
+    parsed dict while that signature is unchanged. Signature is None when main.json is missing.
     """
     validated = _get_validated_main_io_path(web_name)
     if validated is None:
         logger.warning(_MSG_PATH_OUTSIDE_BASE, extra={"web_name": web_name})
-        return (None, None, None)
+        return (None, None, None, None)
     web_base, main_io = validated
-    if not os.path.exists(main_io):
+    main_sig = _file_signature(main_io)
+    if main_sig is None:
         if allow_missing:
-            return (web_base, main_io, {})
+            return (web_base, main_io, {}, None)
         logger.warning("main.json missing for web", extra={"web_name": web_name, "path": main_io})
-        return (None, None, None)
+        return (None, None, None, None)
     try:
-        with open(main_io, "r", encoding="utf-8") as f:
-            main = json.load(f)
-        return (web_base, main_io, main if isinstance(main, dict) else None)
+        main = _read_main_json_file(web_name, main_io, main_sig)
     except (OSError, json.JSONDecodeError) as exc:
         logger.error("Failed to read main.json", extra={"web_name": web_name, "path": main_io, "error": str(exc)})
-        return (None, None, None)
+        return (None, None, None, None)
+    return (web_base, main_io, main, main_sig)
+
+
+def _read_main_json_file(web_name: str, main_io: str, main_sig: FileSignature) -> Optional[Dict[str, Any]]:
+    """Return parsed main.json from the cache while main_sig is unchanged; None if it is not an object."""
+    cached = _MAIN_JSON_CACHE.get(main_io)
+    if cached is not None and cached[0] == main_sig:
+        return cached[1]
+    with open(main_io, "r", encoding="utf-8") as f:
+        main = json.load(f)
+    if not isinstance(main, dict):
+        logger.warning("main.json is not an object", extra={"web_name": web_name, "path": main_io})
+        return None
+    with _CACHE_LOCK:
+        _MAIN_JSON_CACHE[main_io] = (main_sig, main)
+    return main
 
 
-def _collect_items_from_rel_paths(
+def _read_main_json_safe(
+    web_name: str,
+    *,
+    allow_missing: bool = False,
+) -> Tuple[Optional[str], Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Resolve web_name/main.json under BASE_PATH, read it, return (web_base, main_io, main_dict).
+    Returns (None, None, None) if path invalid or read error.
+    When allow_missing=True, returns (web_base, main_io, {}) if file is missing; otherwise (None, None, None).
+    Path used for I/O comes from _get_validated_main_io_path (CodeQL path-injection).
+    """
+    web_base, main_io, main, _main_sig = _read_main_json_cached(web_name, allow_missing=allow_missing)
+    return (web_base, main_io, main)
+
+
+def _rel_paths_for_entity(main: Dict[str, Any], entity_type: Optional[str], first_file_only: bool) -> List[str]:
+    """Return the main.json paths to load: all files (or the first only) for one entity or for every entity."""
+    if entity_type:
+        rel_paths = main.get(entity_type) or []
+        return rel_paths[:1] if first_file_only else list(rel_paths)
+    paths: List[str] = []
+    for value in main.values():
+        if isinstance(value, list) and value:
+            paths.extend(value[:1] if first_file_only else value)
+    return paths
+
+
+def _resolve_rel_paths(
     web_base: str,
     rel_paths: List[str],
     web_name: str,
     log_prefix: str = "Referenced",
-) -> List[Dict[str, Any]]:
-    """Load and merge items from resolved paths under web_base; skip invalid or missing files.
-    Path used for I/O comes from _get_validated_path_under_base (CodeQL path-injection).
-    """
-    all_data: List[Dict[str, Any]] = []
+) -> List[str]:
+    """Resolve main.json paths to existing files under web_base; skip (and log) invalid or missing ones."""
+    resolved: List[str] = []
     for rel_path in rel_paths:
         path_io = _get_validated_path_under_base(web_base, rel_path)
         if path_io is None:
@@ -418,12 +830,206 @@ def _collect_items_from_rel_paths(
         if not os.path.exists(path_io):
             logger.warning(f"{log_prefix} data file missing", extra={"path": path_io, "rel_path": rel_path, "web_name": web_name})
             continue
+        resolved.append(path_io)
+    return resolved
+
+
+def _parse_items_from_paths(web_base: str, paths_io: List[str]) -> List[Dict[str, Any]]:
+    """Parse and merge items from already-validated paths under web_base."""
+    all_data: List[Dict[str, Any]] = []
+    for path_io in paths_io:
         items = _parse_json_file_to_items(path_io, allowed_base=web_base)
         if items is not None:
             all_data.extend(items)
     return all_data
 
 
+def _collect_items_from_rel_paths(
+    web_base: str,
+    rel_paths: List[str],
+    web_name: str,
+    log_prefix: str = "Referenced",
+) -> List[Dict[str, Any]]:
+    """Load and merge items from resolved paths under web_base; skip invalid or missing files.
+    Path used for I/O comes from _get_validated_path_under_base (CodeQL path-injection).
+    """
+    return _parse_items_from_paths(web_base, _resolve_rel_paths(web_base, rel_paths, web_name, log_prefix))
+
+
+def _indexed_paths_with_signatures(
+    web_name: str,
+    web_base: str,
+    main: Dict[str, Any],
+    main_sig: FileSignature,
+    rel_paths: List[str],
+    log_prefix: str,
+) -> Tuple[List[str], List[FileSignature]]:
+    """
+    Resolve main.json paths through the project path index (dict lookups, no listdir/realpath)
+    and stat each file once. Missing or invalid files are skipped and logged like _resolve_rel_paths.
+    An existing JSONL append tail is listed right after its array file.
+    """
+    entry = _get_project_paths(web_name)
+    files = _refresh_project_files(entry, main, main_sig) if entry is not None and entry.web_base == web_base else {}
+    paths_io: List[str] = []
+    file_sigs: List[FileSignature] = []
+    for rel_path in rel_paths:
+        path_io = files[rel_path] if rel_path in files else _get_validated_path_under_base(web_base, rel_path)
+        if path_io is None:
+            logger.warning(f"{log_prefix} path outside base", extra={"rel_path": rel_path, "web_name": web_name})
+            continue
+        sig = _file_signature(path_io)
+        if sig is None:
+            logger.warning(f"{log_prefix} data file missing", extra={"path": path_io, "rel_path": rel_path, "web_name": web_name})
+            continue
+        paths_io.append(path_io)
+        file_sigs.append(sig)
+        tail = _existing_jsonl_tail(path_io)
+        if tail is not None:
+            paths_io.append(tail[0])
+            file_sigs.append(tail)
+    return paths_io, file_sigs
+
+
+def _existing_jsonl_tail(path_io: str) -> Optional[FileSignature]:
+    """Signature of the JSONL append tail next to path_io, if one exists under BASE_PATH (one stat when absent)."""
+    tail_path = _jsonl_tail_path(path_io)
+    if tail_path is None or _file_signature(tail_path) is None:
+        return None
+    try:
+        return _file_signature(_path_for_io_under_base(tail_path))
+    except ValueError:
+        return None
+
+
+def _resolve_pool_request(web_name: str, entity_type: Optional[str], first_file_only: bool) -> Optional[Tuple[PoolKey, str, Tuple[FileSignature, ...]]]:
+    """
+    Stat main.json and the data files for a pool request (no data file is parsed).
+    Returns (cache key, web_base, signature) or None when the project has no readable main.json.
+    """
+    web_base, main_io, main, main_sig = _read_main_json_cached(web_name)
+    if web_base is None or main_io is None or main is None or main_sig is None:
+        return None
+    log_prefix = "First file" if first_file_only else "Referenced"
+    _paths_io, file_sigs = _indexed_paths_with_signatures(web_name, web_base, main, main_sig, _rel_paths_for_entity(main, entity_type, first_file_only), log_prefix)
+    return (main_io, entity_type, first_file_only), web_base, (main_sig, *file_sigs)
+
+
+def _lookup_pool(web_name: str, key: PoolKey, signature: Tuple[FileSignature, ...]) -> Optional[DataPool]:
+    """Return the cached (or shared-store) pool for key when it was built from exactly these files."""
+    cached = _POOL_CACHE.get(key)
+    if cached is not None and cached.signature == signature:
+        return cached
+    # A shared pool is only used when it was built from files with exactly this signature.
+    pool = _SHARED_POOL_SOURCE.get(key, signature) if _SHARED_POOL_SOURCE is not None else None
+    if pool is not None:
+        _store_pool(web_name, key, pool, "Pool loaded from shared store")
+    return pool
+
+
+def _store_pool(web_name: str, key: PoolKey, pool: DataPool, message: str = "Pool cache miss") -> None:
+    """Cache pool under key, replacing any entry built from older files; message says where it came from."""
+    with _CACHE_LOCK:
+        _POOL_CACHE[key] = pool
+    logger.debug(message, extra={"web_name": web_name, "entity_type": key[1], "first_file_only": key[2], "count": len(pool)})
+
+
+def _load_pool_cached(web_name: str, entity_type: Optional[str], first_file_only: bool) -> DataPool:
+    """
+    Return the DataPool for (web_name, entity_type, mode), parsing files only on a cache miss.
+    A miss is any change in the (mtime_ns, size) of main.json or of a referenced data file.
+    """
+    resolved = _resolve_pool_request(web_name, entity_type, first_file_only)
+    if resolved is None:
+        return DataPool([])
+    key, web_base, signature = resolved
+    pool = _lookup_pool(web_name, key, signature)
+    if pool is None:
+        # Signatures are taken before parsing, so a file changed mid-parse is re-read on the next call.
+        pool = DataPool(_parse_items_from_paths(web_base, [sig[0] for sig in signature[1:]]), signature)
+        _store_pool(web_name, key, pool)
+    return pool
+
+
+def iter_project_pools() -> Iterator[Tuple[PoolKey, DataPool]]:
+    """
+    Re-index BASE_PATH and yield (cache key, pool) for every entity of every project, once with the
+    first file only and once with all files. Pools are loaded one at a time through the pool cache.
+    """
+    build_path_index()
+    for web_name in sorted(_PATH_INDEX):
+        _web_base, _main_io, main = _read_main_json_safe(web_name)
+        if not main:
+            continue
+        main_io = _PATH_INDEX[web_name].main_io
+        for entity_type, rel_paths in main.items():
+            if not isinstance(rel_paths, list) or not rel_paths or not is_safe_name(entity_type):
+                continue
+            for first_file_only in (True, False):
+                yield (main_io, entity_type, first_file_only), _load_pool_cached(web_name, entity_type, first_file_only)
+
+
+def _parse_file_shared(web_base: str, file_sig: FileSignature) -> "Future[Optional[List[Dict[str, Any]]]]":
+    """
+    Submit a parse of file_sig's path to the load executor, or join the parse already in flight
+    for the same (path, mtime_ns, size) so concurrent requests read and parse each file once.
+    """
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT_PARSES.get(file_sig)
+        if future is None:
+            future = _LOAD_EXECUTOR.submit(_parse_json_file_to_items, file_sig[0], allowed_base=web_base)
+            _INFLIGHT_PARSES[file_sig] = future
+            future.add_done_callback(lambda _done, sig=file_sig: _INFLIGHT_PARSES.pop(sig, None))
+    return future
+
+
+async def load_pool_async(
+    web_name: str,
+    entity_type: Optional[str] = None,
+    *,
+    seed_value: Optional[int] = None,
+    full_pool: bool = False,
+) -> DataPool:
+    """
+    Async variant of load_pool for request handlers: stats and parsing run on the bounded load
+    executor (never on the event loop), data files of a pool are parsed concurrently, and
+    concurrent requests for the same unchanged file share one in-flight parse.
+    full_pool=True loads every file of the entity regardless of seed_value and ENABLE_DYNAMIC_V2.
+    """
+    _validate_safe_segment(web_name, "web_name")
+    if entity_type is not None:
+        _validate_safe_segment(entity_type, "entity_type")
+
+    first_file_only = not full_pool and _is_first_file_only(seed_value)
+    logger.info(
+        "Loading data",
+        extra={
+            "web_name": web_name,
+            "entity_type": entity_type,
+            "base_path": BASE_PATH,
+            "v2_disabled": first_file_only,
+            "seed_value": seed_value,
+        },
+    )
+    loop = asyncio.get_running_loop()
+    resolved = await loop.run_in_executor(_LOAD_EXECUTOR, _resolve_pool_request, web_name, entity_type, first_file_only)
+    if resolved is None:
+        return DataPool([])
+    key, web_base, signature = resolved
+    pool = _lookup_pool(web_name, key, signature)
+    if pool is not None:
+        return pool
+
+    parsed = await asyncio.gather(*(asyncio.wrap_future(_parse_file_shared(web_base, file_sig)) for file_sig in signature[1:]))
+    items: List[Dict[str, Any]] = []
+    for file_items in parsed:
+        if file_items is not None:
+            items.extend(file_items)
+    pool = DataPool(items, signature)
+    _store_pool(web_name, key, pool)
+    return pool
+
+
 def _load_from_main_json(web_name: str, entity_type: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Helper function to load data from main.json (used when V2 is enabled or as fallback).
@@ -431,18 +1037,7 @@ def _load_from_main_json(web_name: str, entity_type: Optional[str] = None) -> Li
     _validate_safe_segment(web_name, "web_name")
     if entity_type is not None:
         _validate_safe_segment(entity_type, "entity_type")
-    _web_base, _main_io, main = _read_main_json_safe(web_name)
-    if _web_base is None or main is None:
-        return []
-    web_base = _web_base
-    if entity_type:
-        rel_paths = main.get(entity_type) or []
-    else:
-        rel_paths = []
-        for value in main.values():
-            if isinstance(value, list):
-                rel_paths.extend(value)
-    return _collect_items_from_rel_paths(web_base, rel_paths, web_name, "Referenced")
+    return list(_load_pool_cached(web_name, entity_type, first_file_only=False).items)
 
 
 def _load_first_file_only(web_name: str, entity_type: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -453,19 +1048,7 @@ def _load_first_file_only(web_name: str, entity_type: Optional[str] = None) -> L
     _validate_safe_segment(web_name, "web_name")
     if entity_type is not None:
         _validate_safe_segment(entity_type, "entity_type")
-    _web_base, _main_io, main = _read_main_json_safe(web_name)
-    if _web_base is None or main is None:
-        return []
-    web_base = _web_base
-    paths_to_load: List[str] = []
-    if entity_type:
-        rel_paths = main.get(entity_type) or []
-        paths_to_load = [rel_paths[0]] if rel_paths else []
-    else:
-        for value in main.values():
-            if isinstance(value, list) and value:
-                paths_to_load.append(value[0])
-    return _collect_items_from_rel_paths(web_base, paths_to_load, web_name, "First file")
+    return list(_load_pool_cached(web_name, entity_type, first_file_only=True).items)
 
 
 def append_or_rollover_entity_data(web_name: str, entity_type: str, data: List[Dict[str, Any]]) -> str:
@@ -505,8 +1088,11 @@ def append_or_rollover_entity_data(web_name: str, entity_type: str, data: List[D
             last_file_abs = None
 
         if last_file_abs and os.path.exists(last_file_abs):
-            # Check file size
+            # Check file size (including any JSONL tail that compaction would fold into it)
             file_size = os.path.getsize(last_file_abs)
+            tail = _existing_jsonl_tail(last_file_abs)
+            if tail is not None:
+                file_size += tail[2]
             estimated_new_size = file_size + len(json.dumps(data))
 
             if estimated_new_size < DATA_FILE_MAX_BYTES:
@@ -524,6 +1110,12 @@ def append_or_rollover_entity_data(web_name: str, entity_type: str, data: List[D
         if not safe_path:
             raise ValueError(_MSG_PATH_OUTSIDE_BASE)
         io_path = _path_for_io_under_base(safe_path)
+        tail_path = _jsonl_tail_path(io_path) if DATA_APPEND_FORMAT == "jsonl" else None
+        if tail_path is not None:
+            tail_io = _path_for_io_under_base(tail_path)
+            _append_jsonl_records(tail_io, data)
+            _evict_written_entity(web_name, entity_type)
+            return tail_io
         with open(io_path, "r", encoding="utf-8") as f:
             existing_data = json.load(f)
 
@@ -537,6 +1129,7 @@ def append_or_rollover_entity_data(web_name: str, entity_type: str, data: List[D
         with open(io_path, "w", encoding="utf-8") as f:
             json.dump(existing_data, f, indent=2, ensure_ascii=False)
 
+        _evict_written_entity(web_name, entity_type)
         return io_path
 
 
@@ -569,6 +1162,45 @@ def append_to_entity_data(web_name: str, entity_type: str, data: List[Dict[str,
         raise ValueError("Resolved file path is not under project dir")
     file_io = _path_for_io_under_base(file_path)
 
+    if DATA_APPEND_FORMAT == "jsonl" and os.path.exists(file_io):
+        # O(appended): records go to the JSONL tail; the array file is left untouched
+        written_io = _path_for_io_under_base(f"{file_io}l")
+        _append_jsonl_records(written_io, data)
+        total: Optional[int] = None
+    else:
+        written_io = file_io
+        total = _rewrite_array_with_appended(file_io, data)
+
+    # Update main.json to reference this file (if not already)
+    main_path = os.path.join(data_dir, "main.json")
+    main_io = _path_for_io_under_base(main_path)
+    _ensure_dir(os.path.dirname(main_io))
+
+    if os.path.exists(main_io):
+        with open(main_io, "r", encoding="utf-8") as f:
+            main = json.load(f)
+    else:
+        main = {}
+
+    relative_path = f"./{filename}"
+    if entity_type not in main:
+        main[entity_type] = []
+
+    # Only rewrite main.json when the reference is new, so cached path indexes stay valid
+    main_changed = relative_path not in main[entity_type] or not os.path.exists(main_io)
+    if main_changed:
+        if relative_path not in main[entity_type]:
+            main[entity_type].append(relative_path)
+        with open(main_io, "w", encoding="utf-8") as f:
+            json.dump(main, f, indent=2, ensure_ascii=False)
+
+    _evict_written_entity(web_name, entity_type, main_changed)
+    logger.info("Appended records to file", extra={"path": written_io, "appended": len(data), "total": total})
+    return written_io
+
+
+def _rewrite_array_with_appended(file_io: str, data: List[Dict[str, Any]]) -> int:
+    """Read the JSON array at file_io (if any), append data, and atomically rewrite it. Returns the new item count."""
     # Read existing data if file exists
     existing_data = []
     if os.path.exists(file_io):
@@ -594,27 +1226,38 @@ def append_to_entity_data(web_name: str, entity_type: str, data: List[Dict[str,
     finally:
         if temp_path:
             _unlink_under_base_if_exists(temp_path)
+    return len(combined_data)
 
-    # Update main.json to reference this file (if not already)
-    main_path = os.path.join(data_dir, "main.json")
-    main_io = _path_for_io_under_base(main_path)
-    _ensure_dir(os.path.dirname(main_io))
-
-    if os.path.exists(main_io):
-        with open(main_io, "r", encoding="utf-8") as f:
-            main = json.load(f)
-    else:
-        main = {}
-
-    relative_path = f"./{filename}"
-    if entity_type not in main:
-        main[entity_type] = []
-
-    if relative_path not in main[entity_type]:
-        main[entity_type].append(relative_path)
-
-    with open(main_io, "w", encoding="utf-8") as f:
-        json.dump(main, f, indent=2, ensure_ascii=False)
 
-    logger.info("Appended records to file", extra={"path": file_io, "appended": len(data), "total": len(combined_data)})
-    return file_io
+def compact_jsonl_tails(web_name: str, entity_type: Optional[str] = None) -> int:
+    """
+    Fold JSONL append tails back into their JSON array files (atomic replace), then delete the tails.
+    Covers every file of entity_type (or of all entities) in main.json. Returns the number of files compacted.
+    Appenders take the same lock on the tail, so records written during compaction are not lost.
+    """
+    _validate_safe_segment(web_name, "web_name")
+    if entity_type is not None:
+        _validate_safe_segment(entity_type, "entity_type")
+    web_base, _main_io, main = _read_main_json_safe(web_name)
+    if web_base is None or main is None:
+        return 0
+    compacted = 0
+    for rel_path in _rel_paths_for_entity(main, entity_type, first_file_only=False):
+        path_io = _get_validated_path_under_base(web_base, rel_path)
+        tail_path = _jsonl_tail_path(path_io) if path_io else None
+        if tail_path is None or not os.path.exists(tail_path):
+            continue
+        tail_io = _path_for_io_under_base(tail_path)
+        with open(tail_io, "rb") as lock_f:
+            fcntl.flock(lock_f.fileno(), fcntl.LOCK_EX)
+            try:
+                tail_items = _parse_json_file_to_items(tail_io) or []
+                _rewrite_array_with_appended(path_io, tail_items)
+                os.remove(tail_io)
+            finally:
+                fcntl.flock(lock_f.fileno(), fcntl.LOCK_UN)
+        compacted += 1
+        logger.info("Compacted JSONL tail", extra={"path": path_io, "records": len(tail_items)})
+    if compacted:
+        _evict_written_entity(web_name, entity_type)
+    return compacted
@@ -0,0 +1,220 @@
+"""
+Write-behind buffer for /save_events/ (opt-in with EVENT_WRITE_BEHIND).
+
+Instead of one INSERT round trip per event, validated events are queued in a bounded per-worker
+buffer and a background task writes them with COPY (copy_records_to_table) once
+EVENT_BUFFER_FLUSH_EVENTS are queued or EVENT_BUFFER_FLUSH_INTERVAL_MS has passed.
+
+Event ids are reserved from the events id sequence in blocks, so /save_events/ still answers
+with the id the row will have. Until a row is committed, /get_events/ merges it from the buffer
+(read-your-writes within a worker) and /reset_events/ drops it. When the buffer is full, put()
+raises BufferFull (reject policy, answered with 429) or waits for the next flush (block policy).
+Remaining events are flushed on shutdown. A row the table rejects (found by bisecting the failed
+COPY batch) is logged and moved to dead_letters instead of blocking the events behind it.
+"""
+
+import asyncio
+import os
+from collections import deque
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Any, Callable, Deque, List, NamedTuple, Optional, Set, Tuple
+
+from asyncpg.exceptions import DataError, IntegrityConstraintViolationError
+from loguru import logger
+
+EVENT_WRITE_BEHIND = os.getenv("EVENT_WRITE_BEHIND", "false").lower() in {"true", "1", "yes", "on"}
+EVENT_BUFFER_MAX_EVENTS = int(os.getenv("EVENT_BUFFER_MAX_EVENTS", "10000"))
+EVENT_BUFFER_FLUSH_EVENTS = int(os.getenv("EVENT_BUFFER_FLUSH_EVENTS", "500"))
+EVENT_BUFFER_FLUSH_INTERVAL_MS = int(os.getenv("EVENT_BUFFER_FLUSH_INTERVAL_MS", "200"))
+EVENT_BUFFER_FULL_POLICY = os.getenv("EVENT_BUFFER_FULL_POLICY", "reject").lower()
+
+# Errors caused by the rows themselves: retrying the same batch can never succeed
+ROW_ERRORS = (DataError, IntegrityConstraintViolationError)
+DEAD_LETTER_MAX_EVENTS = 1000
+
+FULL_POLICY_REJECT = "reject"
+FULL_POLICY_BLOCK = "block"
+
+# Column order of BufferedEvent, as passed to copy_records_to_table
+EVENT_COLUMNS = ("id", "web_agent_id", "web_url", "validator_id", "event_data", "created_at")
+
+RESERVE_EVENT_IDS_SQL = """
+                        SELECT nextval(pg_get_serial_sequence('events', 'id')) AS id
+                        FROM generate_series(1, $1);
+                        """
+
+# (web_url, web_agent_id, validator_id): the key /get_events/ and /reset_events/ query by
+EventKey = Tuple[str, str, str]
+
+
+class BufferFull(Exception):
+    """Raised by EventBuffer.put when the buffer is full under the reject policy."""
+
+
+class BufferedEvent(NamedTuple):
+    id: int
+    web_agent_id: str
+    web_url: str
+    validator_id: str
+    event_data: str
+    created_at: datetime
+
+    @property
+    def key(self) -> EventKey:
+        return (self.web_url, self.web_agent_id, self.validator_id)
+
+
+class EventBuffer:
+    """Bounded queue of events not yet written to the events table, plus its COPY flusher."""
+
+    def __init__(
+        self,
+        pool: Any,
+        max_events: int = EVENT_BUFFER_MAX_EVENTS,
+        flush_events: int = EVENT_BUFFER_FLUSH_EVENTS,
+        flush_interval_ms: int = EVENT_BUFFER_FLUSH_INTERVAL_MS,
+        full_policy: str = EVENT_BUFFER_FULL_POLICY,
+    ):
+        if full_policy not in (FULL_POLICY_REJECT, FULL_POLICY_BLOCK):
+            raise ValueError(f"Unknown event buffer full policy: {full_policy}")
+        self.pool = pool
+        self.max_events = max_events
+        self.flush_events = max(1, flush_events)
+        self.flush_interval = flush_interval_ms / 1000
+        self.full_policy = full_policy
+        self._pending: Deque[BufferedEvent] = deque()
+        # Batch being copied; still visible to readers until its COPY commits
+        self._inflight: List[BufferedEvent] = []
+        self._ids: Deque[int] = deque()
+        self._id_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._reserving = 0
+        # Events no COPY could write even on their own (e.g. a value too long for its column)
+        self.dead_letters: Deque[BufferedEvent] = deque(maxlen=DEAD_LETTER_MAX_EVENTS)
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._pending) + len(self._inflight)
+
+    def start(self) -> None:
+        """Start the background flusher (call from the running event loop)."""
+        self._task = asyncio.create_task(self._run())
+
+    async def put(self, web_agent_id: str, web_url: str, validator_id: str, event_data: str) -> BufferedEvent:
+        """Queue one event (event_data: its JSON text) and return it with its reserved id and timestamp."""
+        if self._closed:
+            raise RuntimeError("Event buffer is closed")
+        # Capacity first (counting puts still waiting for their id), so rejected events burn no sequence values
+        while len(self) + self._reserving >= self.max_events:
+            if self.full_policy == FULL_POLICY_REJECT:
+                raise BufferFull(f"Event buffer full ({self.max_events} events)")
+            self._space.clear()
+            await self._space.wait()
+        self._reserving += 1
+        try:
+            event_id = await self._next_id()
+        finally:
+            self._reserving -= 1
+        event = BufferedEvent(event_id, web_agent_id, web_url, validator_id, event_data, datetime.now(timezone.utc))
+        self._pending.append(event)
+        if len(self._pending) >= self.flush_events:
+            self._wakeup.set()
+        return event
+
+    def unflushed(self, key: EventKey) -> List[BufferedEvent]:
+        """Events for key that are not committed yet (queued or being copied), oldest first."""
+        return [event for event in chain(self._inflight, self._pending) if event.key == key]
+
+    async def discard(self, key: EventKey) -> int:
+        """
+        Drop the queued events for key; returns how many. Waits for a COPY in progress first, so
+        a DELETE issued afterwards also removes every event of key that reached the table.
+        """
+        return await self._discard(lambda event: event.key == key)
+
+    async def discard_validator(self, validator_id: str) -> int:
+        """Like discard, for every queued event of validator_id (validator-wide resets)."""
+        return await self._discard(lambda event: event.validator_id == validator_id)
+
+    async def flush(self) -> int:
+        """
+        Write queued events with COPY, flush_events per batch; returns the number written. A batch
+        rejected for its data is bisected down to the offending rows, which go to dead_letters; on
+        any other error (e.g. the database is unreachable) the unwritten events are requeued in order.
+        """
+        written = 0
+        async with self._flush_lock:
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self.flush_events, len(self._pending)))]
+                self._inflight = batch
+                done: Set[int] = set()
+                try:
+                    written += await self._copy_bisecting(batch, done)
+                except BaseException:
+                    # Ids are already fixed, so the rest goes back in front and is retried as is
+                    self._pending.extendleft(reversed([event for event in batch if event.id not in done]))
+                    raise
+                finally:
+                    self._inflight = []
+                self._space.set()
+        return written
+
+    async def close(self) -> None:
+        """Stop the flusher and write whatever is still queued."""
+        self._closed = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        written = await self.flush()
+        logger.info(f"Event buffer closed after flushing {written} events")
+
+    async def _copy_bisecting(self, batch: List[BufferedEvent], done: Set[int]) -> int:
+        """COPY batch, splitting it on data errors; adds the ids written or dead-lettered to done."""
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.copy_records_to_table("events", records=batch, columns=EVENT_COLUMNS)
+        except ROW_ERRORS as e:
+            if len(batch) == 1:
+                event = batch[0]
+                logger.error(f"Dropping event {event.id} (validator {event.validator_id[:64]!r}) that cannot be written: {e}")
+                self.dead_letters.append(event)
+                done.add(event.id)
+                return 0
+            middle = len(batch) // 2
+            return await self._copy_bisecting(batch[:middle], done) + await self._copy_bisecting(batch[middle:], done)
+        done.update(event.id for event in batch)
+        return len(batch)
+
+    async def _discard(self, matches: Callable[[BufferedEvent], bool]) -> int:
+        async with self._flush_lock:
+            kept = deque(event for event in self._pending if not matches(event))
+            dropped = len(self._pending) - len(kept)
+            self._pending = kept
+        self._space.set()
+        return dropped
+
+    async def _next_id(self) -> int:
+        while not self._ids:
+            async with self._id_lock:
+                if not self._ids:
+                    rows = await self.pool.fetch(RESERVE_EVENT_IDS_SQL, self.flush_events)
+                    self._ids.extend(row["id"] for row in rows)
+        return self._ids.popleft()
+
+    async def _run(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Event buffer flush failed; {len(self)} events kept for retry: {e}")
+                await asyncio.sleep(self.flush_interval)
@@ -0,0 +1,93 @@
+"""
+Maintenance job for the optional partitioned events schema (postgres/migrations/002_events_partitioned.sql).
+
+With events partitioned by validator, a validator without a partition writes to events_default.
+Every worker runs a PartitionMaintainer: it gives those validators their partition (moving their
+rows out of events_default) and, with EVENTS_RETENTION_DAYS set, drops the partitions of validators
+idle for longer instead of deleting rows. The DDL lives in SQL functions installed by the migration,
+which serialize concurrent workers with an advisory lock. Nothing runs against a plain
+(unpartitioned) events table.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Tuple
+
+from loguru import logger
+
+# Days without events after which a validator's partition is dropped; 0 keeps everything
+EVENTS_RETENTION_DAYS = int(os.getenv("EVENTS_RETENTION_DAYS", "0"))
+EVENTS_PARTITION_CHECK_INTERVAL_S = float(os.getenv("EVENTS_PARTITION_CHECK_INTERVAL_S", "300"))
+
+EVENTS_PARTITIONED_SQL = "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('events');"
+CREATE_PENDING_PARTITIONS_SQL = "SELECT validator FROM create_pending_validator_partitions() AS validator;"
+DROP_IDLE_PARTITIONS_SQL = "SELECT name FROM drop_idle_validator_partitions($1) AS name;"
+
+
+async def events_partitioned(pool: Any) -> bool:
+    """Whether events is a partitioned table (the 002_events_partitioned migration was applied)."""
+    return await pool.fetchval(EVENTS_PARTITIONED_SQL) is True
+
+
+async def maintain_partitions(
+    pool: Any,
+    now: Optional[datetime] = None,
+    retention_days: int = EVENTS_RETENTION_DAYS,
+) -> Tuple[List[str], List[str]]:
+    """
+    Create the partitions of validators with rows in events_default and, with retention_days, drop
+    those whose newest event is older than retention_days. Returns (validators given a partition,
+    partitions dropped).
+    """
+    rows = await pool.fetch(CREATE_PENDING_PARTITIONS_SQL)
+    created = [row["validator"] for row in rows]
+    dropped: List[str] = []
+    if retention_days > 0:
+        now = now or datetime.now(timezone.utc)
+        rows = await pool.fetch(DROP_IDLE_PARTITIONS_SQL, now - timedelta(days=retention_days))
+        dropped = [row["name"] for row in rows]
+    return created, dropped
+
+
+class PartitionMaintainer:
+    """Background task running maintain_partitions at startup and every interval_s seconds."""
+
+    def __init__(
+        self,
+        pool: Any,
+        interval_s: float = EVENTS_PARTITION_CHECK_INTERVAL_S,
+        retention_days: int = EVENTS_RETENTION_DAYS,
+    ):
+        self.pool = pool
+        self.interval = interval_s
+        self.retention_days = retention_days
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def start(self) -> None:
+        """Start the job (call from the running event loop)."""
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_once(self) -> Tuple[List[str], List[str]]:
+        created, dropped = await maintain_partitions(self.pool, retention_days=self.retention_days)
+        if created or dropped:
+            logger.info(f"Events partitions: created for validators {created}, dropped idle {dropped}")
+        return created, dropped
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Events partition maintenance failed: {e}")
+            await asyncio.sleep(self.interval)
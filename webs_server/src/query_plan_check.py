@@ -0,0 +1,108 @@
+"""
+Query-plan regression check for the events lookup queries.
+
+Runs EXPLAIN (FORMAT JSON) for the events SELECTs / DELETEs and reports any plan that does not
+read events through the index the query is written for: a sequential scan, a BitmapAnd of
+single-column indexes, or (for the ordered SELECTs) an explicit sort. On the partitioned schema
+partitions and their indexes are checked under their parents' names. Used at startup
+(EVENTS_QUERY_PLAN_CHECK) and by tests/test_query_plan_check.py against a seeded local Postgres.
+"""
+
+import os
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Sequence
+
+import orjson
+
+# off: skip; warn: log problems at startup; fail: refuse to start on problems
+EVENTS_QUERY_PLAN_CHECK = os.getenv("EVENTS_QUERY_PLAN_CHECK", "off").lower()
+
+EVENTS_TABLE = "events"
+EVENTS_LOOKUP_INDEX = "idx_events_lookup"
+# Lookup key for EXPLAIN; an unseen value, like most lookups, is estimated as highly selective
+PLAN_CHECK_PARAMS = ("https://plan-check.invalid", "plan-check-agent", "plan-check-validator")
+
+# A bitmap scan of the lookup index is fine for the DELETE; for the ordered SELECT it brings a Sort, flagged separately
+_INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+# An Incremental Sort only orders ties within the index order (e.g. id within created_at), so it is not flagged
+_SORTS = {"Sort"}
+
+# Partition (and partition index) name -> name of the partitioned table (index) it belongs to
+PARTITION_PARENTS_SQL = """
+                    SELECT c.relname::text AS name, parent.name AS parent
+                    FROM unnest($1::text[]) AS parent(name)
+                    CROSS JOIN LATERAL pg_partition_tree(to_regclass(parent.name)) AS tree
+                    JOIN pg_class AS c ON c.oid = tree.relid
+                    WHERE tree.level > 0;
+                    """
+
+
+class PlanQuery(NamedTuple):
+    """One statement to EXPLAIN; ordered: the query relies on the index order."""
+
+    name: str
+    sql: str
+    ordered: bool = False
+    params: Sequence[Any] = PLAN_CHECK_PARAMS
+    index: str = EVENTS_LOOKUP_INDEX
+
+
+def _walk(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _walk(child)
+
+
+def plan_problems(
+    name: str,
+    plan: Dict[str, Any],
+    ordered: bool = False,
+    index: str = EVENTS_LOOKUP_INDEX,
+    parents: Optional[Mapping[str, str]] = None,
+) -> List[str]:
+    """
+    Problems in one EXPLAIN (FORMAT JSON) plan tree. ordered: the query relies on the order of
+    index; parents maps partition and partition index names to their parents' names.
+    """
+    parents = parents or {}
+    problems = []
+    uses_index = False
+    for node in _walk(plan):
+        node_type = node.get("Node Type")
+        relation = node.get("Relation Name")
+        if relation is not None and parents.get(relation, relation) == EVENTS_TABLE and node_type == "Seq Scan":
+            problems.append(f"{name}: sequential scan on {relation}")
+        elif node_type == "BitmapAnd":
+            problems.append(f"{name}: BitmapAnd of single-column indexes")
+        elif ordered and node_type in _SORTS:
+            problems.append(f"{name}: explicit {node_type} instead of {index} order")
+        index_name = node.get("Index Name")
+        if node_type in _INDEX_SCANS and parents.get(index_name, index_name) == index:
+            uses_index = True
+    if not uses_index:
+        problems.append(f"{name}: does not scan {index}")
+    return problems
+
+
+async def explain(conn: Any, sql: str, params: Sequence[Any] = PLAN_CHECK_PARAMS) -> Dict[str, Any]:
+    """Root plan node of EXPLAIN (FORMAT JSON) sql; the statement itself is not executed."""
+    raw = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {sql}", *params)
+    document = orjson.loads(raw) if isinstance(raw, (str, bytes)) else raw
+    return document[0]["Plan"]
+
+
+async def partition_parents(conn: Any) -> Dict[str, str]:
+    """Partitions of events and of its indexes, mapped to the parent names (empty for a plain table)."""
+    rows = await conn.fetch(PARTITION_PARENTS_SQL, [EVENTS_TABLE, EVENTS_LOOKUP_INDEX])
+    return {row["name"]: row["parent"] for row in rows}
+
+
+async def check_events_query_plans(conn: Any, queries: Sequence[PlanQuery], partitioned: bool = False) -> List[str]:
+    """
+    EXPLAIN each query with its params; returns every problem found (empty when all of them
+    scan their index). partitioned: events is partitioned, so partition names are resolved first.
+    """
+    parents = await partition_parents(conn) if partitioned else {}
+    problems: List[str] = []
+    for query in queries:
+        problems.extend(plan_problems(query.name, await explain(conn, query.sql, query.params), query.ordered, query.index, parents))
+    return problems
@@ -0,0 +1,144 @@
+"""
+Conditional-request helpers and a bounded cache of encoded /datasets/load bodies.
+
+A /datasets/load response is fully determined by the pool version (stat signature of the files
+it was built from) and the query parameters, so the server derives a strong ETag from them,
+answers matching If-None-Match requests with 304, and keeps recently built bodies (plus a gzip
+copy, built once on first gzip request) in an LRU bounded by total bytes.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Memory budget for cached response bodies (identity + gzip bytes); 0 disables the body cache
+LOAD_RESPONSE_CACHE_BYTES = int(os.getenv("LOAD_RESPONSE_CACHE_BYTES", 32 * 1024 * 1024))
+
+# Bump when the response layout changes so clients do not revalidate against old bodies
+_ETAG_FORMAT = "1"
+_GZIP_SUFFIX = "-gzip"
+# zlib's default: level 9 costs several times the CPU for a few percent smaller JSON bodies
+_GZIP_LEVEL = 6
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag (quoted) over the repr of parts."""
+    digest = hashlib.blake2b(repr((_ETAG_FORMAT, parts)).encode("utf-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def gzip_etag(etag: str) -> str:
+    """ETag of the gzip representation: a strong validator must differ per content encoding."""
+    return f'{etag[:-1]}{_GZIP_SUFFIX}"'
+
+
+def match_if_none_match(header: Optional[str], etag: str) -> Optional[str]:
+    """
+    Return the tag (etag or its gzip variant) an If-None-Match header value matches, else None.
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match.
+    """
+    if not header:
+        return None
+    candidates = {etag, gzip_etag(etag)}
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return etag
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in candidates:
+            return tag
+    return None
+
+
+def accepts_gzip(header: Optional[str]) -> bool:
+    """True when an Accept-Encoding header allows gzip (q=0 excluded)."""
+    if not header:
+        return False
+    for part in header.split(","):
+        coding, _sep, params = part.strip().partition(";")
+        if coding.strip().lower() in {"gzip", "*"}:
+            return params.replace(" ", "").lower() not in {"q=0", "q=0.0", "q=0.00", "q=0.000"}
+    return False
+
+
+class CachedBody:
+    """An encoded response body and its gzip copy (built on the first gzip request)."""
+
+    __slots__ = ("body", "gzipped")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.gzipped: Optional[bytes] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + (len(self.gzipped) if self.gzipped is not None else 0)
+
+
+class ResponseCache:
+    """LRU of CachedBody keyed by ETag, bounded by the total bytes held."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedBody]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, etag: str) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is not None:
+                self._entries.move_to_end(etag)
+            return entry
+
+    def put(self, etag: str, body: bytes) -> CachedBody:
+        """Cache body under etag (unless it alone exceeds the budget) and return its entry."""
+        entry = CachedBody(body)
+        if len(body) > self.max_bytes:
+            return entry
+        with self._lock:
+            previous = self._entries.pop(etag, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[etag] = entry
+            self._bytes += entry.size
+            self._evict()
+        return entry
+
+    def gzipped(self, etag: str, entry: CachedBody) -> bytes:
+        """
+        Return entry's gzip body, accounting the added bytes when entry is still cached.
+        Compresses on first use; async callers run it in a thread unless entry.gzipped is set.
+        """
+        if entry.gzipped is not None:
+            return entry.gzipped
+        # mtime=0 keeps the bytes identical across workers and restarts
+        gzipped = gzip.compress(entry.body, compresslevel=_GZIP_LEVEL, mtime=0)
+        with self._lock:
+            if entry.gzipped is None:
+                entry.gzipped = gzipped
+                if self._entries.get(etag) is entry:
+                    self._bytes += len(gzipped)
+                    self._evict()
+            return entry.gzipped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            _etag, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
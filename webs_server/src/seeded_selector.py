@@ -2,10 +2,175 @@
 Seeded Data Selector
 Provides deterministic, reproducible data selection based on seed values.
 Uses a master dataset pool and selects/shuffles based on seed.
+
+Index permutations for seeds in the 1-999 range are cached per (population size, seed), so
+repeated selections slice a stored permutation instead of re-running the RNG. Cached results
+are identical to random.Random(seed).sample / shuffle.
 """
 
+import hashlib
+import os
 import random
-from typing import List, Dict, Any, Optional
+import threading
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from math import ceil, log
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Seeds served from the permutation table (seed_resolver.clamp_base_seed range)
+PERMUTATION_SEED_MIN = 1
+PERMUTATION_SEED_MAX = 999
+
+# Upper bound on memory held by cached permutations (bytes); 0 disables the table
+SEED_PERMUTATION_CACHE_BYTES = int(os.getenv("SEED_PERMUTATION_CACHE_BYTES", 64 * 1024 * 1024))
+
+# LRU of (kind, population size, seed) -> array of indices. kind is "shuffle" (full
+# Random.shuffle order), "pool" (Random.sample list-pool order, valid for every k that
+# sample handles with its list pool) or "set" (sample's set-based order for small k).
+_PERMUTATIONS: "OrderedDict[Tuple[str, int, int], array]" = OrderedDict()
+_PERMUTATIONS_BYTES = 0
+_PERMUTATIONS_LOCK = threading.Lock()
+
+# Version of the generate_seed_from_string mapping. Seeds derived from strings may be stored or
+# used as cache keys by other processes, so any change to the mapping must bump this.
+SEED_HASH_VERSION = 1
+_SEED_HASH_PERSON = f"webs-seed-v{SEED_HASH_VERSION}".encode("ascii")
+_SEED_MODULUS = 2147483647
+# Distinct strings whose seeds are memoized per process
+_SEED_HASH_MEMO_SIZE = 4096
+
+
+def _uses_permutation_table(seed: Any) -> bool:
+    return type(seed) is int and PERMUTATION_SEED_MIN <= seed <= PERMUTATION_SEED_MAX and SEED_PERMUTATION_CACHE_BYTES > 0
+
+
+def _sample_uses_set(n: int, k: int) -> bool:
+    """Mirror of Random.sample's choice between its set-based and list-pool algorithms."""
+    setsize = 21
+    if k > 5:
+        setsize += 4 ** ceil(log(k * 3, 4))
+    return n > setsize
+
+
+def _cached_indices(kind: str, n: int, seed: int, length: int) -> array:
+    """
+    Return the cached index array for (kind, n, seed) with at least length entries, building or
+    extending it on a miss. Both sample algorithms draw sequentially, so a longer sample starts
+    with every shorter one; only the set-based kind is ever built shorter than n.
+    """
+    global _PERMUTATIONS_BYTES
+    key = (kind, n, seed)
+    with _PERMUTATIONS_LOCK:
+        cached = _PERMUTATIONS.get(key)
+        if cached is not None and len(cached) >= length:
+            _PERMUTATIONS.move_to_end(key)
+            return cached
+
+    rng = random.Random(seed)
+    if kind == "shuffle":
+        order = list(range(n))
+        rng.shuffle(order)
+    elif kind == "pool":
+        order = rng.sample(range(n), n)
+    else:
+        # Grow geometrically, but never past the largest k that sample still draws with a set
+        grow_to = max(length, 2 * len(cached)) if cached is not None else length
+        while not _sample_uses_set(n, grow_to):
+            grow_to = (grow_to + length) // 2
+        order = rng.sample(range(n), grow_to)
+    indices = array("H" if n <= 0x10000 else "I", order)
+
+    size = len(indices) * indices.itemsize
+    with _PERMUTATIONS_LOCK:
+        previous = _PERMUTATIONS.pop(key, None)
+        if previous is not None:
+            _PERMUTATIONS_BYTES -= len(previous) * previous.itemsize
+        if size <= SEED_PERMUTATION_CACHE_BYTES:
+            _PERMUTATIONS[key] = indices
+            _PERMUTATIONS_BYTES += size
+            while _PERMUTATIONS_BYTES > SEED_PERMUTATION_CACHE_BYTES:
+                _evicted_key, evicted = _PERMUTATIONS.popitem(last=False)
+                _PERMUTATIONS_BYTES -= len(evicted) * evicted.itemsize
+    return indices
+
+
+def clear_permutation_cache() -> None:
+    """Drop every cached seed permutation."""
+    global _PERMUTATIONS_BYTES
+    with _PERMUTATIONS_LOCK:
+        _PERMUTATIONS.clear()
+        _PERMUTATIONS_BYTES = 0
+
+
+def seeded_sample_indices(n: int, seed: int, k: int) -> List[int]:
+    """
+    Equivalent of random.Random(seed).sample(range(n), k) (0 <= k <= n).
+    Seeds in 1-999 are served by slicing a cached permutation.
+    """
+    if not _uses_permutation_table(seed) or not 0 <= k <= n:
+        return random.Random(seed).sample(range(n), k)
+    kind = "set" if _sample_uses_set(n, k) else "pool"
+    return _cached_indices(kind, n, seed, k if kind == "set" else n)[:k].tolist()
+
+
+def seeded_shuffle_indices(n: int, seed: int, limit: Optional[int] = None) -> List[int]:
+    """
+    Index order produced by seeded_shuffle on an n-item pool (limit applied the same way).
+    Seeds in 1-999 are served by slicing a cached permutation.
+    """
+    if _uses_permutation_table(seed):
+        order = _cached_indices("shuffle", n, seed, n)
+    else:
+        order = list(range(n))
+        random.Random(seed).shuffle(order)
+    if limit is not None and limit > 0:
+        order = order[:limit]
+    return order.tolist() if isinstance(order, array) else order
+
+
+def seeded_partial_shuffle_indices(n: int, seed: int, limit: Optional[int] = None) -> List[int]:
+    """
+    First limit positions of a seeded permutation of range(n), in O(limit) time and memory
+    (Fisher-Yates from the front, with swaps kept in a dict instead of an n-item list).
+
+    Contract: equals random.Random(seed).sample(range(n), n)[:limit], so a longer limit always
+    extends a shorter one. This is a different order than seeded_shuffle, whose full shuffle
+    only settles the first positions after touching all n.
+    """
+    k = n if limit is None or limit <= 0 else min(limit, n)
+    rng = random.Random(seed)
+    swapped: Dict[int, int] = {}
+    result: List[int] = []
+    for i in range(k):
+        last = n - i - 1
+        j = rng.randrange(n - i)
+        result.append(swapped.get(j, j))
+        swapped[j] = swapped.get(last, last)
+    return result
+
+
+def seeded_permutation_slice(n: int, seed: int, start: int, stop: int, full_shuffle: bool = False) -> List[int]:
+    """
+    Positions start:stop of a seeded permutation of range(n), for paging through a pool.
+    full_shuffle=False follows seeded_partial_shuffle_indices (Random.sample) order, True follows
+    seeded_shuffle order. Seeds 1-999 slice the cached permutation, so pages do not redo the RNG.
+    """
+    stop = min(stop, n)
+    if start >= stop:
+        return []
+    if _uses_permutation_table(seed):
+        return _cached_indices("shuffle" if full_shuffle else "pool", n, seed, n)[start:stop].tolist()
+    if full_shuffle:
+        return seeded_shuffle_indices(n, seed)[start:stop]
+    return seeded_partial_shuffle_indices(n, seed, stop)[start:]
 
 
 def seeded_select(
@@ -34,19 +199,16 @@ def seeded_select(
     if not data_pool:
         return []
 
-    # Create a new Random instance with the seed
-    rng = random.Random(seed)
-
     if allow_duplicates or count > len(data_pool):
         # Select with replacement (can pick same item multiple times)
+        rng = random.Random(seed)
         return [rng.choice(data_pool) for _ in range(count)]
     else:
-        # Select without replacement (unique items)
-        # Use sample for efficiency
-        return rng.sample(data_pool, min(count, len(data_pool)))
+        # Select without replacement (unique items); same picks as rng.sample(data_pool, count)
+        return [data_pool[i] for i in seeded_sample_indices(len(data_pool), seed, count)]
 
 
-def seeded_shuffle(data_pool: List[Dict[str, Any]], seed: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+def seeded_shuffle(data_pool: List[Dict[str, Any]], seed: int, limit: Optional[int] = None, partial: bool = False) -> List[Dict[str, Any]]:
     """
     Shuffle data pool using seed and optionally limit results.
 
@@ -54,6 +216,8 @@ def seeded_shuffle(data_pool: List[Dict[str, Any]], seed: int, limit: Optional[i
         data_pool: Master dataset to shuffle
         seed: Seed value for reproducible shuffling
         limit: Optional limit on number of items to return
+        partial: If True, only draw the first limit positions (see seeded_partial_shuffle_indices);
+            O(limit) instead of O(len(data_pool)), but a different order than the full shuffle
 
     Returns:
         Shuffled list (deterministic based on seed)
@@ -61,17 +225,8 @@ def seeded_shuffle(data_pool: List[Dict[str, Any]], seed: int, limit: Optional[i
     if not data_pool:
         return []
 
-    # Create a new Random instance with the seed
-    rng = random.Random(seed)
-
-    # Make a copy to avoid modifying original
-    shuffled = data_pool.copy()
-    rng.shuffle(shuffled)
-
-    if limit is not None and limit > 0:
-        return shuffled[:limit]
-
-    return shuffled
+    order = seeded_partial_shuffle_indices if partial else seeded_shuffle_indices
+    return [data_pool[i] for i in order(len(data_pool), seed, limit)]
 
 
 def seeded_filter_and_select(
@@ -104,22 +259,32 @@ def seeded_filter_and_select(
     return seeded_select(filtered_pool, seed, count, allow_duplicates=False)
 
 
+@lru_cache(maxsize=_SEED_HASH_MEMO_SIZE)
 def generate_seed_from_string(text: str) -> int:
     """
     Generate a consistent seed value from a string.
     Useful for converting project names, dates, etc. to seeds.
 
+    The mapping is a keyed blake2b digest, so (unlike hash()) it is the same in every worker and
+    across restarts; it only changes together with SEED_HASH_VERSION.
+
     Args:
         text: Input string
 
     Returns:
-        Integer seed value (0 to 2^31-1)
+        Integer seed value (0 to 2^31-2)
     """
-    # Use hash but keep within valid seed range
-    return abs(hash(text)) % 2147483647
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8, person=_SEED_HASH_PERSON).digest()
+    return int.from_bytes(digest, "big") % _SEED_MODULUS
 
 
-def seeded_distribution(data_pool: List[Dict[str, Any]], seed: int, category_key: str, total_count: int) -> List[Dict[str, Any]]:
+def seeded_distribution(
+    data_pool: List[Dict[str, Any]],
+    seed: int,
+    category_key: str,
+    total_count: int,
+    proportional: bool = False,
+) -> List[Dict[str, Any]]:
     """
     Distribute selection across categories proportionally.
 
@@ -128,40 +293,68 @@ def seeded_distribution(data_pool: List[Dict[str, Any]], seed: int, category_key
         seed: Seed value
         category_key: Key that contains category (e.g., 'category')
         total_count: Total number of items to select
+        proportional: If True, allocate total_count in proportion to category sizes
+            instead of splitting it equally across categories
 
     Returns:
         Selected items with proportional category distribution
     """
-    rng = random.Random(seed)
+    categories = [item.get(category_key, "unknown") for item in data_pool]
+    return [data_pool[i] for i in seeded_distribution_indices(categories, seed, total_count, proportional)]
+
 
+def seeded_distribution_indices(categories: List[Any], seed: int, total_count: int, proportional: bool = False) -> List[int]:
+    """
+    Index form of seeded_distribution: categories[i] is the category of pool item i.
+    Returns pool indices in the same order seeded_distribution returns items.
+    """
     # Group by category
-    categories: Dict[str, List[Dict[str, Any]]] = {}
-    for item in data_pool:
-        cat = item.get(category_key, "unknown")
-        if cat not in categories:
-            categories[cat] = []
-        categories[cat].append(item)
-
-    if not categories:
-        return []
+    groups: Dict[Any, List[int]] = {}
+    for idx, cat in enumerate(categories):
+        if cat not in groups:
+            groups[cat] = []
+        groups[cat].append(idx)
 
-    # Calculate items per category
-    num_categories = len(categories)
-    base_per_category = total_count // num_categories
-    remainder = total_count % num_categories
+    return stratified_sample_indices(list(groups.values()), seed, total_count, proportional)
 
-    result = []
 
-    for idx, (cat, items) in enumerate(categories.items()):
-        # First categories get extra items from remainder
-        count_for_this_cat = base_per_category + (1 if idx < remainder else 0)
+def allocate_strata(sizes: Sequence[int], total_count: int, proportional: bool = False) -> List[int]:
+    """
+    Items to draw from each stratum. Equal split: total_count // len(sizes) each, the first
+    strata taking the remainder (a stratum smaller than its share just yields all its items).
+    Proportional: largest-remainder apportionment of total_count by size, ties to earlier strata.
+    """
+    if not sizes:
+        return []
+    if not proportional:
+        base_per_category, remainder = divmod(total_count, len(sizes))
+        return [min(base_per_category + (1 if idx < remainder else 0), size) for idx, size in enumerate(sizes)]
+    population = sum(sizes)
+    if total_count >= population:
+        return list(sizes)
+    quotas = [total_count * size // population for size in sizes]
+    leftover = total_count - sum(quotas)
+    by_remainder = sorted(range(len(sizes)), key=lambda idx: (-(total_count * sizes[idx] % population), idx))
+    for idx in by_remainder[:leftover]:
+        quotas[idx] += 1
+    return quotas
+
+
+def stratified_sample_indices(groups: Sequence[Sequence[int]], seed: int, total_count: int, proportional: bool = False) -> List[int]:
+    """
+    Seeded stratified sample over prebuilt groups of pool indices (one group per category,
+    in first-appearance order). Stratum idx is sampled with seed + idx, then the picks are
+    shuffled with seed; with proportional=False this is exactly seeded_distribution's order.
+    """
+    if not groups:
+        return []
 
-        # Select from this category
-        if items:
+    rng = random.Random(seed)
+    result: List[int] = []
+    for idx, (indices, count_for_this_cat) in enumerate(zip(groups, allocate_strata([len(g) for g in groups], total_count, proportional))):
+        if indices:
             # Use seed + category index for deterministic but varied selection
-            cat_rng = random.Random(seed + idx)
-            selected = cat_rng.sample(items, min(count_for_this_cat, len(items)))
-            result.extend(selected)
+            result.extend(indices[i] for i in seeded_sample_indices(len(indices), seed + idx, count_for_this_cat))
 
     # Final shuffle with original seed
     rng.shuffle(result)
@@ -190,6 +383,201 @@ def verify_reproducibility(data_pool: List[Dict[str, Any]], seed: int, count: in
     return True
 
 
+# --- Index-based selection engine ---
+# Works on integer positions into a pool instead of lists of dicts: filters are unions of
+# per-value posting lists (inverted index over a factorized column), selections are index
+# lists, and only the final k items are materialized.
+#
+# Modes:
+#   "compat" (default): same picks and order as seeded_select / seeded_shuffle /
+#       seeded_filter_and_select / seeded_distribution for the same seed. Samples with Python's
+#       random (via the permutation table).
+#   "numpy": NumPy Generator (PCG64) sampling; deterministic per seed but different picks than
+#       compat, so switching a deployment to it changes what every seed returns. Requires NumPy.
+SELECTION_MODE_COMPAT = "compat"
+SELECTION_MODE_NUMPY = "numpy"
+
+
+def check_selection_mode(mode: str) -> str:
+    """Return mode if this process can select with it; raise ValueError / RuntimeError otherwise."""
+    if mode not in (SELECTION_MODE_COMPAT, SELECTION_MODE_NUMPY):
+        raise ValueError(f"Unknown selection mode: {mode}")
+    if mode == SELECTION_MODE_NUMPY and not HAS_NUMPY:
+        raise RuntimeError("Selection mode 'numpy' requires numpy to be installed")
+    return mode
+
+
+# Mode the server builds pool selectors with, checked at import so a bad value stops startup
+SELECTION_MODE = check_selection_mode(os.getenv("SELECTION_MODE", SELECTION_MODE_COMPAT).lower())
+
+# method=shuffle order: "full" (seeded_shuffle, the historical order) or "partial" (O(limit)
+# prefix of a seeded permutation; different items per seed, so opting in changes responses)
+SHUFFLE_MODE_FULL = "full"
+SHUFFLE_MODE_PARTIAL = "partial"
+SHUFFLE_MODE = os.getenv("SHUFFLE_MODE", SHUFFLE_MODE_FULL).lower()
+
+
+class IndexSelector:
+    """
+    Seeded selection over positions of a pool. Column factorizations and inverted indexes are
+    built once per key and reused, so keep one selector per pool (e.g. DataPool.derived)
+    rather than per request.
+    """
+
+    def __init__(self, pool: Sequence[Dict[str, Any]], mode: str = SELECTION_MODE_COMPAT):
+        self.pool = pool
+        self.mode = check_selection_mode(mode)
+        self._columns: Dict[str, Tuple[array, Dict[Any, int]]] = {}
+        self._postings: Dict[str, Tuple[List[array], Dict[Any, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.pool)
+
+    def column_codes(self, key: str, default: Any = None) -> Tuple[array, Dict[Any, int]]:
+        """
+        Factorize item.get(key, default) over the pool: (codes, value -> code), codes numbered
+        in first-appearance order. Unhashable values get code -1 and never match a filter.
+        """
+        cache_key = f"{key}\0{default!r}"
+        cached = self._columns.get(cache_key)
+        if cached is not None:
+            return cached
+        vocab: Dict[Any, int] = {}
+        codes = array("i", bytes(4 * len(self.pool)))
+        for position, item in enumerate(self.pool):
+            value = item.get(key, default)
+            try:
+                codes[position] = vocab.setdefault(value, len(vocab))
+            except TypeError:
+                codes[position] = -1
+        self._columns[cache_key] = (codes, vocab)
+        return codes, vocab
+
+    def postings(self, key: str, default: Any = None) -> Tuple[List[array], Dict[Any, int]]:
+        """
+        Inverted index for key: (posting lists indexed by value code, value -> code). Each posting
+        list holds the ascending positions of the items whose item.get(key, default) has that
+        value; lists are in first-appearance order of their values, so they double as groupings.
+        """
+        cache_key = f"{key}\0{default!r}"
+        cached = self._postings.get(cache_key)
+        if cached is not None:
+            return cached
+        codes, vocab = self.column_codes(key, default)
+        lists = [array("I") for _ in range(len(vocab))]
+        for position, code in enumerate(codes.tolist()):
+            if code >= 0:
+                lists[code].append(position)
+        self._postings[cache_key] = (lists, vocab)
+        return lists, vocab
+
+    def mask(self, key: str, values: Sequence[Any]) -> List[int]:
+        """Ascending positions whose item.get(key) is one of values: a union of posting lists."""
+        lists, vocab = self.postings(key)
+        wanted = sorted({vocab[v] for v in values if _hashable(v) and v in vocab})
+        if len(wanted) == 1:
+            return lists[wanted[0]].tolist()
+        # Posting lists are disjoint ascending runs, which sorted() merges in near-linear time
+        merged: List[int] = []
+        for code in wanted:
+            merged.extend(lists[code])
+        merged.sort()
+        return merged
+
+    def select(self, seed: int, count: int, positions: Optional[Sequence[int]] = None) -> List[int]:
+        """Positions picked like seeded_select(pool or positions subset, seed, count)."""
+        n = len(self.pool) if positions is None else len(positions)
+        if n == 0:
+            return []
+        if self.mode == SELECTION_MODE_NUMPY:
+            rng = np.random.default_rng(seed)
+            picks = rng.integers(0, n, size=count) if count > n else rng.choice(n, size=count, replace=False)
+            return _take(picks.tolist(), positions)
+        if count > n:
+            rng = random.Random(seed)
+            population = range(n) if positions is None else positions
+            return [rng.choice(population) for _ in range(count)]
+        return _take(seeded_sample_indices(n, seed, count), positions)
+
+    def shuffle(self, seed: int, limit: Optional[int] = None, positions: Optional[Sequence[int]] = None, partial: bool = False) -> List[int]:
+        """
+        Positions in seeded_shuffle order (first limit of them when limit > 0). With partial=True
+        only the first limit positions are drawn, in O(limit) (seeded_shuffle(..., partial=True)).
+        """
+        n = len(self.pool) if positions is None else len(positions)
+        if n == 0:
+            return []
+        if self.mode == SELECTION_MODE_NUMPY:
+            rng = np.random.default_rng(seed)
+            if partial and limit is not None and 0 < limit < n:
+                # Generator.choice without replacement only draws `limit` positions for small limits
+                return _take(rng.choice(n, size=limit, replace=False).tolist(), positions)
+            order = rng.permutation(n)
+            if limit is not None and limit > 0:
+                order = order[:limit]
+            return _take(order.tolist(), positions)
+        order = seeded_partial_shuffle_indices if partial else seeded_shuffle_indices
+        return _take(order(n, seed, limit), positions)
+
+    def page(self, seed: int, offset: int, limit: int, positions: Optional[Sequence[int]] = None, shuffle: bool = False, partial: bool = False) -> List[int]:
+        """
+        Positions offset:offset+limit of the seeded permutation a paginated load walks: the
+        seeded_shuffle order when shuffle is set (and not partial), else the Random.sample order
+        (see seeded_permutation_slice). Consecutive pages never repeat or skip a position.
+
+        The order does not depend on limit, so the first page is not always the select(seed, limit)
+        result: once n is past Random.sample's set-based threshold for limit (n > 277 at limit=50),
+        select draws sample(range(n), limit) differently from the sample(range(n), n) walk.
+        """
+        n = len(self.pool) if positions is None else len(positions)
+        if self.mode == SELECTION_MODE_NUMPY:
+            return _take(np.random.default_rng(seed).permutation(n)[offset : offset + limit].tolist(), positions)
+        return _take(seeded_permutation_slice(n, seed, offset, offset + limit, full_shuffle=shuffle and not partial), positions)
+
+    def filter_select(self, seed: int, count: int, filter_key: Optional[str], filter_values: Optional[Sequence[Any]]) -> List[int]:
+        """Positions picked like seeded_filter_and_select."""
+        if filter_key and filter_values:
+            return self.select(seed, count, self.mask(filter_key, filter_values))
+        return self.select(seed, count)
+
+    def distribute(self, seed: int, category_key: str, total_count: int, proportional: bool = False) -> List[int]:
+        """
+        Positions picked like seeded_distribution (equal split across categories, or in
+        proportion to category sizes). Groups come from the cached inverted index of category_key.
+        """
+        groups, _vocab = self.postings(category_key, "unknown")
+        if self.mode == SELECTION_MODE_COMPAT:
+            return stratified_sample_indices(groups, seed, total_count, proportional)
+        if not groups:
+            return []
+        picked = [
+            np.random.default_rng(seed + idx).choice(np.frombuffer(group, dtype=np.uint32), size=take, replace=False)
+            for idx, (group, take) in enumerate(zip(groups, allocate_strata([len(g) for g in groups], total_count, proportional)))
+        ]
+        result = np.concatenate(picked)
+        np.random.default_rng(seed).shuffle(result)
+        return result[:total_count].tolist()
+
+    def materialize(self, positions: Sequence[int]) -> List[Dict[str, Any]]:
+        """Item dicts for positions (the only step that touches the items themselves)."""
+        return [self.pool[i] for i in positions]
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _take(picks: List[int], positions: Optional[Sequence[int]]) -> List[int]:
+    """Map picks (offsets into positions) back to pool positions."""
+    if positions is None:
+        return picks
+    return [positions[i] for i in picks]
+
+
 # Example usage and manual tests (excluded from coverage)
 if __name__ == "__main__":  # pragma: no cover
     # Test data
@@ -1,18 +1,20 @@
 import asyncio
+import base64
+import hashlib
 import os
 from contextlib import asynccontextmanager
-from datetime import datetime, timezone
-from typing import Annotated, List, Dict, Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, AsyncIterator, Iterable, List, Dict, Any, Literal, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
 import asyncpg
 import uvicorn
-from asyncpg.exceptions import PostgresError
+from asyncpg.exceptions import InvalidCachedStatementError, PostgresError, UndefinedTableError
 import orjson
 from fastapi import FastAPI, HTTPException, Query, status, Request
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from loguru import logger
 from pydantic import BaseModel, Field, field_validator
 from openai import AsyncOpenAI
@@ -36,22 +38,29 @@ from master_dataset_handler import (
     list_available_pools,
 )
 from data_handler import (
-    load_all_data,
+    DataPool,
+    load_pool_async,
     append_or_rollover_entity_data,
     append_to_entity_data,
     get_allowed_project_keys,
+    build_path_index,
 )
 from seeded_selector import (
-    seeded_select,
-    seeded_shuffle,
-    seeded_filter_and_select,
-    seeded_distribution,
+    SELECTION_MODE,
+    SHUFFLE_MODE,
+    SHUFFLE_MODE_PARTIAL,
+    IndexSelector,
 )
 from generators.smart_generator import (
     build_generation_prompt_from_examples,
     get_project_entity_metadata,
 )
 from seed_resolver import resolve_seeds
+from shared_pool_store import SHARED_POOL_STORE_PATH, attach_shared_store, detach_shared_store
+from event_buffer import EVENT_WRITE_BEHIND, BufferedEvent, BufferFull, EventBuffer
+from event_partitions import PartitionMaintainer, events_partitioned
+from query_plan_check import EVENTS_QUERY_PLAN_CHECK, PLAN_CHECK_PARAMS, PlanQuery, check_events_query_plans
+from response_cache import LOAD_RESPONSE_CACHE_BYTES, CachedBody, ResponseCache, accepts_gzip, gzip_etag, make_etag, match_if_none_match
 
 # --- Configuration ---
 # Default is a placeholder for local dev; set DATABASE_URL in production (no hardcoded credentials).
@@ -64,6 +73,12 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 WEBS_HEALTH_BASE_URL = os.getenv("WEBS_HEALTH_BASE_URL", "http://localhost")
 WEBS_HEALTH_BASE_PORT = int(os.getenv("WEBS_HEALTH_BASE_PORT", "8000"))
 WEBS_HEALTH_COUNT = int(os.getenv("WEBS_HEALTH_COUNT", "14"))
+DATASET_BATCH_MAX_LOADS = int(os.getenv("DATASET_BATCH_MAX_LOADS", "20"))
+EVENT_BATCH_MAX_EVENTS = int(os.getenv("EVENT_BATCH_MAX_EVENTS", "1000"))
+EVENTS_PAGE_MAX_LIMIT = int(os.getenv("EVENTS_PAGE_MAX_LIMIT", "1000"))
+# Incremental /get_events/ pages only hold events older than this, so rows stamped earlier but
+# committed (or flushed by another worker's write-behind buffer) later are not paged past
+EVENTS_PAGE_SETTLE_MS = int(os.getenv("EVENTS_PAGE_SETTLE_MS", "2000"))
 
 # Sonar: shared message literals (avoid duplication)
 MSG_DATABASE_UNAVAILABLE = "Database service temporarily unavailable."
@@ -198,14 +213,32 @@ def extract_json_from_content(content: str) -> str:
     return content
 
 
+# Length of the VARCHAR(255) web_agent_id / validator_id columns
+EVENT_ID_MAX_LENGTH = 255
+
 # --- SQL Query Constants ---
+# created_at is stamped with clock_timestamp() (the insert time, not NOW()'s transaction start), so
+# a row commits shortly after its created_at; keyset pages stop EVENTS_PAGE_SETTLE_MS short of now to
+# cover that gap. Explicit rather than the column default so databases created before that default get it too.
 INSERT_EVENT_SQL = """
-                   INSERT INTO events (web_agent_id, web_url, validator_id, event_data)
-                   VALUES ($1, $2, $3, $4) RETURNING id, created_at;
+                   INSERT INTO events (web_agent_id, web_url, validator_id, event_data, created_at)
+                   VALUES ($1, $2, $3, $4, clock_timestamp()) RETURNING id, created_at;
+                   """
+
+# One statement for a whole batch: rows are inserted in request order (ORDER BY position), so the
+# SERIAL ids are ascending in that order; the statement is atomic, so a failing row saves nothing.
+INSERT_EVENTS_BATCH_SQL = """
+                   INSERT INTO events (web_agent_id, web_url, validator_id, event_data, created_at)
+                   SELECT batch.web_agent_id, batch.web_url, batch.validator_id, batch.event_data, clock_timestamp()
+                   FROM unnest($1::varchar[], $2::text[], $3::varchar[], $4::jsonb[]) WITH ORDINALITY
+                        AS batch(web_agent_id, web_url, validator_id, event_data, position)
+                   ORDER BY batch.position
+                   RETURNING id, created_at;
                    """
 
+# event_data is read as text (not through the jsonb codec) so /get_events/ can pass it through unparsed
 SELECT_EVENTS_SQL = """
-                    SELECT id, web_agent_id, web_url, validator_id, event_data AS data, created_at
+                    SELECT id, web_agent_id, web_url, validator_id, event_data::text AS data, created_at
                     FROM events
                     WHERE web_url = $1
                       AND web_agent_id = $2
@@ -213,6 +246,31 @@ SELECT_EVENTS_SQL = """
                     ORDER BY created_at DESC;
                     """
 
+# Keyset page over (created_at, id): events strictly after the position and created before the
+# settle horizon ($7), oldest first. The plain created_at bounds let idx_events_lookup start the scan
+# at the position (id is not in the index).
+SELECT_EVENTS_AFTER_SQL = """
+                    SELECT id, web_agent_id, web_url, validator_id, event_data::text AS data, created_at
+                    FROM events
+                    WHERE web_url = $1
+                      AND web_agent_id = $2
+                      AND validator_id = $3
+                      AND created_at >= $4
+                      AND created_at < $7
+                      AND (created_at, id) > ($4, $5)
+                    ORDER BY created_at, id
+                    LIMIT $6;
+                    """
+
+SELECT_EVENT_POSITION_SQL = """
+                    SELECT created_at
+                    FROM events
+                    WHERE id = $1
+                      AND web_url = $2
+                      AND web_agent_id = $3
+                      AND validator_id = $4;
+                    """
+
 DELETE_EVENTS_SQL = """
                     WITH deleted_rows AS (
                         DELETE
@@ -226,12 +284,32 @@ DELETE_EVENTS_SQL = """
                     FROM deleted_rows;
                     """
 
+# Validator-wide reset (/reset_events/validator), partitioned schema only: truncates the validator's
+# partition, or deletes its rows from events_default and creates one (002_events_partitioned.sql)
+RESET_VALIDATOR_EVENTS_SQL = "SELECT deleted, truncated FROM reset_validator_events($1);"
+
+# Prepared on every new pool connection (init_db_connection) and run through those statements
+# (EventsConnection), so the first request on a connection skips parse/plan
+PREPARED_EVENT_STATEMENTS = (INSERT_EVENT_SQL, SELECT_EVENTS_SQL, SELECT_EVENTS_AFTER_SQL, DELETE_EVENTS_SQL)
+
+# Statements EXPLAINed by the startup query-plan check
+EVENTS_PLAN_QUERIES = (
+    PlanQuery("select_events", SELECT_EVENTS_SQL, ordered=True),
+    PlanQuery(
+        "select_events_after",
+        SELECT_EVENTS_AFTER_SQL,
+        ordered=True,
+        params=(*PLAN_CHECK_PARAMS, datetime(2000, 1, 1, tzinfo=timezone.utc), 0, EVENTS_PAGE_MAX_LIMIT, datetime(2100, 1, 1, tzinfo=timezone.utc)),
+    ),
+    PlanQuery("delete_events", DELETE_EVENTS_SQL),
+)
+
 
 # --- Pydantic Models ---
 class EventInput(BaseModel):
-    web_agent_id: Optional[str] = Field(default=None, max_length=255)
+    web_agent_id: Optional[str] = Field(default=None, max_length=EVENT_ID_MAX_LENGTH)
     web_url: str
-    validator_id: Optional[str] = None
+    validator_id: Optional[str] = Field(default=None, max_length=EVENT_ID_MAX_LENGTH)
     data: Dict[str, Any]
 
     @field_validator("web_url")
@@ -261,6 +339,21 @@ class EventSaveResponse(BaseModel):
     created_at: datetime
 
 
+class EventBatchInput(BaseModel):
+    events: List[EventInput] = Field(..., min_length=1, max_length=EVENT_BATCH_MAX_EVENTS, description="Events to save, in order")
+
+
+class SavedEvent(BaseModel):
+    event_id: int
+    created_at: datetime
+
+
+class EventBatchSaveResponse(BaseModel):
+    message: str
+    events: List[SavedEvent] = Field(description="Saved ids, in request order")
+    count: int
+
+
 class ResetResponse(BaseModel):
     message: str
     web_url: str
@@ -268,6 +361,14 @@ class ResetResponse(BaseModel):
     validator_id: str
 
 
+class ValidatorResetResponse(BaseModel):
+    message: str
+    validator_id: str
+    deleted_count: int
+    # True when the validator's partition was truncated: deleted_count is then an estimate
+    approximate: bool
+
+
 # --- Data Generation Models (generic) ---
 class DataGenerationRequest(BaseModel):
     interface_definition: str = Field(..., description="TypeScript interface definition")
@@ -293,6 +394,78 @@ class DataGenerationResponse(BaseModel):
 
 
 # --- Database Initialization ---
+# jsonb binary wire format: a version byte, then the JSON text
+_JSONB_FORMAT_VERSION = b"\x01"
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    """jsonb parameter encoder: objects are serialized by orjson; str/bytes are taken as JSON text already."""
+    if isinstance(value, str):
+        return _JSONB_FORMAT_VERSION + value.encode("utf-8")
+    if isinstance(value, (bytes, bytearray)):
+        return _JSONB_FORMAT_VERSION + bytes(value)
+    return _JSONB_FORMAT_VERSION + orjson.dumps(value)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    return orjson.loads(data[1:])
+
+
+class EventsConnection(asyncpg.Connection):
+    """
+    Pool connection (create_pool connection_class) that runs PREPARED_EVENT_STATEMENTS through the
+    PreparedStatements init_db_connection made for it; every other query takes asyncpg's usual path.
+    """
+
+    __slots__ = ("_event_statements",)
+
+    def _prepared_event_statements(self) -> Dict[str, Any]:
+        return getattr(self, "_event_statements", None) or {}
+
+    async def _run_prepared(self, query: str, method: str, args: Sequence[Any], **kwargs: Any) -> Any:
+        try:
+            return await getattr(self._event_statements[query], method)(*args, **kwargs)
+        except InvalidCachedStatementError:
+            # The schema changed under the statement (e.g. a migration): drop it and let asyncpg
+            # re-prepare, unless a transaction is open (the error aborted it)
+            del self._event_statements[query]
+            if self.is_in_transaction():
+                raise
+            return await getattr(super(), method)(query, *args, **kwargs)
+
+    async def fetch(self, query, *args, timeout=None, record_class=None):
+        if record_class is None and query in self._prepared_event_statements():
+            return await self._run_prepared(query, "fetch", args, timeout=timeout)
+        return await super().fetch(query, *args, timeout=timeout, record_class=record_class)
+
+    async def fetchrow(self, query, *args, timeout=None, record_class=None):
+        if record_class is None and query in self._prepared_event_statements():
+            return await self._run_prepared(query, "fetchrow", args, timeout=timeout)
+        return await super().fetchrow(query, *args, timeout=timeout, record_class=record_class)
+
+    async def fetchval(self, query, *args, column=0, timeout=None):
+        if query in self._prepared_event_statements():
+            return await self._run_prepared(query, "fetchval", args, column=column, timeout=timeout)
+        return await super().fetchval(query, *args, column=column, timeout=timeout)
+
+
+async def init_db_connection(conn: EventsConnection) -> None:
+    """
+    asyncpg init hook, run on every new pool connection: registers orjson-backed binary jsonb
+    codecs and prepares PREPARED_EVENT_STATEMENTS, which the connection then runs requests
+    through. A missing events table (database not initialized yet) leaves the remaining
+    statements to asyncpg's statement cache.
+    """
+    await conn.set_type_codec("jsonb", schema="pg_catalog", encoder=_encode_jsonb, decoder=_decode_jsonb, format="binary")
+    statements: Dict[str, Any] = {}
+    try:
+        for sql in PREPARED_EVENT_STATEMENTS:
+            statements[sql] = await conn.prepare(sql)
+    except UndefinedTableError as e:
+        logger.warning(f"Skipping event statement warm-up: {e}")
+    conn._event_statements = statements
+
+
 async def init_db_pool():  # pragma: no cover
     """Initializes the database connection pool and prepared statements."""
     retry_count = 0
@@ -313,6 +486,8 @@ async def init_db_pool():  # pragma: no cover
                     "application_name": "webs_server_api",
                     "timezone": "UTC",
                 },
+                init=init_db_connection,
+                connection_class=EventsConnection,
             )
 
             # Test the connection pool
@@ -337,14 +512,56 @@ async def init_db_pool():  # pragma: no cover
             await asyncio.sleep(retry_delay)
 
 
+async def verify_events_query_plans(mode: str = EVENTS_QUERY_PLAN_CHECK, partitioned: bool = False) -> List[str]:
+    """
+    EXPLAIN the events queries (EVENTS_QUERY_PLAN_CHECK): problems are logged with warn and abort
+    startup with fail. partitioned: events is partitioned, so partition names are resolved. Returns
+    the problems found.
+    """
+    if mode == "off" or getattr(app.state, "pool", None) is None:
+        return []
+    async with app.state.pool.acquire() as conn:
+        problems = await check_events_query_plans(conn, EVENTS_PLAN_QUERIES, partitioned)
+    for problem in problems:
+        logger.warning(f"Events query plan regression: {problem}")
+    if problems and mode == "fail":
+        raise RuntimeError(f"Events queries do not use their indexes: {'; '.join(problems)}")
+    return problems
+
+
 # --- Application Lifespan Management ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # pragma: no cover
     # Startup
     await init_db_pool()
+    app.state.events_partitioned = getattr(app.state, "pool", None) is not None and await events_partitioned(app.state.pool)
+    if app.state.events_partitioned:
+        logger.info("events is partitioned; starting partition maintenance")
+        app.state.partition_maintainer = PartitionMaintainer(app.state.pool)
+        app.state.partition_maintainer.start()
+    await verify_events_query_plans(partitioned=app.state.events_partitioned)
+    if EVENT_WRITE_BEHIND and getattr(app.state, "pool", None) is not None:
+        app.state.event_buffer = EventBuffer(app.state.pool)
+        app.state.event_buffer.start()
+    build_path_index()
+    # Map the pool store built by run_api.sh (if any) instead of parsing initial_data in every worker
+    shared_store = attach_shared_store(SHARED_POOL_STORE_PATH) if SHARED_POOL_STORE_PATH else None
     logger.info("Application startup complete.")
     yield
+    detach_shared_store(shared_store)
     # Shutdown
+    partition_maintainer = getattr(app.state, "partition_maintainer", None)
+    if partition_maintainer is not None:
+        await partition_maintainer.close()
+        app.state.partition_maintainer = None
+    event_buffer = getattr(app.state, "event_buffer", None)
+    if event_buffer is not None:
+        # Before closing the pool: queued events still need a connection
+        try:
+            await event_buffer.close()
+        except Exception as e:
+            logger.error(f"Failed to flush {len(event_buffer)} buffered events on shutdown: {e}")
+        app.state.event_buffer = None
     if hasattr(app.state, "pool") and app.state.pool:
         try:
             await app.state.pool.close()
@@ -405,8 +622,10 @@ async def root():
             "health": "/health",
             "health_webs": "/health/webs",
             "save_events": "/save_events/",
+            "save_events_batch": "/save_events/batch",
             "get_events": "/get_events/",
             "reset_events": "/reset_events/",
+            "reset_validator_events": "/reset_events/validator",
             "generate_dataset": "/datasets/generate",
             "generate_smart": "/datasets/generate-smart",
             "load_dataset": "/datasets/load",
@@ -416,6 +635,51 @@ async def root():
     }
 
 
+def _event_identity(request: Request, event: EventInput) -> Tuple[str, str]:
+    """
+    (web_agent_id, validator_id) to store for event. Non-empty X-WebAgent-Id / X-Validator-Id
+    headers take precedence over body values, which fall back to "UNKNOWN_AGENT" / "1".
+    """
+    header_web_agent_id = request.headers.get("X-WebAgent-Id")
+    header_validator_id = request.headers.get("X-Validator-Id")
+    web_agent_id = header_web_agent_id if header_web_agent_id and header_web_agent_id.strip() else (event.web_agent_id or "UNKNOWN_AGENT")
+    validator_id = header_validator_id if header_validator_id and header_validator_id.strip() else (event.validator_id or "1")
+    # Both columns are VARCHAR(255): reject here rather than fail the INSERT (or a write-behind COPY)
+    for header, value in (("X-WebAgent-Id", web_agent_id), ("X-Validator-Id", validator_id)):
+        if len(value) > EVENT_ID_MAX_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{header} must be at most {EVENT_ID_MAX_LENGTH} characters",
+            )
+    return web_agent_id, validator_id
+
+
+async def _buffer_event(event_buffer: EventBuffer, web_agent_id: str, web_url: str, validator_id: str, event_data: str) -> EventSaveResponse:
+    """Write-behind save: queue the event (its id is reserved up front); 429 when the buffer is full."""
+    try:
+        buffered = await event_buffer.put(web_agent_id, web_url, validator_id, event_data)
+    except BufferFull as e:
+        logger.warning(f"Rejecting event: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Event buffer is full; retry shortly.",
+            headers={"Retry-After": "1"},
+        ) from e
+    return EventSaveResponse(message="Event queued successfully", event_id=buffered.id, created_at=buffered.created_at)
+
+
+def _buffered_event_row(event: BufferedEvent) -> Dict[str, Any]:
+    """A not yet flushed event shaped like a processed /get_events/ row."""
+    return {
+        "id": event.id,
+        "web_agent_id": event.web_agent_id,
+        "web_url": event.web_url,
+        "validator_id": event.validator_id,
+        "data": orjson.Fragment(event.event_data),
+        "created_at": event.created_at,
+    }
+
+
 # --- API Endpoints ---
 @app.post(
     "/save_events/",
@@ -438,22 +702,10 @@ async def save_event_endpoint(event: EventInput, request: Request):
             detail=MSG_DATABASE_UNAVAILABLE,
         )
     try:
-        # Leer valores de headers PRIMERO (tienen prioridad sobre body)
-        header_web_agent_id = request.headers.get("X-WebAgent-Id")
-        header_validator_id = request.headers.get("X-Validator-Id")
-
-        # Verificar que los headers no sean vacíos o None
-        has_header_web_agent = header_web_agent_id and header_web_agent_id.strip()
-        has_header_validator = header_validator_id and header_validator_id.strip()
+        final_web_agent_id, final_validator_id = _event_identity(request, event)
 
-        # PRIORIDAD: Headers primero, luego body, luego defaults
-        final_web_agent_id = header_web_agent_id if has_header_web_agent else (event.web_agent_id or "UNKNOWN_AGENT")
-        final_validator_id = header_validator_id if has_header_validator else (event.validator_id or "1")
+        logger.debug(f"Event save - Using web_agent_id={final_web_agent_id}, validator_id={final_validator_id}")
 
-        logger.debug(f"Event save - Using web_agent_id={final_web_agent_id} (from headers={has_header_web_agent})")
-        logger.debug(f"Event save - Using validator_id={final_validator_id} (from headers={has_header_validator})")
-
-        event_data_json_string = orjson.dumps(event.data).decode("utf-8")
         # --- Apply trimming before saving ---
         trimmed_url = trim_url_to_origin(event.web_url)
         if not trimmed_url:
@@ -462,12 +714,17 @@ async def save_event_endpoint(event: EventInput, request: Request):
                 detail=MSG_INVALID_WEB_URL,
             )
 
+        event_buffer = getattr(app.state, "event_buffer", None)
+        if event_buffer is not None:
+            return await _buffer_event(event_buffer, final_web_agent_id, trimmed_url, final_validator_id, orjson.dumps(event.data).decode("utf-8"))
+
+        # The connection's jsonb codec serializes event.data (init_db_connection)
         result = await app.state.pool.fetchrow(
             INSERT_EVENT_SQL,
             final_web_agent_id,
             trimmed_url,
             final_validator_id,
-            event_data_json_string,
+            event.data,
         )
         if result:
             logger.info(f"Event saved successfully with ID: {result['id']}")
@@ -499,6 +756,176 @@ async def save_event_endpoint(event: EventInput, request: Request):
         ) from e
 
 
+@app.post(
+    "/save_events/batch",
+    response_model=EventBatchSaveResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Save several events in one request",
+)
+async def save_events_batch_endpoint(batch: EventBatchInput, request: Request):
+    """
+    Saves a batch of events with a single INSERT (one round trip, all-or-nothing) and returns
+    their ids in request order. Each event is stored exactly as /save_events/ would store it:
+    web_url trimmed to its origin, X-WebAgent-Id / X-Validator-Id headers (shared by the batch)
+    taking precedence over per-event body values.
+    """
+    if not hasattr(app.state, "pool") or app.state.pool is None:
+        logger.error("Database pool not available for saving events.")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=MSG_DATABASE_UNAVAILABLE,
+        )
+    try:
+        web_agent_ids: List[str] = []
+        web_urls: List[str] = []
+        validator_ids: List[str] = []
+        payloads: List[Dict[str, Any]] = []
+        for position, event in enumerate(batch.events):
+            trimmed_url = trim_url_to_origin(event.web_url)
+            if not trimmed_url:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"{MSG_INVALID_WEB_URL} (event {position})",
+                )
+            web_agent_id, validator_id = _event_identity(request, event)
+            web_agent_ids.append(web_agent_id)
+            web_urls.append(trimmed_url)
+            validator_ids.append(validator_id)
+            payloads.append(event.data)
+
+        rows = await app.state.pool.fetch(INSERT_EVENTS_BATCH_SQL, web_agent_ids, web_urls, validator_ids, payloads)
+        if not rows or len(rows) != len(batch.events):
+            logger.error("Event batch save did not return one row per event.")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to save events due to unexpected DB response.",
+            )
+        # ids follow insertion (= request) order; RETURNING order itself is not guaranteed
+        saved = [SavedEvent(event_id=row["id"], created_at=row["created_at"]) for row in sorted(rows, key=lambda row: row["id"])]
+        logger.info(f"Saved batch of {len(saved)} events (IDs {saved[0].event_id}-{saved[-1].event_id})")
+        return EventBatchSaveResponse(message="Events saved successfully", events=saved, count=len(saved))
+
+    except PostgresError as e:
+        logger.error(f"Database error during event batch save: {e} (SQLState: {e.sqlstate}).")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database operation failed during batch save: {e.pgcode}.",
+        ) from e
+    except HTTPException:
+        raise
+    except Exception as e:  # pragma: no cover
+        logger.error(f"Unexpected error during event batch save: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An internal server error occurred while saving the events.",
+        ) from e
+
+
+def _event_row_dicts(rows: Sequence[asyncpg.Record]) -> List[Dict[str, Any]]:
+    """
+    Event rows as dicts with data passed through as its JSONB text (an orjson.Fragment), so
+    payloads are copied into the response body without being parsed ({} when missing).
+    """
+    processed_rows = []
+    for row in rows:
+        row_dict = dict(row)
+        raw_data = row_dict.get("data")
+        if isinstance(raw_data, (str, bytes)):
+            # Postgres only hands out valid JSON for a jsonb column
+            row_dict["data"] = orjson.Fragment(raw_data)
+        elif raw_data is None:
+            row_dict["data"] = {}
+
+        processed_rows.append(row_dict)
+    return processed_rows
+
+
+def _events_response(processed_rows: List[Dict[str, Any]], headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    /get_events/ body encoded by orjson in one pass, bypassing EventOutput validation and
+    re-serialization; OPT_UTC_Z keeps created_at formatted as the response model does.
+    """
+    return Response(content=orjson.dumps(processed_rows, option=orjson.OPT_UTC_Z), media_type="application/json", headers=headers)
+
+
+def _unflushed_events(key: Tuple[str, str, str]) -> List[BufferedEvent]:
+    event_buffer = getattr(app.state, "event_buffer", None)
+    return event_buffer.unflushed(key) if event_buffer is not None else []
+
+
+def _with_unflushed(processed_rows: List[Dict[str, Any]], unflushed: Sequence[BufferedEvent]) -> List[Dict[str, Any]]:
+    """processed_rows plus the write-behind events not among them (by id); order is left to the caller."""
+    stored_ids = {row["id"] for row in processed_rows}
+    return processed_rows + [_buffered_event_row(event) for event in unflushed if event.id not in stored_ids]
+
+
+# SERIAL upper bound: the position (since, _EVENT_ID_MAX) is after every event created at `since`
+_EVENT_ID_MAX = 2**31 - 1
+
+EventPosition = Tuple[datetime, int]
+
+
+def _encode_events_cursor(position: EventPosition) -> str:
+    raw = orjson.dumps({"t": position[0].isoformat(), "i": position[1]})
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _decode_events_cursor(cursor: str) -> EventPosition:
+    try:
+        state = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        created_at, event_id = datetime.fromisoformat(state["t"]), int(state["i"])
+    except (ValueError, TypeError, KeyError, orjson.JSONDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    # Issued cursors always carry an offset; a naive time cannot be compared with created_at
+    if created_at.tzinfo is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return created_at, event_id
+
+
+async def _resolve_events_position(key: Tuple[str, str, str], after_id: Optional[int], since: Optional[datetime], cursor: Optional[str]) -> Optional[EventPosition]:
+    """Keyset position to fetch after: from cursor, since, or the (created_at, id) of event after_id."""
+    if sum(value is not None for value in (after_id, since, cursor)) > 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Pass at most one of after_id, since and cursor")
+    if cursor is not None:
+        return _decode_events_cursor(cursor)
+    if since is not None:
+        return (since if since.tzinfo is not None else since.replace(tzinfo=timezone.utc)), _EVENT_ID_MAX
+    if after_id is None:
+        return None
+    created_at = await app.state.pool.fetchval(SELECT_EVENT_POSITION_SQL, after_id, *key)
+    if created_at is None:
+        created_at = next((event.created_at for event in _unflushed_events(key) if event.id == after_id), None)
+    if created_at is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Event after_id={after_id} not found for this web_url/agent/validator")
+    return created_at, after_id
+
+
+async def _get_events_page(key: Tuple[str, str, str], after_id: Optional[int], since: Optional[datetime], cursor: Optional[str], limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Incremental /get_events/: up to limit events after the requested position, oldest first, and the
+    paging headers. Events newer than EVENTS_PAGE_SETTLE_MS are held back for a later page: an
+    insert commits after its created_at, and write-behind events reach the table only when their
+    worker flushes, so a cursor past them would skip them for good.
+    """
+    position = await _resolve_events_position(key, after_id, since, cursor)
+    # From the start of the history when no position is given
+    after = position or (datetime.min.replace(tzinfo=timezone.utc), 0)
+    horizon = datetime.now(timezone.utc) - timedelta(milliseconds=EVENTS_PAGE_SETTLE_MS)
+    unflushed = [event for event in _unflushed_events(key) if (event.created_at, event.id) > after and event.created_at < horizon]
+    # One extra row tells whether more events are waiting
+    rows = await app.state.pool.fetch(SELECT_EVENTS_AFTER_SQL, *key, after[0], after[1], limit + 1, horizon)
+    processed_rows = _event_row_dicts(rows)
+    if unflushed:
+        processed_rows = _with_unflushed(processed_rows, unflushed)
+        processed_rows.sort(key=lambda row: (row["created_at"], row["id"]))
+    page = processed_rows[:limit]
+    next_position = (page[-1]["created_at"], page[-1]["id"]) if page else position
+    headers = {"X-Has-More": "true" if len(processed_rows) > limit else "false"}
+    if next_position is not None:
+        headers["X-Next-Cursor"] = _encode_events_cursor(next_position)
+    return page, headers
+
+
 @app.get(
     "/get_events/",
     response_model=List[EventOutput],
@@ -520,10 +947,22 @@ async def get_events_endpoint(
             description="The specific validator ID to filter events for.",
         ),
     ] = "UNKNOWN_VALIDATOR",
+    after_id: Annotated[Optional[int], Query(ge=1, description="Only events after this event id (keyset order)")] = None,
+    since: Annotated[Optional[datetime], Query(description="Only events created after this timestamp")] = None,
+    cursor: Annotated[Optional[str], Query(description="X-Next-Cursor from the previous incremental fetch")] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=EVENTS_PAGE_MAX_LIMIT, description="Maximum events per incremental fetch")] = None,
 ):
     """
     Retrieves events, utilizing prepared statements.
     Filtering is done based on the origin (scheme://host[:port]) of the provided web_url.
+
+    Without after_id/since/cursor/limit: every event for the key, newest first.
+    With any of them: an incremental fetch in keyset order over (created_at, id), oldest first,
+    of at most limit events after the given position (after_id, since or cursor; at most one).
+    X-Next-Cursor resumes after the last event returned; X-Has-More says whether more are waiting.
+
+    Event data is copied from its JSONB text into the body without being parsed; List[EventOutput]
+    only documents the shape.
     """
     if not hasattr(app.state, "pool") or app.state.pool is None:
         logger.error("Database pool not available for fetching events.")
@@ -541,25 +980,23 @@ async def get_events_endpoint(
         )
 
     try:
-        rows: List[asyncpg.Record] = await app.state.pool.fetch(SELECT_EVENTS_SQL, trimmed_url, web_agent_id, validator_id)
-
-        processed_rows = []
-        for row in rows:
-            row_dict = dict(row)
-            raw_data = row_dict.get("data")
-            if isinstance(raw_data, str):
-                try:
-                    row_dict["data"] = orjson.loads(raw_data)
-                except orjson.JSONDecodeError as e:
-                    logger.error(f"Failed to parse JSON data for event ID {row_dict.get('id', 'unknown')}: {e}")
-                    row_dict["data"] = {}
-            elif raw_data is None:
-                row_dict["data"] = {}
-
-            processed_rows.append(row_dict)
+        key = (trimmed_url, web_agent_id, validator_id)
+        if any(value is not None for value in (after_id, since, cursor, limit)):
+            processed_rows, headers = await _get_events_page(key, after_id, since, cursor, limit or EVENTS_PAGE_MAX_LIMIT)
+            logger.info(f"Retrieved {len(processed_rows)} new events for trimmed URL: {trimmed_url}, Agent ID: {web_agent_id}, Validator ID: {validator_id}")
+            return _events_response(processed_rows, headers)
+
+        # Snapshot before querying: an event flushed meanwhile shows up twice and is deduplicated by id
+        unflushed = _unflushed_events(key)
+        rows: List[asyncpg.Record] = await app.state.pool.fetch(SELECT_EVENTS_SQL, *key)
+
+        processed_rows = _event_row_dicts(rows)
+        if unflushed:
+            processed_rows = _with_unflushed(processed_rows, unflushed)
+            processed_rows.sort(key=lambda row: row["created_at"], reverse=True)
 
         logger.info(f"Retrieved {len(processed_rows)} events for trimmed URL: {trimmed_url}, Agent ID: {web_agent_id}, Validator ID: {validator_id}")
-        return processed_rows
+        return _events_response(processed_rows)
 
     except PostgresError as e:
         logger.error(f"Database query failed for get_events: {e} (SQLState: {e.sqlstate})")
@@ -613,8 +1050,11 @@ async def reset_events_endpoint(
         )
 
     try:
+        # Unflushed events are dropped first, so none of them is written after the DELETE
+        event_buffer = getattr(app.state, "event_buffer", None)
+        discarded = await event_buffer.discard((trimmed_url, web_agent_id, validator_id)) if event_buffer is not None else 0
         deleted_count: Optional[int] = await app.state.pool.fetchval(DELETE_EVENTS_SQL, trimmed_url, web_agent_id, validator_id)
-        actual_deleted_count = deleted_count if deleted_count is not None else 0
+        actual_deleted_count = (deleted_count if deleted_count is not None else 0) + discarded
         logger.info(f"Successfully deleted {actual_deleted_count} events for trimmed URL: {trimmed_url}, Agent ID: {web_agent_id}, Validator ID: {validator_id}")
         return ResetResponse(
             message=f"Successfully deleted {actual_deleted_count} events for '{web_url}'",
@@ -638,6 +1078,61 @@ async def reset_events_endpoint(
         ) from e
 
 
+@app.delete(
+    "/reset_events/validator",
+    response_model=ValidatorResetResponse,
+    summary="Delete all events of a validator",
+)
+async def reset_validator_events_endpoint(
+    validator_id: Annotated[str, Query(max_length=255, description="The validator whose events (all web URLs and agents) are deleted.")],
+):
+    """
+    Deletes every event of validator_id, e.g. at the end of a validator run. On the partitioned
+    schema (postgres/migrations/002_events_partitioned.sql) each validator owns a partition, which
+    is truncated whatever its size; deleted_count is then the table statistics' estimate. A
+    validator whose rows still wait in events_default has them deleted (an exact count) and gets
+    its partition for later resets. Answers 409 on the plain events table, where this would be a
+    DELETE scanning the whole table.
+    """
+    if not hasattr(app.state, "pool") or app.state.pool is None:
+        logger.error("Database pool not available for resetting validator events.")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=MSG_DATABASE_UNAVAILABLE,
+        )
+    if not getattr(app.state, "events_partitioned", False):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Validator-wide resets need the partitioned events schema (postgres/migrations/002_events_partitioned.sql); use /reset_events/ per web_url and agent.",
+        )
+
+    try:
+        event_buffer = getattr(app.state, "event_buffer", None)
+        discarded = await event_buffer.discard_validator(validator_id) if event_buffer is not None else 0
+        result = await app.state.pool.fetchrow(RESET_VALIDATOR_EVENTS_SQL, validator_id)
+        actual_deleted_count = (result["deleted"] or 0) + discarded
+        approximate = bool(result["truncated"])
+        logger.info(f"Reset validator {validator_id}: deleted {'about ' if approximate else ''}{actual_deleted_count} events")
+        return ValidatorResetResponse(
+            message=f"Successfully deleted {'about ' if approximate else ''}{actual_deleted_count} events for validator '{validator_id}'",
+            validator_id=validator_id,
+            deleted_count=actual_deleted_count,
+            approximate=approximate,
+        )
+    except PostgresError as e:
+        logger.error(f"Database deletion failed for reset_validator_events: {e} (SQLState: {e.sqlstate}).")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database operation failed during validator reset: {e.pgcode}.",
+        ) from e
+    except Exception as e:  # pragma: no cover
+        logger.error(f"Unexpected error during reset_validator_events: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An internal server error occurred while resetting validator events.",
+        ) from e
+
+
 # --- Data Generation Functions (generic) ---
 async def generate_with_openai(request: DataGenerationRequest) -> List[Dict[str, Any]]:  # pragma: no cover
     if not OPENAI_API_KEY:
@@ -923,19 +1418,98 @@ def _apply_seeded_selection(
     method: str,
     filter_key: Optional[str],
     filter_values: Optional[str],
+    allocation: str = "equal",
 ) -> List[Dict[str, Any]]:
     """Apply deterministic seeded selection to the pool. Returns selected items."""
+    return [pool[i] for i in _apply_seeded_selection_indices(pool, seed, limit, method, filter_key, filter_values, allocation)]
+
+
+def _pool_selector(pool: Sequence[Dict[str, Any]]) -> IndexSelector:
+    """Selector for pool; DataPools keep theirs so column factorizations are built once per pool."""
+    if isinstance(pool, DataPool):
+        return pool.derived("selector", lambda: IndexSelector(pool, SELECTION_MODE))
+    return IndexSelector(pool, SELECTION_MODE)
+
+
+def _apply_seeded_selection_indices(
+    pool: Sequence[Dict[str, Any]],
+    seed: int,
+    limit: int,
+    method: str,
+    filter_key: Optional[str],
+    filter_values: Optional[str],
+    allocation: str = "equal",
+) -> List[int]:
+    """
+    Same selection as _apply_seeded_selection, returned as pool indices so callers can reuse
+    per-item artifacts (e.g. pre-encoded bytes). With SELECTION_MODE=compat and SHUFFLE_MODE=full
+    (defaults) the picks are identical to seeded_select / seeded_shuffle / seeded_distribution.
+    """
     method_normalized = (method or "select").lower()
     filter_list = [v.strip() for v in filter_values.split(",")] if filter_values else None
+    selector = _pool_selector(pool)
 
     if method_normalized == "shuffle":
-        return seeded_shuffle(pool, seed, limit=limit)
+        return selector.shuffle(seed, limit=limit, partial=SHUFFLE_MODE == SHUFFLE_MODE_PARTIAL)
     if method_normalized == "filter":
-        return seeded_filter_and_select(pool, seed, limit, filter_key=filter_key, filter_values=filter_list)
+        return selector.filter_select(seed, limit, filter_key, filter_list)
     if method_normalized == "distribute":
-        category_key = filter_key or "category"
-        return seeded_distribution(pool, seed, category_key=category_key, total_count=limit)
-    return seeded_select(pool, seed=seed, count=limit, allow_duplicates=False)
+        return selector.distribute(seed, filter_key or "category", total_count=limit, proportional=(allocation or "equal").lower() == "proportional")
+    return selector.select(seed, limit)
+
+
+def _page_seeded_indices(
+    pool: Sequence[Dict[str, Any]],
+    seed: int,
+    offset: int,
+    limit: int,
+    method: str,
+    filter_key: Optional[str],
+    filter_values: Optional[str],
+) -> Tuple[List[int], int]:
+    """
+    One page of the seeded permutation for a paginated load: (pool indices, number of items the
+    permutation covers). select/filter walk the Random.sample order, shuffle the SHUFFLE_MODE order.
+    On large pools the first select/filter page is not the unpaginated selection (see IndexSelector.page).
+    """
+    method_normalized = (method or "select").lower()
+    filter_list = [v.strip() for v in filter_values.split(",")] if filter_values else None
+    selector = _pool_selector(pool)
+    positions = selector.mask(filter_key, filter_list) if method_normalized == "filter" and filter_key and filter_list else None
+    total = len(pool) if positions is None else len(positions)
+    shuffle = method_normalized == "shuffle"
+    return selector.page(seed, offset, limit, positions, shuffle=shuffle, partial=SHUFFLE_MODE == SHUFFLE_MODE_PARTIAL), total
+
+
+def _page_cursor_scope(*query: Any) -> str:
+    """Digest of the query parts a cursor is bound to (so it cannot page a different selection)."""
+    return hashlib.blake2b(repr(query).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _encode_page_cursor(pool_version: str, scope: str, offset: int) -> str:
+    raw = orjson.dumps({"v": pool_version, "s": scope, "o": offset})
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _resolve_page_offset(pool_version: str, scope: str, offset: Optional[int], cursor: Optional[str]) -> Optional[int]:
+    """
+    Offset of the requested page, or None for an unpaginated load. A cursor must come from the
+    same query and pool version: a pool that changed since the first page gets 409 (restart paging).
+    """
+    if cursor is None:
+        return offset
+    if offset is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Pass either offset or cursor, not both")
+    try:
+        state = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        cursor_version, cursor_scope, cursor_offset = state["v"], state["s"], int(state["o"])
+    except (ValueError, TypeError, KeyError, orjson.JSONDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if cursor_scope != scope or cursor_offset < 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor does not belong to this query")
+    if cursor_version != pool_version:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Dataset changed since this cursor was issued; restart from offset 0")
+    return cursor_offset
 
 
 def _build_load_metadata(
@@ -977,6 +1551,308 @@ class DatasetLoadResponse(BaseModel):
     count: int
 
 
+class DatasetLoadSpec(DatasetLoadRequest):
+    method: str = Field(default="select", description="Selection method: select, shuffle, filter, distribute")
+    filter_key: Optional[str] = Field(default=None, description="Key to filter on (for filter method)")
+    filter_values: Optional[str] = Field(default=None, description="Comma-separated values to filter (for filter method)")
+    allocation: Literal["equal", "proportional"] = Field(default="equal", description="Per-category allocation for distribute")
+    fields: Optional[str] = Field(default=None, max_length=1000, description="Comma-separated top-level fields to return per item")
+
+
+class DatasetLoadBatchRequest(BaseModel):
+    loads: List[DatasetLoadSpec] = Field(..., min_length=1, max_length=DATASET_BATCH_MAX_LOADS, description="Load specs, answered in order")
+
+
+class DatasetLoadBatchResponse(BaseModel):
+    results: List[Dict[str, Any]] = Field(description="Per spec: a /datasets/load response body, or {'error': {'status_code', 'detail'}}")
+    count: int
+
+
+def _encoded_load_body(message: str, metadata: Dict[str, Any], encoded_items: List[bytes]) -> bytes:
+    """
+    Build a DatasetLoadResponse-shaped JSON body by splicing pre-encoded item bytes
+    (see DataPool.encoded) instead of validating and re-serializing the item dicts.
+    """
+    return b"".join(
+        (
+            b'{"message":',
+            orjson.dumps(message),
+            b',"metadata":',
+            orjson.dumps(metadata),
+            b',"data":[',
+            b",".join(encoded_items),
+            b'],"count":',
+            str(len(encoded_items)).encode("ascii"),
+            b"}",
+        )
+    )
+
+
+# A selected /datasets/load: (message, metadata, encoded pool items, positions of the selected items)
+LoadSelection = Tuple[str, Dict[str, Any], Sequence[bytes], Sequence[int]]
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Field names from a comma-separated fields= value (order kept, duplicates dropped); None for all fields."""
+    if not fields:
+        return None
+    parsed = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    return parsed or None
+
+
+def _encoded_items(file_data_pool: DataPool, fields: Optional[Tuple[str, ...]], metadata: Dict[str, Any]) -> Sequence[bytes]:
+    """Pre-encoded items to splice: whole items, or the pool's cached projection onto fields (noted in metadata)."""
+    if fields is None:
+        return file_data_pool.encoded
+    metadata["fields"] = list(fields)
+    return file_data_pool.projected(fields)
+
+
+def _select_page_items(
+    file_data_pool: DataPool,
+    v2_enabled: bool,
+    project_key: str,
+    entity_type: str,
+    seed_value: int,
+    limit: int,
+    method: str,
+    filter_key: Optional[str],
+    filter_values: Optional[str],
+    page_offset: int,
+    cursor_scope: str,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> LoadSelection:
+    """Select one page of a paginated /datasets/load (offset/cursor); metadata carries the paging fields."""
+    total_available = len(file_data_pool)
+    if not v2_enabled or seed_value == 1:
+        # Original data is paged in file order
+        selected: Sequence[int] = range(page_offset, min(page_offset + limit, total_available))
+        total, method_label, filter_list = total_available, "full", None
+        message = f"Original data only (v2 disabled or seed=1); returning {len(selected)} items (offset={page_offset}, limit={limit}, pool={total_available})"
+    else:
+        selected, total = _page_seeded_indices(file_data_pool, seed_value, page_offset, limit, method, filter_key, filter_values)
+        method_label = (method or "select").lower()
+        filter_list = [v.strip() for v in filter_values.split(",")] if filter_values else None
+        message = f"Successfully selected {len(selected)} items from file storage using seed={seed_value} (offset={page_offset})"
+    effective_seed = 1 if not v2_enabled else seed_value
+    metadata = _build_load_metadata(project_key, entity_type, effective_seed, limit, method_label, filter_key, filter_list, total_available)
+    next_offset = page_offset + len(selected)
+    metadata.update(
+        {
+            "offset": page_offset,
+            "total": total,
+            "poolVersion": file_data_pool.version,
+            "nextCursor": _encode_page_cursor(file_data_pool.version, cursor_scope, next_offset) if selected and next_offset < total else None,
+        }
+    )
+    return message, metadata, _encoded_items(file_data_pool, fields, metadata), selected
+
+
+def _build_page_body(file_data_pool: DataPool, v2_enabled: bool, *page: Any) -> bytes:
+    """Encode one page of a paginated /datasets/load (arguments as for _select_page_items)."""
+    message, metadata, encoded, selected = _select_page_items(file_data_pool, v2_enabled, *page)
+    return _encoded_load_body(message, metadata, [encoded[i] for i in selected])
+
+
+# Encoded /datasets/load bodies keyed by ETag (pool version + query), bounded by LOAD_RESPONSE_CACHE_BYTES
+_LOAD_RESPONSE_CACHE = ResponseCache(LOAD_RESPONSE_CACHE_BYTES)
+# The same /datasets/load URL is served as JSON or NDJSON (Accept) and identity or gzip (Accept-Encoding)
+_LOAD_VARY = "Accept, Accept-Encoding"
+
+
+async def _load_body_response(request: Request, etag: str, entry: CachedBody) -> Response:
+    """
+    Serve a cached /datasets/load body. Bodies GZipMiddleware would compress are sent as the
+    cached gzip copy (with its own strong ETag) so identical selections are compressed once,
+    in a worker thread rather than on the event loop.
+    """
+    headers = {"ETag": etag, "Vary": _LOAD_VARY}
+    if len(entry.body) >= GZIP_MIN_SIZE and accepts_gzip(request.headers.get("accept-encoding")):
+        headers["ETag"] = gzip_etag(etag)
+        headers["Content-Encoding"] = "gzip"
+        gzipped = entry.gzipped if entry.gzipped is not None else await asyncio.to_thread(_LOAD_RESPONSE_CACHE.gzipped, etag, entry)
+        return Response(content=gzipped, media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _select_load_items(
+    file_data_pool: DataPool,
+    v2_enabled: bool,
+    project_key: str,
+    entity_type: str,
+    seed_value: int,
+    limit: int,
+    method: str,
+    filter_key: Optional[str],
+    filter_values: Optional[str],
+    allocation: str = "equal",
+    fields: Optional[Tuple[str, ...]] = None,
+) -> LoadSelection:
+    """Run the selection for a /datasets/load request."""
+    total_available = len(file_data_pool)
+    use_original_only = not v2_enabled or seed_value == 1
+
+    if use_original_only:
+        logger.info("v2 disabled or seed=1; returning original data (respecting limit), seed ignored when v2 disabled.")
+        effective_seed = 1 if not v2_enabled else seed_value
+        metadata = _build_load_metadata(
+            project_key,
+            entity_type,
+            effective_seed,
+            limit,
+            "full",
+            filter_key,
+            None,
+            total_available,
+        )
+        selected: Sequence[int] = range(min(limit, total_available))
+        return (
+            f"Original data only (v2 disabled or seed=1); returning {len(selected)} items (limit={limit}, pool={total_available})",
+            metadata,
+            _encoded_items(file_data_pool, fields, metadata),
+            selected,
+        )
+
+    filter_list = [v.strip() for v in filter_values.split(",")] if filter_values else None
+    selected = _apply_seeded_selection_indices(file_data_pool, seed_value, limit, method, filter_key, filter_values, allocation)
+    metadata = _build_load_metadata(
+        project_key,
+        entity_type,
+        seed_value,
+        limit,
+        (method or "select").lower(),
+        filter_key,
+        filter_list,
+        total_available,
+    )
+    return (
+        f"Successfully selected {len(selected)} items from file storage using seed={seed_value}",
+        metadata,
+        _encoded_items(file_data_pool, fields, metadata),
+        selected,
+    )
+
+
+def _build_load_body(file_data_pool: DataPool, v2_enabled: bool, *query: Any) -> bytes:
+    """Run the selection for a /datasets/load request (arguments as for _select_load_items) and encode the response body."""
+    message, metadata, encoded, selected = _select_load_items(file_data_pool, v2_enabled, *query)
+    return _encoded_load_body(message, metadata, [encoded[i] for i in selected])
+
+
+def _load_etag(file_data_pool: DataPool, v2_enabled: bool, query: Sequence[Any]) -> Optional[str]:
+    """ETag for a /datasets/load query over file_data_pool, or None for pools not built from files."""
+    if not file_data_pool.signature:
+        return None
+    # Engine modes change which items a seed returns, so they are part of the validator
+    return make_etag(file_data_pool.version, v2_enabled, SELECTION_MODE, SHUFFLE_MODE, *query)
+
+
+def _cached_load_body(file_data_pool: DataPool, v2_enabled: bool, query: Sequence[Any], etag: Optional[str]) -> CachedBody:
+    """Encoded body for query, from the response cache when etag was already built."""
+    if etag is None:
+        return CachedBody(_build_load_body(file_data_pool, v2_enabled, *query))
+    entry = _LOAD_RESPONSE_CACHE.get(etag)
+    if entry is None:
+        entry = _LOAD_RESPONSE_CACHE.put(etag, _build_load_body(file_data_pool, v2_enabled, *query))
+    return entry
+
+
+def _resolve_page_request(
+    file_data_pool: DataPool,
+    v2_enabled: bool,
+    project_key: str,
+    entity_type: str,
+    seed_value: int,
+    method: str,
+    filter_key: Optional[str],
+    filter_values: Optional[str],
+    offset: Optional[int],
+    cursor: Optional[str],
+) -> Tuple[int, str]:
+    """(page offset, cursor scope) for a paginated /datasets/load; HTTPException for unusable offset/cursor."""
+    if (method or "select").lower() == "distribute" and v2_enabled and seed_value != 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Pagination is not supported for method=distribute")
+    scope = _page_cursor_scope(project_key, entity_type, seed_value, (method or "select").lower(), filter_key, filter_values, v2_enabled)
+    return _resolve_page_offset(file_data_pool.version, scope, offset, cursor), scope
+
+
+async def _paginated_load_response(
+    request: Request,
+    file_data_pool: DataPool,
+    v2_enabled: bool,
+    project_key: str,
+    entity_type: str,
+    seed_value: int,
+    limit: int,
+    method: str,
+    filter_key: Optional[str],
+    filter_values: Optional[str],
+    offset: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Response:
+    """Validate offset/cursor and serve one page (cached and ETag'd like unpaginated loads)."""
+    page_offset, scope = _resolve_page_request(file_data_pool, v2_enabled, project_key, entity_type, seed_value, method, filter_key, filter_values, offset, cursor)
+    query = (project_key, entity_type, seed_value, limit, method, filter_key, filter_values)
+    if not file_data_pool.signature:
+        return Response(content=_build_page_body(file_data_pool, v2_enabled, *query, page_offset, scope, fields), media_type="application/json")
+    etag = make_etag("page", file_data_pool.version, v2_enabled, SELECTION_MODE, SHUFFLE_MODE, page_offset, fields, *query)
+    matched = match_if_none_match(request.headers.get("if-none-match"), etag)
+    if matched is not None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": matched, "Vary": _LOAD_VARY})
+    entry = _LOAD_RESPONSE_CACHE.get(etag)
+    if entry is None:
+        entry = _LOAD_RESPONSE_CACHE.put(etag, _build_page_body(file_data_pool, v2_enabled, *query, page_offset, scope, fields))
+    return await _load_body_response(request, etag, entry)
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Items per streamed NDJSON chunk: amortizes send overhead while keeping time-to-first-byte low
+_NDJSON_CHUNK_ITEMS = 256
+
+
+def _wants_ndjson(request: Request, response_format: Optional[str]) -> bool:
+    """format= decides when given; otherwise NDJSON when the Accept header names application/x-ndjson."""
+    if response_format is not None:
+        return response_format == "ndjson"
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "").lower()
+
+
+async def _ndjson_lines(encoded_items: Iterable[bytes], trailer: Dict[str, Any]) -> AsyncIterator[bytes]:
+    """
+    NDJSON body: one pre-encoded item per line, sent in chunks as items are produced, then trailer
+    (with the item count added) as the last line.
+    """
+    chunk: List[bytes] = []
+    count = 0
+    for raw in encoded_items:
+        chunk.append(raw)
+        if len(chunk) == _NDJSON_CHUNK_ITEMS:
+            count += len(chunk)
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+            # Let other requests run between the chunks of a long stream
+            await asyncio.sleep(0)
+    trailer["count"] = count + len(chunk)
+    chunk.append(orjson.dumps(trailer))
+    yield b"\n".join(chunk) + b"\n"
+
+
+def _ndjson_load_response(file_data_pool: DataPool, v2_enabled: bool, query: Sequence[Any], offset: Optional[int], cursor: Optional[str]) -> StreamingResponse:
+    """Stream a /datasets/load selection (or page) as NDJSON: the selected items, then a {message, metadata, count} line."""
+    project_key, entity_type, seed_value, limit, method, filter_key, filter_values, _allocation, fields = query
+    if offset is not None or cursor is not None:
+        page_offset, scope = _resolve_page_request(file_data_pool, v2_enabled, project_key, entity_type, seed_value, method, filter_key, filter_values, offset, cursor)
+        message, metadata, encoded, selected = _select_page_items(file_data_pool, v2_enabled, *query[:7], page_offset, scope, fields)
+    else:
+        message, metadata, encoded, selected = _select_load_items(file_data_pool, v2_enabled, *query)
+    return StreamingResponse(
+        _ndjson_lines((encoded[i] for i in selected), {"message": message, "metadata": metadata}),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Vary": _LOAD_VARY},
+    )
+
+
 # --- Data Loading Endpoint (Seeded Selection) ---
 @app.get(
     "/datasets/load",
@@ -984,6 +1860,7 @@ class DatasetLoadResponse(BaseModel):
     summary="Load dataset using seeded selection",
 )
 async def load_dataset_endpoint(
+    request: Request,
     project_key: Annotated[str, Query(description=DESC_PROJECT_KEY)],
     entity_type: Annotated[str, Query(description=DESC_ENTITY_TYPE)],
     seed_value: Annotated[int, Query(description="Seed value for deterministic selection")],
@@ -997,6 +1874,20 @@ async def load_dataset_endpoint(
         Optional[str],
         Query(description="Comma-separated values to filter (for filter method)"),
     ] = None,
+    allocation: Annotated[
+        Literal["equal", "proportional"],
+        Query(description="Per-category allocation for distribute: equal split or proportional to category size"),
+    ] = "equal",
+    offset: Annotated[Optional[int], Query(ge=0, description="Paginate: position in the seeded order to start from")] = None,
+    cursor: Annotated[Optional[str], Query(description="Paginate: nextCursor from the previous page")] = None,
+    fields: Annotated[
+        Optional[str],
+        Query(max_length=1000, description="Comma-separated top-level fields to return per item (default: whole items)"),
+    ] = None,
+    response_format: Annotated[
+        Optional[Literal["json", "ndjson"]],
+        Query(alias="format", description="json or ndjson (streamed); default follows the Accept header"),
+    ] = None,
 ):
     """
     Load data from the project directory (flat layout). Original data lives in the first file
@@ -1005,12 +1896,22 @@ async def load_dataset_endpoint(
     - v2 disabled or seed=1: return original data only (first file), up to limit.
     - v2 enabled and 1 < seed <= 999: load full pool, then apply deterministic
       seeded selection — same seed always returns the same items (reproducible).
+
+    Responses carry a strong ETag (pool version + query); a matching If-None-Match gets 304.
+
+    Pagination (offset or cursor): pages walk one full seeded order of the pool (select/filter:
+    Random.sample order, shuffle: the shuffle order, original data: file order), so consecutive
+    pages never repeat or skip items. Page metadata carries nextCursor, which is bound to the
+    pool version: once the data changes, old cursors get 409. Not available for distribute.
+
+    NDJSON (format=ndjson or Accept: application/x-ndjson): the same selection streamed as one
+    item per line, then a last line with message, metadata and count. Not cached or ETag'd.
     """
     try:
         v2_enabled = _is_v2_enabled()
         load_seed = seed_value if v2_enabled else 1
 
-        file_data_pool = load_all_data(project_key, entity_type, seed_value=load_seed)
+        file_data_pool = await load_pool_async(project_key, entity_type, seed_value=load_seed)
 
         if not file_data_pool:
             raise HTTPException(
@@ -1018,48 +1919,23 @@ async def load_dataset_endpoint(
                 detail=f"No file-based data found for project={project_key}. Generate data first.",
             )
 
-        total_available = len(file_data_pool)
-        use_original_only = not v2_enabled or seed_value == 1
-
-        if use_original_only:
-            logger.info("v2 disabled or seed=1; returning original data (respecting limit), seed ignored when v2 disabled.")
-            data = file_data_pool[:limit]
-            effective_seed = 1 if not v2_enabled else seed_value
-            metadata = _build_load_metadata(
-                project_key,
-                entity_type,
-                effective_seed,
-                limit,
-                "full",
-                filter_key,
-                None,
-                total_available,
-            )
-            return DatasetLoadResponse(
-                message=f"Original data only (v2 disabled or seed=1); returning {len(data)} items (limit={limit}, pool={total_available})",
-                metadata=metadata,
-                data=data,
-                count=len(data),
-            )
+        field_list = _parse_fields(fields)
+        query = (project_key, entity_type, seed_value, limit, method, filter_key, filter_values, allocation, field_list)
+        if _wants_ndjson(request, response_format):
+            return _ndjson_load_response(file_data_pool, v2_enabled, query, offset, cursor)
 
-        filter_list = [v.strip() for v in filter_values.split(",")] if filter_values else None
-        selected = _apply_seeded_selection(file_data_pool, seed_value, limit, method, filter_key, filter_values)
-        metadata = _build_load_metadata(
-            project_key,
-            entity_type,
-            seed_value,
-            limit,
-            (method or "select").lower(),
-            filter_key,
-            filter_list,
-            total_available,
-        )
-        return DatasetLoadResponse(
-            message=f"Successfully selected {len(selected)} items from file storage using seed={seed_value}",
-            metadata=metadata,
-            data=selected,
-            count=len(selected),
-        )
+        if offset is not None or cursor is not None:
+            return await _paginated_load_response(request, file_data_pool, v2_enabled, project_key, entity_type, seed_value, limit, method, filter_key, filter_values, offset, cursor, field_list)
+
+        etag = _load_etag(file_data_pool, v2_enabled, query)
+        if etag is None:
+            # A pool not built from files has no version to validate against
+            return Response(content=_build_load_body(file_data_pool, v2_enabled, *query), media_type="application/json")
+
+        matched = match_if_none_match(request.headers.get("if-none-match"), etag)
+        if matched is not None:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": matched, "Vary": _LOAD_VARY})
+        return await _load_body_response(request, etag, _cached_load_body(file_data_pool, v2_enabled, query, etag))
 
     except HTTPException:
         raise
@@ -1071,6 +1947,105 @@ async def load_dataset_endpoint(
         )
 
 
+def _batch_load_error(status_code: int, detail: str) -> bytes:
+    return orjson.dumps({"error": {"status_code": status_code, "detail": detail}})
+
+
+async def _batch_load_entry(spec: DatasetLoadSpec, pool_task: "asyncio.Future[DataPool]", v2_enabled: bool) -> bytes:
+    """Encoded result for one batch spec; failures become an error object instead of failing the batch."""
+    try:
+        file_data_pool = await pool_task
+        if not file_data_pool:
+            return _batch_load_error(status.HTTP_404_NOT_FOUND, f"No file-based data found for project={spec.project_key}. Generate data first.")
+        query = (spec.project_key, spec.entity_type, spec.seed_value, spec.limit, spec.method, spec.filter_key, spec.filter_values, spec.allocation, _parse_fields(spec.fields))
+        return _cached_load_body(file_data_pool, v2_enabled, query, _load_etag(file_data_pool, v2_enabled, query)).body
+    except ValueError as e:
+        return _batch_load_error(status.HTTP_400_BAD_REQUEST, str(e))
+    except Exception as e:
+        logger.error(f"Failed to load dataset in batch: {e}")
+        return _batch_load_error(status.HTTP_500_INTERNAL_SERVER_ERROR, f"Failed to load dataset: {str(e)}")
+
+
+# --- Batch Data Loading Endpoint ---
+@app.post(
+    "/datasets/load-batch",
+    response_model=DatasetLoadBatchResponse,
+    summary="Load several datasets in one request",
+)
+async def load_dataset_batch_endpoint(batch: DatasetLoadBatchRequest):
+    """
+    Evaluate several /datasets/load specs in one round trip. Results are returned in spec order;
+    each is the body /datasets/load would return, or an error object for that spec alone.
+    Specs that need the same pool share one load (main.json is resolved once per project),
+    and distinct pools are loaded concurrently.
+    """
+    v2_enabled = _is_v2_enabled()
+    pool_tasks: Dict[Tuple[str, str, bool], "asyncio.Future[DataPool]"] = {}
+    entries = []
+    for spec in batch.loads:
+        load_seed = spec.seed_value if v2_enabled else 1
+        # load_pool only distinguishes the original-only pool (seed 1) from the full pool
+        key = (spec.project_key, spec.entity_type, load_seed == 1)
+        if key not in pool_tasks:
+            pool_tasks[key] = asyncio.ensure_future(load_pool_async(spec.project_key, spec.entity_type, seed_value=load_seed))
+        entries.append(_batch_load_entry(spec, pool_tasks[key], v2_enabled))
+    results = await asyncio.gather(*entries)
+    body = b"".join((b'{"results":[', b",".join(results), b'],"count":', str(len(results)).encode("ascii"), b"}"))
+    return Response(content=body, media_type="application/json")
+
+
+# --- Full Pool Export Endpoint ---
+@app.get(
+    "/datasets/export",
+    response_class=StreamingResponse,
+    summary="Stream a full dataset pool as NDJSON",
+)
+async def export_dataset_endpoint(
+    project_key: Annotated[str, Query(description=DESC_PROJECT_KEY)],
+    entity_type: Annotated[str, Query(description=DESC_ENTITY_TYPE)],
+    fields: Annotated[
+        Optional[str],
+        Query(max_length=1000, description="Comma-separated top-level fields to return per item (default: whole items)"),
+    ] = None,
+):
+    """
+    Stream every item of the full pool (all files listed in main.json, whatever ENABLE_DYNAMIC_V2
+    says) in file order as NDJSON, then a last line with message, metadata and count.
+    Items are written from their pre-encoded bytes chunk by chunk, so memory does not grow with
+    the pool; projections for fields= are encoded on the fly and not kept.
+    """
+    try:
+        file_data_pool = await load_pool_async(project_key, entity_type, full_pool=True)
+        if not file_data_pool:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No file-based data found for project={project_key}. Generate data first.",
+            )
+        field_list = _parse_fields(fields)
+        metadata: Dict[str, Any] = {
+            "source": "file_storage",
+            "projectKey": project_key,
+            "entityType": entity_type,
+            "totalAvailable": len(file_data_pool),
+            "poolVersion": file_data_pool.version,
+        }
+        encoded_items: Iterable[bytes] = file_data_pool.encoded
+        if field_list is not None:
+            metadata["fields"] = list(field_list)
+            encoded_items = file_data_pool.iter_projected(field_list)
+        trailer = {"message": f"Exported full pool for project={project_key}, entity={entity_type}", "metadata": metadata}
+        return StreamingResponse(_ndjson_lines(encoded_items, trailer), media_type=NDJSON_MEDIA_TYPE)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to export dataset: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export dataset: {str(e)}",
+        )
+
+
 # --- List Pools Endpoint ---
 @app.get("/datasets/pools", summary="List available master pools")
 async def list_pools_endpoint(
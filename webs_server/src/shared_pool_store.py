@@ -0,0 +1,189 @@
+"""
+Shared read-only pool store for multi-worker deployments.
+
+run_api.sh starts several uvicorn workers; without this, each one parses initial_data and keeps
+its own copy of every pool. One process builds a packed file with every pool's pre-encoded items;
+each worker memory-maps it read-only, so item bytes live once in the OS page cache.
+
+File layout (native byte order, recorded in the header):
+  MAGIC (8 bytes)
+  per pool: offsets table (count + 1 unsigned 64-bit ints, relative to the pool's data), item bytes
+  header (orjson): {"byteorder": ..., "pools": [{"key": [main_io, entity_type, first_file_only],
+                    "signature": [[path, mtime_ns, size], ...], "offsets_at": int, "data_at": int, "count": int}]}
+  trailer: header offset and header length as two little-endian unsigned 64-bit ints
+
+A mapped pool is only served when its recorded signature equals the current (mtime, size) of
+main.json and the data files, so stale stores fall back to normal per-worker parsing.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import orjson
+from loguru import logger
+
+import data_handler
+from data_handler import DataPool, FileSignature, PoolKey
+
+# Path of the packed store file; empty disables building/attaching
+SHARED_POOL_STORE_PATH = os.getenv("SHARED_POOL_STORE_PATH", "")
+
+_MAGIC = b"WPSTORE1"
+_TRAILER = struct.Struct("<QQ")
+_OFFSET_SIZE = 8
+
+
+class _MappedItems(Sequence[bytes]):
+    """Read-only sequence of item bytes backed by a memory-mapped pool (no per-worker copy)."""
+
+    __slots__ = ("_data", "_offsets")
+
+    def __init__(self, data: memoryview, offsets: memoryview):
+        self._data = data
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("pool item index out of range")
+        return bytes(self._data[self._offsets[index] : self._offsets[index + 1]])
+
+
+class SharedPoolStore:
+    """Attached store: serves DataPools whose signature matches the one recorded at build time."""
+
+    def __init__(self, mapped: mmap.mmap, header: Dict[str, Any]):
+        self._mapped = mapped
+        self._view = memoryview(mapped)
+        self._pools: Dict[PoolKey, Tuple[Tuple[FileSignature, ...], int, int, int]] = {}
+        for entry in header.get("pools", []):
+            main_io, entity_type, first_file_only = entry["key"]
+            # Only keys data_handler could look up (a store may come from another checkout)
+            if entity_type is not None and not data_handler.is_safe_name(entity_type):
+                continue
+            signature = tuple(tuple(sig) for sig in entry["signature"])
+            self._pools[(main_io, entity_type, bool(first_file_only))] = (signature, entry["offsets_at"], entry["data_at"], entry["count"])
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def get(self, key: PoolKey, signature: Tuple[FileSignature, ...]) -> Optional[DataPool]:
+        """Return a mapped DataPool for key, or None when missing or built from different files."""
+        entry = self._pools.get(key)
+        if entry is None or entry[0] != signature:
+            return None
+        _signature, offsets_at, data_at, count = entry
+        offsets = self._view[offsets_at : offsets_at + (count + 1) * _OFFSET_SIZE].cast("Q")
+        data = self._view[data_at : data_at + offsets[count]]
+        return DataPool(signature=signature, encoded=_MappedItems(data, offsets))
+
+    def close(self) -> None:
+        """Unmap the store; left to garbage collection while pools served from it are still referenced."""
+        try:
+            self._view.release()
+            self._mapped.close()
+        except BufferError:
+            pass
+
+
+def _pad(f: Any) -> None:
+    """Pad the file position to an 8-byte boundary so offsets tables can be cast in place."""
+    remainder = f.tell() % _OFFSET_SIZE
+    if remainder:
+        f.write(b"\0" * (_OFFSET_SIZE - remainder))
+
+
+def build_shared_store(path: str) -> int:
+    """
+    Parse every project pool under BASE_PATH and write the packed store to path (atomic replace).
+    Returns the number of pools written.
+    """
+    header: Dict[str, Any] = {"byteorder": sys.byteorder, "pools": []}
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_MAGIC)
+            for key, pool in data_handler.iter_project_pools():
+                encoded = pool.encoded
+                offsets = [0]
+                for raw in encoded:
+                    offsets.append(offsets[-1] + len(raw))
+                _pad(f)
+                offsets_at = f.tell()
+                f.write(array("Q", offsets).tobytes())
+                data_at = f.tell()
+                f.writelines(encoded)
+                header["pools"].append(
+                    {
+                        "key": list(key),
+                        "signature": [list(sig) for sig in pool.signature],
+                        "offsets_at": offsets_at,
+                        "data_at": data_at,
+                        "count": len(encoded),
+                    }
+                )
+            header_at = f.tell()
+            header_bytes = orjson.dumps(header)
+            f.write(header_bytes)
+            f.write(_TRAILER.pack(header_at, len(header_bytes)))
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    logger.info("Built shared pool store", extra={"path": path, "pools": len(header["pools"])})
+    return len(header["pools"])
+
+
+def attach_shared_store(path: str) -> Optional[SharedPoolStore]:
+    """
+    Map the store at path read-only and install it as data_handler's shared pool source.
+    Returns None (and keeps per-worker parsing) when the file is missing or not a valid store.
+    """
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as exc:
+        logger.warning("Shared pool store not attached", extra={"path": path, "error": str(exc)})
+        return None
+    try:
+        if mapped[: len(_MAGIC)] != _MAGIC:
+            raise ValueError("bad magic")
+        header_at, header_len = _TRAILER.unpack(mapped[-_TRAILER.size :])
+        header = orjson.loads(mapped[header_at : header_at + header_len])
+        if header.get("byteorder") != sys.byteorder:
+            raise ValueError("byte order mismatch")
+    except (ValueError, struct.error, orjson.JSONDecodeError) as exc:
+        mapped.close()
+        logger.warning("Shared pool store invalid; ignoring", extra={"path": path, "error": str(exc)})
+        return None
+    store = SharedPoolStore(mapped, header)
+    data_handler.set_shared_pool_source(store)
+    logger.info("Attached shared pool store", extra={"path": path, "pools": len(store)})
+    return store
+
+
+def detach_shared_store(store: Optional[SharedPoolStore]) -> None:
+    """Stop serving pools from store and unmap it."""
+    data_handler.set_shared_pool_source(None)
+    if store is not None:
+        store.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    # Usage: python shared_pool_store.py [path]   (builds the store before workers start)
+    target = sys.argv[1] if len(sys.argv) > 1 else SHARED_POOL_STORE_PATH
+    if not target:
+        sys.exit("usage: shared_pool_store.py <store path> (or set SHARED_POOL_STORE_PATH)")
+    print(f"Wrote {build_shared_store(target)} pools to {target}")
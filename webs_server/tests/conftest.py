@@ -9,3 +9,7 @@ _root = Path(__file__).resolve().parent.parent
 _src = _root / "src"
 if str(_src) not in sys.path:
     sys.path.insert(0, str(_src))
+# Scripts sit next to the server modules in the image; make them importable the same way
+_scripts = _root / "scripts"
+if str(_scripts) not in sys.path:
+    sys.path.append(str(_scripts))
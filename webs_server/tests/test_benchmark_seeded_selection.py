@@ -0,0 +1,44 @@
+# Golden-output and smoke tests for scripts/benchmark_seeded_selection.py.
+"""
+Every selection engine must reproduce the golden outputs; the benchmark must produce one
+machine-readable record per (engine, method, size).
+"""
+
+import json
+
+import benchmark_seeded_selection as bench
+
+
+def test_every_engine_matches_golden_outputs():
+    assert bench.check_golden() == []
+
+
+def test_golden_file_matches_reference_engine():
+    with open(bench.GOLDEN_PATH, "r", encoding="utf-8") as f:
+        assert json.load(f) == bench.golden_outputs()
+
+
+def test_check_golden_reports_mismatches(tmp_path):
+    golden = bench.golden_outputs()
+    golden["cases"][0]["ids"] = list(reversed(golden["cases"][0]["ids"]))
+    path = tmp_path / "golden.json"
+    path.write_text(json.dumps(golden))
+    failures = bench.check_golden(str(path))
+    assert len(failures) == len(bench.ENGINES)
+    assert failures[0].startswith("functions: method=select size=200 seed=1")
+
+
+def test_make_pool_is_deterministic_and_skewed():
+    pool = bench.make_pool(160)
+    assert pool == bench.make_pool(160)
+    assert sum(item["category"] == "c7" for item in pool) == 90
+
+
+def test_run_benchmark_writes_one_record_per_case():
+    document = bench.run_benchmark([200], ["selector", "server"], count=5, min_time=0)
+    assert document["format"] == bench.RESULTS_FORMAT
+    assert len(document["results"]) == 2 * len(bench.METHODS)
+    record = document["results"][0]
+    assert {"engine", "method", "size", "count", "calls", "ops_per_sec", "peak_bytes", "net_blocks"} <= set(record)
+    assert record["calls"] >= 1 and record["ops_per_sec"] > 0
+    json.dumps(document)
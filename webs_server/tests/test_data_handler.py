@@ -6,6 +6,8 @@ Tests run with BASE_DATA_PATH set to a temp dir so no real /app/data is used.
 
 import os
 import json
+import time
+import asyncio
 from pathlib import Path
 
 import pytest
@@ -27,6 +29,7 @@ def temp_base(tmp_path):
 def patch_base_path(temp_base, monkeypatch):
     """Point data_handler.BASE_PATH at temp dir for the test run."""
     monkeypatch.setattr(dh, "BASE_PATH", temp_base)
+    dh.clear_pool_cache()
     return temp_base
 
 
@@ -422,3 +425,292 @@ def test_append_to_entity_data_updates_main_json(patch_base_path):
 def test_append_to_entity_data_invalid_web_name_raises():
     with pytest.raises(ValueError, match="Invalid web_name"):
         dh.append_to_entity_data("invalid name", "e", [])
+
+
+# --- Parsed pool cache ---
+def _write_cached_project(base: Path, name: str) -> Path:
+    proj = base / name
+    proj.mkdir(parents=True)
+    (proj / "main.json").write_text(json.dumps({"movies": ["./m1.json", "./m2.json"]}), encoding="utf-8")
+    (proj / "m1.json").write_text(json.dumps([{"a": 1}]), encoding="utf-8")
+    (proj / "m2.json").write_text(json.dumps([{"a": 2}]), encoding="utf-8")
+    return proj
+
+
+def test_load_pool_reuses_parsed_files_until_changed(patch_base_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    _write_cached_project(Path(patch_base_path), "web_cache")
+    calls = []
+    original = dh._parse_json_file_to_items
+
+    def _counting_parse(path, **kwargs):
+        calls.append(path)
+        return original(path, **kwargs)
+
+    monkeypatch.setattr(dh, "_parse_json_file_to_items", _counting_parse)
+    first = dh.load_pool("web_cache", "movies", seed_value=5)
+    second = dh.load_pool("web_cache", "movies", seed_value=5)
+    assert first is second
+    assert first.items == [{"a": 1}, {"a": 2}]
+    assert len(calls) == 2
+
+
+def test_load_pool_invalidated_when_data_file_changes(patch_base_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    proj = _write_cached_project(Path(patch_base_path), "web_cache2")
+    first = dh.load_pool("web_cache2", "movies", seed_value=5)
+    (proj / "m2.json").write_text(json.dumps([{"a": 2}, {"a": 3}]), encoding="utf-8")
+    second = dh.load_pool("web_cache2", "movies", seed_value=5)
+    assert second is not first
+    assert second.items == [{"a": 1}, {"a": 2}, {"a": 3}]
+    assert second.version != first.version
+
+
+def test_load_pool_invalidated_when_main_json_changes(patch_base_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    proj = _write_cached_project(Path(patch_base_path), "web_cache3")
+    assert len(dh.load_pool("web_cache3", "movies", seed_value=5)) == 2
+    (proj / "main.json").write_text(json.dumps({"movies": ["./m1.json"]}), encoding="utf-8")
+    assert dh.load_pool("web_cache3", "movies", seed_value=5).items == [{"a": 1}]
+
+
+def test_load_pool_first_file_and_full_pool_cached_separately(patch_base_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    _write_cached_project(Path(patch_base_path), "web_cache4")
+    full = dh.load_pool("web_cache4", "movies", seed_value=5)
+    first_only = dh.load_pool("web_cache4", "movies", seed_value=1)
+    assert full.items == [{"a": 1}, {"a": 2}]
+    assert first_only.items == [{"a": 1}]
+
+
+def test_load_all_data_returns_copy_of_cached_pool(patch_base_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    _write_cached_project(Path(patch_base_path), "web_cache5")
+    result = dh.load_all_data("web_cache5", "movies", seed_value=5)
+    result.append({"mutated": True})
+    assert dh.load_all_data("web_cache5", "movies", seed_value=5) == [{"a": 1}, {"a": 2}]
+
+
+def test_data_pool_derived_memoizes_per_pool():
+    pool = dh.DataPool([{"a": 1}])
+    calls = []
+
+    def _build():
+        calls.append(1)
+        return {"built": True}
+
+    assert pool.derived("index", _build) is pool.derived("index", _build)
+    assert len(calls) == 1
+    assert dh.DataPool([{"a": 1}]).derived("index", lambda: "other") == "other"
+
+
+def test_data_pool_projected_encodes_lazily_and_memoizes(monkeypatch):
+    pool = dh.DataPool([{"id": 1, "title": "A", "menu": [1, 2]}, {"id": 2, "menu": []}])
+    projected = pool.projected(("title", "id"))
+    assert pool.projected(("title", "id")) is projected
+    assert len(projected) == 2
+    assert projected[1] == b'{"id":2}'
+    assert projected[:1] == [b'{"title":"A","id":1}']
+    monkeypatch.setattr(dh.orjson, "dumps", lambda *_a, **_k: pytest.fail("re-encoded"))
+    assert projected[0] == b'{"title":"A","id":1}'
+
+
+def test_data_pool_projected_memoizes_a_bounded_number_of_field_lists(monkeypatch):
+    monkeypatch.setattr(dh, "DATA_POOL_PROJECTIONS_MAX", 2)
+    pool = dh.DataPool([{"id": 1, "title": "A", "year": 2000}])
+    kept = [pool.projected(("id",)), pool.projected(("title",))]
+    extra = pool.projected(("year",))
+    # Past the cap: same bytes, but encoded per access and not kept with the pool
+    assert extra[0] == b'{"year":2000}' and extra[:1] == [b'{"year":2000}'] and len(extra) == 1
+    assert pool.projected(("year",)) is not extra
+    assert list(pool._projections) == [("id",), ("title",)]
+    assert pool.projected(("id",)) is kept[0] and pool.projected(("title",)) is kept[1]
+
+
+def test_load_pool_async_matches_sync_and_reuses_cache(patch_base_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    _write_cached_project(Path(patch_base_path), "web_async")
+    pool = asyncio.run(dh.load_pool_async("web_async", "movies", seed_value=5))
+    assert pool.items == [{"a": 1}, {"a": 2}]
+    assert dh.load_pool("web_async", "movies", seed_value=5) is pool
+    assert asyncio.run(dh.load_pool_async("web_async", "movies", seed_value=1)).items == [{"a": 1}]
+
+
+def test_data_pool_iter_projected_matches_projected_without_memo():
+    pool = dh.DataPool([{"id": 1, "title": "A"}, {"id": 2}])
+    assert list(pool.iter_projected(("title",))) == [b'{"title":"A"}', b"{}"]
+    assert pool._projections == {}
+
+
+def test_load_pool_async_full_pool_ignores_v2_flag(patch_base_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "false")
+    _write_cached_project(Path(patch_base_path), "web_async_full")
+    assert asyncio.run(dh.load_pool_async("web_async_full", "movies", seed_value=5)).items == [{"a": 1}]
+    assert asyncio.run(dh.load_pool_async("web_async_full", "movies", full_pool=True)).items == [{"a": 1}, {"a": 2}]
+
+
+def test_load_pool_async_missing_project_returns_empty_pool(patch_base_path):
+    assert len(asyncio.run(dh.load_pool_async("web_missing_async", "movies"))) == 0
+
+
+def test_load_pool_async_shares_in_flight_parse(patch_base_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    _write_cached_project(Path(patch_base_path), "web_async2")
+    calls = []
+    original = dh._parse_json_file_to_items
+
+    def _slow_parse(path, **kwargs):
+        calls.append(path)
+        time.sleep(0.05)
+        return original(path, **kwargs)
+
+    monkeypatch.setattr(dh, "_parse_json_file_to_items", _slow_parse)
+
+    async def _concurrent():
+        return await asyncio.gather(*(dh.load_pool_async("web_async2", "movies", seed_value=5) for _ in range(5)))
+
+    pools = asyncio.run(_concurrent())
+    assert all(p.items == [{"a": 1}, {"a": 2}] for p in pools)
+    assert sorted(os.path.basename(c) for c in calls) == ["m1.json", "m2.json"]
+    assert dh._INFLIGHT_PARSES == {}
+
+
+def test_append_to_entity_data_invalidates_cached_pool(patch_base_path):
+    base = Path(patch_base_path)
+    (base / "web_cache6").mkdir(parents=True)
+    dh.append_to_entity_data("web_cache6", "items", [{"id": 1}])
+    assert dh.load_all_data("web_cache6", "items") == [{"id": 1}]
+    dh.append_to_entity_data("web_cache6", "items", [{"id": 2}])
+    assert dh.load_all_data("web_cache6", "items") == [{"id": 1}, {"id": 2}]
+
+
+def test_append_evicts_only_pools_of_the_written_entity(patch_base_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    base = Path(patch_base_path)
+    proj = _write_cached_project(base, "web_evict")
+    (proj / "shows.json").write_text(json.dumps([{"s": 1}]), encoding="utf-8")
+    (proj / "main.json").write_text(json.dumps({"movies": ["./m1.json", "./m2.json"], "shows": ["./shows.json"]}), encoding="utf-8")
+    _write_cached_project(base, "web_evict_other")
+    shows = dh.load_pool("web_evict", "shows", seed_value=5)
+    everything = dh.load_pool("web_evict", None, seed_value=5)
+    other = dh.load_pool("web_evict_other", "movies", seed_value=5)
+    dh.append_or_rollover_entity_data("web_evict", "movies", [{"a": 3}])
+    assert dh.load_pool("web_evict", "shows", seed_value=5) is shows
+    assert dh.load_pool("web_evict_other", "movies", seed_value=5) is other
+    assert dh.load_pool("web_evict", None, seed_value=5) is not everything
+    assert dh.load_pool("web_evict", "movies", seed_value=5).items == [{"a": 1}, {"a": 2}, {"a": 3}]
+
+
+# --- Project path index ---
+def test_build_path_index_indexes_projects_and_files(patch_base_path):
+    base = Path(patch_base_path)
+    _write_cached_project(base, "web_idx1")
+    (base / "not a project").mkdir()
+    assert dh.build_path_index() == 1
+    entry = dh._PATH_INDEX["web_idx1"]
+    assert set(entry.files) == {"./m1.json", "./m2.json"}
+    assert entry.files["./m1.json"] == os.path.realpath(base / "web_idx1" / "m1.json")
+
+
+def test_load_pool_after_index_build_does_not_list_directories(patch_base_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    _write_cached_project(Path(patch_base_path), "web_idx2")
+    dh.build_path_index()
+
+    def _no_listdir(path):
+        raise AssertionError(f"unexpected listdir({path})")
+
+    monkeypatch.setattr(dh.os, "listdir", _no_listdir)
+    assert dh.load_pool("web_idx2", "movies", seed_value=5).items == [{"a": 1}, {"a": 2}]
+
+
+def test_path_index_rejects_traversal_in_main_json(patch_base_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    base = Path(patch_base_path)
+    (base / "secret.json").write_text(json.dumps([{"secret": 1}]), encoding="utf-8")
+    proj = _write_cached_project(base, "web_idx3")
+    (proj / "main.json").write_text(json.dumps({"movies": ["./m1.json", "../secret.json"]}), encoding="utf-8")
+    dh.build_path_index()
+    assert dh._PATH_INDEX["web_idx3"].files["../secret.json"] is None
+    assert dh.load_pool("web_idx3", "movies", seed_value=5).items == [{"a": 1}]
+
+
+def test_path_index_refreshed_when_main_json_changes(patch_base_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    proj = _write_cached_project(Path(patch_base_path), "web_idx4")
+    dh.build_path_index()
+    (proj / "m3.json").write_text(json.dumps([{"a": 3}]), encoding="utf-8")
+    (proj / "main.json").write_text(json.dumps({"movies": ["./m1.json", "./m2.json", "./m3.json"]}), encoding="utf-8")
+    assert dh.load_pool("web_idx4", "movies", seed_value=5).items == [{"a": 1}, {"a": 2}, {"a": 3}]
+
+
+def test_unknown_project_not_indexed(patch_base_path):
+    dh.build_path_index()
+    assert dh._get_validated_main_io_path("web_missing") is None
+
+
+def test_data_pool_encoded_items_built_once():
+    pool = dh.DataPool([{"id": 1, "name": "é"}, {"id": 2}])
+    encoded = pool.encoded
+    assert encoded == [json.dumps({"id": 1, "name": "é"}, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), b'{"id":2}']
+    assert pool.encoded is encoded
+
+
+# --- JSONL append tails ---
+@pytest.fixture
+def jsonl_mode(monkeypatch):
+    monkeypatch.setattr(dh, "DATA_APPEND_FORMAT", "jsonl")
+
+
+def test_append_to_entity_data_jsonl_appends_tail_only(patch_base_path, jsonl_mode):
+    proj = Path(patch_base_path) / "web_jl1"
+    proj.mkdir(parents=True)
+    (proj / "items.json").write_text(json.dumps([{"a": 1}], indent=2), encoding="utf-8")
+    before = (proj / "items.json").read_text(encoding="utf-8")
+    path = dh.append_to_entity_data("web_jl1", "items", [{"b": 2}, {"c": 3}])
+    dh.append_to_entity_data("web_jl1", "items", [{"d": 4}])
+    assert path.endswith("items.jsonl")
+    assert (proj / "items.json").read_text(encoding="utf-8") == before
+    assert (proj / "items.jsonl").read_text(encoding="utf-8").splitlines() == ['{"b":2}', '{"c":3}', '{"d":4}']
+    assert dh.load_all_data("web_jl1", "items") == [{"a": 1}, {"b": 2}, {"c": 3}, {"d": 4}]
+
+
+def test_append_to_entity_data_jsonl_creates_array_when_missing(patch_base_path, jsonl_mode):
+    (Path(patch_base_path) / "web_jl2").mkdir(parents=True)
+    path = dh.append_to_entity_data("web_jl2", "items", [{"a": 1}])
+    assert path.endswith("items.json")
+    assert json.loads(Path(path).read_text(encoding="utf-8")) == [{"a": 1}]
+
+
+def test_append_or_rollover_jsonl_appends_tail_of_last_file(patch_base_path, jsonl_mode, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    proj = Path(patch_base_path) / "web_jl3"
+    proj.mkdir(parents=True)
+    (proj / "main.json").write_text(json.dumps({"logs": ["./logs.json", "./logs_2.json"]}), encoding="utf-8")
+    (proj / "logs.json").write_text(json.dumps([{"n": 1}]), encoding="utf-8")
+    (proj / "logs_2.json").write_text(json.dumps([{"n": 2}]), encoding="utf-8")
+    path = dh.append_or_rollover_entity_data("web_jl3", "logs", [{"n": 3}])
+    assert path.endswith("logs_2.jsonl")
+    assert dh.load_all_data("web_jl3", "logs", seed_value=5) == [{"n": 1}, {"n": 2}, {"n": 3}]
+    assert dh.load_all_data("web_jl3", "logs", seed_value=1) == [{"n": 1}]
+
+
+def test_jsonl_tail_skips_torn_record_and_next_append_starts_new_line(patch_base_path, jsonl_mode):
+    proj = Path(patch_base_path) / "web_jl4"
+    proj.mkdir(parents=True)
+    (proj / "items.json").write_text(json.dumps([{"a": 1}]), encoding="utf-8")
+    (proj / "items.jsonl").write_text('{"b": 2}\n{"torn": ', encoding="utf-8")
+    dh.append_to_entity_data("web_jl4", "items", [{"c": 3}])
+    assert dh.load_all_data("web_jl4", "items") == [{"a": 1}, {"b": 2}, {"c": 3}]
+
+
+def test_compact_jsonl_tails_folds_tail_into_array(patch_base_path, jsonl_mode):
+    proj = Path(patch_base_path) / "web_jl5"
+    proj.mkdir(parents=True)
+    (proj / "items.json").write_text(json.dumps([{"a": 1}]), encoding="utf-8")
+    dh.append_to_entity_data("web_jl5", "items", [{"b": 2}])
+    assert dh.compact_jsonl_tails("web_jl5") == 1
+    assert not (proj / "items.jsonl").exists()
+    assert json.loads((proj / "items.json").read_text(encoding="utf-8")) == [{"a": 1}, {"b": 2}]
+    assert dh.load_all_data("web_jl5", "items") == [{"a": 1}, {"b": 2}]
+    assert dh.compact_jsonl_tails("web_jl5") == 0
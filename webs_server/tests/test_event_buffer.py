@@ -0,0 +1,277 @@
+# Unit tests for the write-behind event buffer (fake asyncpg pool, no database).
+"""
+Unit tests for event_buffer: id reservation, COPY flushing, backpressure, read-your-writes and shutdown.
+"""
+
+import asyncio
+
+import pytest
+from asyncpg.exceptions import StringDataRightTruncationError
+
+from event_buffer import EVENT_COLUMNS, BufferFull, EventBuffer
+
+
+class _FakeConn:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        self.pool.attempts += 1
+        if self.pool.failures:
+            self.pool.failures -= 1
+            raise RuntimeError("copy failed")
+        if any(event.id in self.pool.bad_ids for event in records):
+            raise StringDataRightTruncationError("value too long for type character varying(255)")
+        await asyncio.sleep(0)
+        self.pool.copies.append((table, list(records), columns))
+
+
+class _Acquire:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def __aenter__(self):
+        return _FakeConn(self.pool)
+
+    async def __aexit__(self, *args):
+        return None
+
+
+class _FakePool:
+    def __init__(self):
+        self.next_id = 100
+        self.reservations = []
+        self.copies = []
+        self.failures = 0
+        self.attempts = 0
+        # Rows the table rejects (COPY of any batch containing them fails with a data error)
+        self.bad_ids = set()
+
+    async def fetch(self, sql, count):
+        self.reservations.append(count)
+        rows = [{"id": self.next_id + i} for i in range(count)]
+        self.next_id += count
+        return rows
+
+    def acquire(self):
+        return _Acquire(self)
+
+    @property
+    def copied_ids(self):
+        return [event.id for _table, records, _columns in self.copies for event in records]
+
+
+def _put(buffer, i, url="https://a.test", agent="agent", validator="v1"):
+    return buffer.put(agent, url, validator, f'{{"n":{i}}}')
+
+
+def test_put_reserves_ids_in_blocks_and_flush_copies_in_batches():
+    pool = _FakePool()
+
+    async def _scenario():
+        buffer = EventBuffer(pool, max_events=100, flush_events=4)
+        events = [await _put(buffer, i) for i in range(10)]
+        assert len(buffer) == 10
+        written = await buffer.flush()
+        return buffer, events, written
+
+    buffer, events, written = asyncio.run(_scenario())
+    assert [e.id for e in events] == list(range(100, 110))
+    assert pool.reservations == [4, 4, 4]
+    assert written == 10 and len(buffer) == 0
+    assert [len(records) for _t, records, _c in pool.copies] == [4, 4, 2]
+    assert all(table == "events" and columns == EVENT_COLUMNS for table, _r, columns in pool.copies)
+    assert pool.copied_ids == list(range(100, 110))
+    assert pool.copies[0][1][0][4] == '{"n":0}'
+
+
+def test_background_flush_on_size_and_interval():
+    pool = _FakePool()
+
+    async def _scenario():
+        buffer = EventBuffer(pool, flush_events=3, flush_interval_ms=10_000)
+        buffer.start()
+        for i in range(3):
+            await _put(buffer, i)
+        await asyncio.sleep(0.05)
+        size_flushed = list(pool.copied_ids)
+        await buffer.close()
+
+        timed = EventBuffer(pool, flush_events=50, flush_interval_ms=10)
+        timed.start()
+        await _put(timed, 99)
+        await asyncio.sleep(0.1)
+        interval_flushed = len(timed)
+        await timed.close()
+        return size_flushed, interval_flushed
+
+    size_flushed, interval_flushed = asyncio.run(_scenario())
+    assert size_flushed == [100, 101, 102]
+    assert interval_flushed == 0
+    assert len(pool.copied_ids) == 4
+
+
+def test_full_buffer_rejects_or_blocks():
+    pool = _FakePool()
+
+    async def _scenario():
+        rejecting = EventBuffer(pool, max_events=2, flush_events=10)
+        await _put(rejecting, 0)
+        await _put(rejecting, 1)
+        with pytest.raises(BufferFull):
+            await _put(rejecting, 2)
+
+        blocking = EventBuffer(pool, max_events=1, flush_events=10, full_policy="block")
+        await _put(blocking, 0)
+        waiter = asyncio.ensure_future(_put(blocking, 1))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        await blocking.flush()
+        event = await asyncio.wait_for(waiter, timeout=1)
+        return event, len(blocking)
+
+    event, pending = asyncio.run(_scenario())
+    assert event.event_data == '{"n":1}'
+    assert pending == 1
+
+
+def test_failed_flush_keeps_events_in_order_for_retry():
+    pool = _FakePool()
+    pool.failures = 1
+
+    async def _scenario():
+        buffer = EventBuffer(pool, flush_events=2)
+        for i in range(3):
+            await _put(buffer, i)
+        with pytest.raises(RuntimeError):
+            await buffer.flush()
+        assert [e.id for e in buffer.unflushed(("https://a.test", "agent", "v1"))] == [100, 101, 102]
+        await buffer.flush()
+
+    asyncio.run(_scenario())
+    assert pool.copied_ids == [100, 101, 102]
+
+
+def test_unflushed_includes_batch_being_copied_and_discard_waits_for_it():
+    pool = _FakePool()
+    key = ("https://a.test", "agent", "v1")
+
+    async def _scenario():
+        buffer = EventBuffer(pool, flush_events=2)
+        await _put(buffer, 0)
+        await _put(buffer, 1, agent="other")
+        await _put(buffer, 2)
+        flushing = asyncio.ensure_future(buffer.flush())
+        await asyncio.sleep(0)
+        during_copy = [e.id for e in buffer.unflushed(key)]
+        dropped_after_copy = await buffer.discard(key)
+        assert flushing.done()
+        await _put(buffer, 3)
+        await _put(buffer, 4, agent="other")
+        dropped_queued = await buffer.discard(key)
+        return during_copy, dropped_after_copy, dropped_queued, buffer
+
+    during_copy, dropped_after_copy, dropped_queued, buffer = asyncio.run(_scenario())
+    assert during_copy == [100, 102]
+    # discard waited until the running flush had written every queued event (a DELETE then sees them)
+    assert dropped_after_copy == 0
+    assert pool.copied_ids == [100, 101, 102]
+    assert dropped_queued == 1
+    assert [e.id for e in buffer.unflushed(("https://a.test", "other", "v1"))] == [104]
+
+
+def test_close_flushes_and_rejects_new_events():
+    pool = _FakePool()
+
+    async def _scenario():
+        buffer = EventBuffer(pool, flush_events=100, flush_interval_ms=10_000)
+        buffer.start()
+        await _put(buffer, 0)
+        await buffer.close()
+        with pytest.raises(RuntimeError):
+            await _put(buffer, 1)
+
+    asyncio.run(_scenario())
+    assert pool.copied_ids == [100]
+
+
+def test_unknown_full_policy_raises():
+    with pytest.raises(ValueError):
+        EventBuffer(_FakePool(), full_policy="drop")
+
+
+def test_discard_validator_drops_every_key_of_that_validator():
+    pool = _FakePool()
+
+    async def _scenario():
+        buffer = EventBuffer(pool, flush_events=10)
+        await _put(buffer, 0, validator="v1")
+        await _put(buffer, 1, url="https://b.test", validator="v1")
+        await _put(buffer, 2, validator="v2")
+        return await buffer.discard_validator("v1"), buffer
+
+    dropped, buffer = asyncio.run(_scenario())
+    assert dropped == 2
+    assert len(buffer) == 1 and [e.id for e in buffer.unflushed(("https://a.test", "agent", "v2"))] == [102]
+
+
+def test_rejected_rows_are_bisected_out_and_dead_lettered():
+    pool = _FakePool()
+    pool.bad_ids = {102, 105}
+
+    async def _scenario():
+        buffer = EventBuffer(pool, flush_events=8)
+        for i in range(8):
+            await _put(buffer, i)
+        return await buffer.flush(), buffer
+
+    written, buffer = asyncio.run(_scenario())
+    assert written == 6 and len(buffer) == 0
+    assert sorted(pool.copied_ids) == [100, 101, 103, 104, 106, 107]
+    assert [e.id for e in buffer.dead_letters] == [102, 105]
+
+
+def test_transient_failure_during_bisect_requeues_only_unwritten_events():
+    pool = _FakePool()
+    pool.bad_ids = {100}
+
+    async def _scenario():
+        buffer = EventBuffer(pool, flush_events=4)
+        for i in range(4):
+            await _put(buffer, i)
+        # First COPY hits the bad row; the database then goes away while bisecting the second half
+        real_copy = _FakeConn.copy_records_to_table
+
+        async def _copy(conn, table, *, records, columns):
+            if pool.attempts == 4:
+                pool.failures = 1
+            return await real_copy(conn, table, records=records, columns=columns)
+
+        _FakeConn.copy_records_to_table = _copy
+        try:
+            with pytest.raises(RuntimeError):
+                await buffer.flush()
+        finally:
+            _FakeConn.copy_records_to_table = real_copy
+        requeued = [e.id for e in buffer.unflushed(("https://a.test", "agent", "v1"))]
+        await buffer.flush()
+        return requeued, buffer
+
+    requeued, buffer = asyncio.run(_scenario())
+    assert requeued == [102, 103]
+    assert [e.id for e in buffer.dead_letters] == [100]
+    assert pool.copied_ids == [101, 102, 103]
+
+
+def test_rejected_puts_reserve_no_ids():
+    pool = _FakePool()
+
+    async def _scenario():
+        buffer = EventBuffer(pool, max_events=1, flush_events=1)
+        await _put(buffer, 0)
+        for i in range(5):
+            with pytest.raises(BufferFull):
+                await _put(buffer, i)
+
+    asyncio.run(_scenario())
+    assert pool.reservations == [1]
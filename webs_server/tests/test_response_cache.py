@@ -0,0 +1,71 @@
+# Unit tests for response_cache (ETag helpers and the bounded body cache).
+"""
+Unit tests for response_cache: ETag derivation, If-None-Match / Accept-Encoding parsing and LRU eviction.
+"""
+
+import gzip
+
+from response_cache import ResponseCache, accepts_gzip, gzip_etag, make_etag, match_if_none_match
+
+
+def test_make_etag_is_quoted_and_deterministic():
+    etag = make_etag("v1", "web_1", 42)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("v1", "web_1", 42)
+    assert etag != make_etag("v2", "web_1", 42)
+
+
+def test_gzip_etag_differs_from_identity_etag():
+    etag = make_etag("x")
+    assert gzip_etag(etag) != etag
+    assert gzip_etag(etag).endswith('-gzip"')
+
+
+def test_match_if_none_match_variants():
+    etag = make_etag("x")
+    assert match_if_none_match(None, etag) is None
+    assert match_if_none_match('"other"', etag) is None
+    assert match_if_none_match(f'"other", {etag}', etag) == etag
+    assert match_if_none_match(f"W/{etag}", etag) == etag
+    assert match_if_none_match(gzip_etag(etag), etag) == gzip_etag(etag)
+    assert match_if_none_match("*", etag) == etag
+
+
+def test_accepts_gzip():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, gzip;q=0.8")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("br")
+    assert not accepts_gzip(None)
+
+
+def test_response_cache_get_put_and_gzip():
+    cache = ResponseCache(10_000)
+    entry = cache.put('"a"', b"x" * 500)
+    assert cache.get('"a"') is entry
+    assert cache.get('"b"') is None
+    gzipped = cache.gzipped('"a"', entry)
+    assert gzip.decompress(gzipped) == b"x" * 500
+    assert cache.gzipped('"a"', entry) is gzipped
+    assert cache.total_bytes == 500 + len(gzipped)
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(250)
+    cache.put('"a"', b"a" * 100)
+    cache.put('"b"', b"b" * 100)
+    cache.get('"a"')
+    cache.put('"c"', b"c" * 100)
+    assert cache.get('"b"') is None
+    assert cache.get('"a"') is not None and cache.get('"c"') is not None
+    assert cache.total_bytes == 200
+
+
+def test_response_cache_skips_oversized_bodies():
+    cache = ResponseCache(10)
+    entry = cache.put('"a"', b"x" * 11)
+    assert entry.body == b"x" * 11
+    assert len(cache) == 0
+    cache.clear()
+    assert cache.total_bytes == 0
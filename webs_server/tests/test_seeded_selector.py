@@ -3,9 +3,15 @@
 Unit tests for seeded_selector: deterministic selection, shuffle, filter, distribution.
 """
 
+import os
+import random
+import subprocess
+import sys
 from unittest.mock import patch
 
+import pytest
 
+import seeded_selector
 from seeded_selector import (
     seeded_select,
     seeded_shuffle,
@@ -13,6 +19,14 @@ from seeded_selector import (
     seeded_distribution,
     generate_seed_from_string,
     verify_reproducibility,
+    seeded_sample_indices,
+    seeded_shuffle_indices,
+    clear_permutation_cache,
+    IndexSelector,
+    seeded_partial_shuffle_indices,
+    allocate_strata,
+    stratified_sample_indices,
+    seeded_permutation_slice,
 )
 
 
@@ -114,6 +128,25 @@ def test_generate_seed_from_string_in_range():
     assert 0 <= s <= 2147483647
 
 
+def test_generate_seed_from_string_is_stable_across_processes():
+    # Pinned values: changing them requires bumping SEED_HASH_VERSION
+    assert seeded_selector.SEED_HASH_VERSION == 1
+    assert generate_seed_from_string("hello") == 197946963
+    assert generate_seed_from_string("project_1") == 1198855385
+    code = "import seeded_selector; print(seeded_selector.generate_seed_from_string('hello'))"
+    for hash_seed in ("1", "2"):
+        env = {**os.environ, "PYTHONHASHSEED": hash_seed}
+        out = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(seeded_selector.__file__), env=env, capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "197946963"
+
+
+def test_generate_seed_from_string_is_memoized():
+    generate_seed_from_string.cache_clear()
+    generate_seed_from_string("memo")
+    generate_seed_from_string("memo")
+    assert generate_seed_from_string.cache_info().hits == 1
+
+
 # --- seeded_distribution ---
 def test_seeded_distribution_empty_pool_returns_empty():
     assert seeded_distribution([], seed=42, category_key="category", total_count=5) == []
@@ -144,3 +177,236 @@ def test_verify_reproducibility_returns_false_when_results_differ():
     """When selection is not reproducible (e.g. mocked to differ), returns False."""
     with patch("seeded_selector.seeded_select", side_effect=[[POOL[0]], [POOL[1]], [POOL[0]]]):
         assert verify_reproducibility(POOL, seed=42, count=1, iterations=3) is False
+
+
+# --- permutation table ---
+@pytest.fixture
+def empty_permutation_cache():
+    clear_permutation_cache()
+    yield
+    clear_permutation_cache()
+
+
+@pytest.mark.parametrize("n", [1, 6, 21, 22, 100, 1000, 5000])
+@pytest.mark.parametrize("seed", [1, 42, 999, 1000, 0])
+def test_seeded_sample_indices_matches_random_sample(empty_permutation_cache, n, seed):
+    for k in sorted(k for k in {0, 1, 5, 6, 20, n // 3, n // 2, n} if k <= n):
+        assert seeded_sample_indices(n, seed, k) == random.Random(seed).sample(range(n), k)
+
+
+@pytest.mark.parametrize("limit", [None, 0, 3, 50])
+def test_seeded_shuffle_indices_matches_random_shuffle(empty_permutation_cache, limit):
+    order = list(range(40))
+    random.Random(7).shuffle(order)
+    assert seeded_shuffle_indices(40, 7, limit) == (order[:limit] if limit else order)
+
+
+def test_seeded_select_and_shuffle_unchanged_with_table(empty_permutation_cache):
+    pool = [{"id": i} for i in range(300)]
+    for seed in (1, 77, 999):
+        assert seeded_select(pool, seed=seed, count=12) == random.Random(seed).sample(pool, 12)
+        expected = pool.copy()
+        random.Random(seed).shuffle(expected)
+        assert seeded_shuffle(pool, seed=seed, limit=12) == expected[:12]
+
+
+def test_seeded_sample_indices_grows_set_prefix(empty_permutation_cache):
+    for k in range(0, 40):
+        assert seeded_sample_indices(20000, 3, k) == random.Random(3).sample(range(20000), k)
+    assert len(seeded_selector._PERMUTATIONS) == 1
+
+
+def test_permutation_cache_respects_byte_budget(empty_permutation_cache, monkeypatch):
+    monkeypatch.setattr(seeded_selector, "SEED_PERMUTATION_CACHE_BYTES", 400)
+    for seed in range(1, 6):
+        seeded_shuffle_indices(100, seed)
+    assert seeded_selector._PERMUTATIONS_BYTES <= 400
+    assert list(seeded_selector._PERMUTATIONS) == [("shuffle", 100, 4), ("shuffle", 100, 5)]
+
+
+def test_seeded_sample_indices_invalid_k_raises():
+    with pytest.raises(ValueError):
+        seeded_sample_indices(3, 1, 4)
+
+
+# --- IndexSelector ---
+ENGINE_POOL = [{"id": i, "category": "KEH"[i % 3] if i % 7 else None, "tags": ["x"]} for i in range(120)]
+
+
+@pytest.mark.parametrize("seed", [1, 42, 999, 5000])
+def test_index_selector_compat_matches_item_functions(seed):
+    selector = IndexSelector(ENGINE_POOL)
+    assert selector.materialize(selector.select(seed, 10)) == seeded_select(ENGINE_POOL, seed, 10)
+    assert selector.materialize(selector.select(seed, 500)) == seeded_select(ENGINE_POOL, seed, 500)
+    assert selector.materialize(selector.shuffle(seed, limit=15)) == seeded_shuffle(ENGINE_POOL, seed, limit=15)
+    assert selector.materialize(selector.shuffle(seed)) == seeded_shuffle(ENGINE_POOL, seed)
+    assert selector.materialize(selector.filter_select(seed, 8, "category", ["K", "H"])) == seeded_filter_and_select(ENGINE_POOL, seed, 8, filter_key="category", filter_values=["K", "H"])
+    assert selector.materialize(selector.filter_select(seed, 8, None, None)) == seeded_select(ENGINE_POOL, seed, 8)
+    assert selector.materialize(selector.distribute(seed, "category", 12)) == seeded_distribution(ENGINE_POOL, seed, "category", 12)
+
+
+def test_index_selector_mask_returns_ascending_positions_and_reuses_columns():
+    selector = IndexSelector(ENGINE_POOL)
+    positions = selector.mask("category", ["E", "missing"])
+    assert positions == [i for i, item in enumerate(ENGINE_POOL) if item["category"] == "E"]
+    assert selector.column_codes("category") is selector.column_codes("category")
+    assert selector.mask("category", ["nope"]) == []
+
+
+def test_index_selector_unhashable_values_never_match():
+    selector = IndexSelector(ENGINE_POOL)
+    assert selector.mask("tags", ["x"]) == []
+    assert selector.mask("tags", [["x"]]) == []
+
+
+def test_index_selector_empty_pool():
+    selector = IndexSelector([])
+    assert len(selector) == 0
+    assert selector.select(3, 5) == []
+    assert selector.shuffle(3, 5) == []
+    assert selector.filter_select(3, 5, "category", ["K"]) == []
+    assert selector.distribute(3, "category", 5) == []
+
+
+def test_index_selector_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        IndexSelector(ENGINE_POOL, mode="fastest")
+
+
+def test_index_selector_numpy_mode_requires_numpy(monkeypatch):
+    monkeypatch.setattr(seeded_selector, "HAS_NUMPY", False)
+    with pytest.raises(RuntimeError):
+        IndexSelector(ENGINE_POOL, mode="numpy")
+
+
+def test_invalid_selection_mode_fails_at_import():
+    env = {**os.environ, "SELECTION_MODE": "fastest"}
+    out = subprocess.run([sys.executable, "-c", "import seeded_selector"], cwd=os.path.dirname(seeded_selector.__file__), env=env, capture_output=True, text=True)
+    assert out.returncode != 0
+    assert "Unknown selection mode: fastest" in out.stderr
+
+
+def test_index_selector_numpy_mode_is_deterministic():
+    pytest.importorskip("numpy")
+    selector = IndexSelector(ENGINE_POOL, mode="numpy")
+    assert selector.select(42, 10) == selector.select(42, 10)
+    assert len(set(selector.select(42, 10))) == 10
+    assert len(selector.select(42, 500)) == 500
+    assert selector.shuffle(42, limit=10) == IndexSelector(ENGINE_POOL, mode="numpy").shuffle(42, limit=10)
+    picked = selector.filter_select(42, 8, "category", ["K", "H"])
+    assert all(ENGINE_POOL[i]["category"] in ("K", "H") for i in picked)
+    assert len(selector.distribute(42, "category", 12)) == 12
+
+
+# --- partial shuffle ---
+@pytest.mark.parametrize("seed", [1, 42, 999, 12345])
+def test_seeded_partial_shuffle_indices_is_prefix_of_seeded_permutation(seed):
+    full = random.Random(seed).sample(range(500), 500)
+    assert seeded_partial_shuffle_indices(500, seed, 10) == full[:10]
+    assert seeded_partial_shuffle_indices(500, seed, 700) == full
+    assert seeded_partial_shuffle_indices(500, seed) == full
+
+
+def test_seeded_partial_shuffle_indices_only_draws_limit_positions():
+    with patch("seeded_selector.random.Random.randrange", autospec=True, side_effect=lambda self, n: 0) as randrange:
+        assert seeded_partial_shuffle_indices(100_000, 3, 5) == [0, 99_999, 99_998, 99_997, 99_996]
+    assert randrange.call_count == 5
+
+
+def test_seeded_shuffle_partial_flag():
+    assert seeded_shuffle(POOL, 42, limit=3, partial=True) == [POOL[i] for i in seeded_partial_shuffle_indices(len(POOL), 42, 3)]
+    assert seeded_shuffle(POOL, 42, limit=3) == seeded_shuffle(POOL, 42, limit=3, partial=False)
+
+
+def test_index_selector_partial_shuffle_over_positions():
+    selector = IndexSelector(ENGINE_POOL)
+    positions = selector.mask("category", ["K"])
+    picked = selector.shuffle(9, limit=4, positions=positions, partial=True)
+    assert picked == [positions[i] for i in seeded_partial_shuffle_indices(len(positions), 9, 4)]
+
+
+# --- inverted index ---
+def test_index_selector_postings_built_once_per_key():
+    selector = IndexSelector(ENGINE_POOL)
+    lists, vocab = selector.postings("category")
+    assert selector.postings("category")[0] is lists
+    assert list(lists[vocab["K"]]) == [i for i, item in enumerate(ENGINE_POOL) if item["category"] == "K"]
+    assert sum(len(p) for p in lists) == len(ENGINE_POOL)
+
+
+def test_index_selector_mask_unions_postings_in_pool_order():
+    selector = IndexSelector(ENGINE_POOL)
+    expected = [i for i, item in enumerate(ENGINE_POOL) if item["category"] in ("H", "K")]
+    assert selector.mask("category", ["H", "K", "H"]) == expected
+    assert selector.mask("category", [None]) == [i for i, item in enumerate(ENGINE_POOL) if item["category"] is None]
+
+
+# --- stratified sampling ---
+def test_allocate_strata_equal_split():
+    assert allocate_strata([10, 10, 10], 7) == [3, 2, 2]
+    assert allocate_strata([1, 10, 10], 9) == [1, 3, 3]
+    assert allocate_strata([], 5) == []
+
+
+def test_allocate_strata_proportional_largest_remainder():
+    assert allocate_strata([60, 30, 10], 10, proportional=True) == [6, 3, 1]
+    assert allocate_strata([5, 5, 5], 4, proportional=True) == [2, 1, 1]
+    assert allocate_strata([70, 20, 10], 5, proportional=True) == [4, 1, 0]
+    assert allocate_strata([3, 2], 50, proportional=True) == [3, 2]
+    assert sum(allocate_strata([7, 13, 29, 51], 17, proportional=True)) == 17
+
+
+def test_stratified_sample_indices_equal_matches_seeded_distribution():
+    categories = [item.get("category", "unknown") for item in ENGINE_POOL]
+    groups = {}
+    for idx, cat in enumerate(categories):
+        groups.setdefault(cat, []).append(idx)
+    for seed in (1, 42, 999):
+        expected = [ENGINE_POOL.index(item) for item in seeded_distribution(ENGINE_POOL, seed, "category", 12)]
+        assert stratified_sample_indices(list(groups.values()), seed, 12) == expected
+
+
+def test_seeded_distribution_proportional_follows_category_sizes():
+    pool = [{"id": i, "category": "big" if i < 80 else "small"} for i in range(100)]
+    picked = seeded_distribution(pool, 7, "category", 10, proportional=True)
+    assert [item["category"] for item in picked].count("big") == 8
+    assert [item["category"] for item in seeded_distribution(pool, 7, "category", 10)].count("big") == 5
+
+
+def test_index_selector_distribute_uses_cached_groups():
+    selector = IndexSelector(ENGINE_POOL)
+    first = selector.distribute(42, "category", 12)
+    with patch.object(selector, "column_codes", side_effect=AssertionError("regrouped")):
+        assert selector.distribute(42, "category", 12) == first
+        proportional = selector.distribute(42, "category", 12, proportional=True)
+    assert first == [ENGINE_POOL.index(item) for item in seeded_distribution(ENGINE_POOL, 42, "category", 12)]
+    assert proportional == [ENGINE_POOL.index(item) for item in seeded_distribution(ENGINE_POOL, 42, "category", 12, proportional=True)]
+
+
+# --- permutation pages ---
+@pytest.mark.parametrize("seed", [5, 5000])
+@pytest.mark.parametrize("full_shuffle", [False, True])
+def test_seeded_permutation_slice_pages_concatenate_to_permutation(seed, full_shuffle):
+    pages = []
+    for start in range(0, 130, 25):
+        pages.extend(seeded_permutation_slice(130, seed, start, start + 25, full_shuffle))
+    expected = seeded_shuffle_indices(130, seed) if full_shuffle else random.Random(seed).sample(range(130), 130)
+    assert pages == expected
+    assert seeded_permutation_slice(130, seed, 200, 225, full_shuffle) == []
+
+
+@pytest.mark.parametrize("seed", [5, 5000])
+def test_first_select_page_matches_unpaginated_select_only_below_sample_set_threshold(seed):
+    # Pages walk the sample(range(n), n) order. An unpaginated select of k draws sample(range(n), k),
+    # which switches to its set-based algorithm once n > 21 + 4 ** ceil(log(3k, 4)) (277 at k=50)
+    small, large = IndexSelector([{"i": i} for i in range(277)]), IndexSelector([{"i": i} for i in range(278)])
+    assert small.page(seed, 0, 50) == small.select(seed, 50)
+    assert large.page(seed, 0, 50) == random.Random(seed).sample(range(278), 278)[:50]
+    assert large.page(seed, 0, 50) != large.select(seed, 50) == random.Random(seed).sample(range(278), 50)
+
+
+def test_index_selector_page_over_positions():
+    selector = IndexSelector(ENGINE_POOL)
+    positions = selector.mask("category", ["K"])
+    first, second = selector.page(3, 0, 5, positions), selector.page(3, 5, 5, positions)
+    assert first + second == [positions[i] for i in random.Random(3).sample(range(len(positions)), len(positions))[:10]]
@@ -4,16 +4,22 @@ Integration tests for the FastAPI server.
 Uses TestClient with mocked DB pool so endpoints can be tested without a real database.
 """
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 import asyncio
 
+import orjson
 import pytest
+import asyncpg
+from asyncpg.exceptions import InvalidCachedStatementError, PostgresError, UndefinedTableError
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 # Import after conftest adds src to path
 import server
+from data_handler import DataPool
+from event_buffer import EventBuffer
+from seeded_selector import seeded_select, seeded_shuffle
 
 
 async def _fake_init_db_pool():
@@ -345,6 +351,23 @@ def test_get_events_success(client_with_pool):
     assert data[0]["data"] == {"event": "click"}
 
 
+def test_get_events_passes_jsonb_text_through_unparsed(client_with_pool, monkeypatch):
+    raw = '{"b": 1, "a": {"dom": "<div>é</div>", "n": [1, 2.50]}}'
+    stored, missing = _event_rows([1, 2])
+    server.app.state.pool.fetch = AsyncMock(return_value=[{**stored, "data": raw}, {**missing, "data": None}])
+
+    def _no_parse(*args, **kwargs):
+        raise AssertionError("event data must not be parsed")
+
+    monkeypatch.setattr(server.orjson, "loads", _no_parse)
+    r = client_with_pool.get("/get_events/", params={"web_url": "https://example.com", "web_agent_id": "agent1", "validator_id": "v1"})
+    monkeypatch.undo()
+    assert r.status_code == 200
+    # The stored text is copied byte for byte; created_at is formatted like the EventOutput model
+    assert f'"data":{raw},"created_at":"2020-01-01T00:00:01Z"' in r.content.decode()
+    assert r.json()[1]["data"] == {}
+
+
 def test_reset_events_success(client_with_pool):
     r = client_with_pool.delete(
         "/reset_events/",
@@ -486,6 +509,41 @@ def test_apply_seeded_selection_distribute():
     assert len(out) <= 2
 
 
+@pytest.mark.parametrize("method", ["select", "shuffle", "filter", "distribute"])
+def test_apply_seeded_selection_indices_match_item_functions(method):
+    from seeded_selector import seeded_distribution, seeded_filter_and_select
+
+    pool = [{"id": i, "category": "ABC"[i % 3]} for i in range(40)]
+    indices = server._apply_seeded_selection_indices(pool, 42, 10, method, "category", "A,C")
+    expected = {
+        "select": lambda: seeded_select(pool, seed=42, count=10),
+        "shuffle": lambda: seeded_shuffle(pool, 42, limit=10),
+        "filter": lambda: seeded_filter_and_select(pool, 42, 10, filter_key="category", filter_values=["A", "C"]),
+        "distribute": lambda: seeded_distribution(pool, 42, category_key="category", total_count=10),
+    }[method]()
+    assert [pool[i] for i in indices] == expected
+
+
+def test_apply_seeded_selection_indices_partial_shuffle_mode(monkeypatch):
+    from seeded_selector import seeded_partial_shuffle_indices
+
+    monkeypatch.setattr(server, "SHUFFLE_MODE", "partial")
+    pool = [{"id": i} for i in range(40)]
+    assert server._apply_seeded_selection_indices(pool, 42, 10, "shuffle", None, None) == seeded_partial_shuffle_indices(40, 42, 10)
+
+
+def test_apply_seeded_selection_filter_reuses_pool_inverted_index():
+    items = [{"id": i, "category": "KEH"[i % 3]} for i in range(60)]
+    pool = DataPool(items)
+    first = server._apply_seeded_selection_indices(pool, 5, 4, "filter", "category", "K,E")
+    selector = pool.derived("selector", lambda: None)
+    postings = selector.postings("category")[0]
+    with patch.object(selector, "column_codes", side_effect=AssertionError("column rebuilt")):
+        assert server._apply_seeded_selection_indices(pool, 5, 4, "filter", "category", "K,E") == first
+    assert selector.postings("category")[0] is postings
+    assert first == server._apply_seeded_selection_indices(items, 5, 4, "filter", "category", "K,E")
+
+
 def test_build_load_metadata():
     meta = server._build_load_metadata(
         "web_1",
@@ -504,10 +562,10 @@ def test_build_load_metadata():
     assert meta["totalAvailable"] == 100
 
 
-# --- GET /datasets/load with mocked load_all_data ---
+# --- GET /datasets/load with mocked load_pool_async ---
 def test_datasets_load_success(client, monkeypatch):
     mock_data = [{"id": 1, "name": "A"}, {"id": 2, "name": "B"}]
-    with patch.object(server, "load_all_data", return_value=mock_data):
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=DataPool(mock_data)):
         r = client.get(
             "/datasets/load",
             params={
@@ -525,7 +583,7 @@ def test_datasets_load_success(client, monkeypatch):
 
 
 def test_datasets_load_empty_404(client, monkeypatch):
-    with patch.object(server, "load_all_data", return_value=[]):
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=DataPool([])):
         r = client.get(
             "/datasets/load",
             params={
@@ -539,7 +597,7 @@ def test_datasets_load_empty_404(client, monkeypatch):
 
 
 def test_datasets_load_exception_500(client, monkeypatch):
-    with patch.object(server, "load_all_data", side_effect=RuntimeError("load failed")):
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, side_effect=RuntimeError("load failed")):
         r = client.get(
             "/datasets/load",
             params={
@@ -555,7 +613,7 @@ def test_datasets_load_exception_500(client, monkeypatch):
 def test_datasets_load_v2_seeded(client, monkeypatch):
     monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
     mock_data = [{"id": i} for i in range(100)]
-    with patch.object(server, "load_all_data", return_value=mock_data):
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=DataPool(mock_data)):
         r = client.get(
             "/datasets/load",
             params={
@@ -572,6 +630,23 @@ def test_datasets_load_v2_seeded(client, monkeypatch):
     assert len(data["data"]) == 5
 
 
+def test_datasets_load_v2_response_spliced_from_encoded_items(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    mock_data = [{"id": i, "title": f"t{i}", "tags": ["a", "b"]} for i in range(100)]
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=DataPool(mock_data)):
+        r = client.get(
+            "/datasets/load",
+            params={"project_key": "web_1", "entity_type": "movies", "seed_value": 42, "limit": 5, "method": "shuffle"},
+        )
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/json"
+    data = r.json()
+    assert data["data"] == seeded_shuffle(mock_data, 42, limit=5)
+    assert data["count"] == 5
+    assert data["metadata"]["method"] == "shuffle"
+    assert data["message"].startswith("Successfully selected 5 items")
+
+
 def test_datasets_load_v2_filter_method(client, monkeypatch):
     monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
     mock_data = [
@@ -579,7 +654,7 @@ def test_datasets_load_v2_filter_method(client, monkeypatch):
         {"id": 2, "cat": "B"},
         {"id": 3, "cat": "A"},
     ]
-    with patch.object(server, "load_all_data", return_value=mock_data):
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=DataPool(mock_data)):
         r = client.get(
             "/datasets/load",
             params={
@@ -598,6 +673,321 @@ def test_datasets_load_v2_filter_method(client, monkeypatch):
     assert all(item.get("cat") == "A" for item in data["data"])
 
 
+def _versioned_pool(items):
+    return DataPool(items, (("/data/web_1/main.json", 1, 2),))
+
+
+def test_datasets_load_etag_and_304(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    server._LOAD_RESPONSE_CACHE.clear()
+    params = {"project_key": "web_1", "entity_type": "movies", "seed_value": 42, "limit": 5}
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool([{"id": i} for i in range(100)])):
+        first = client.get("/datasets/load", params=params)
+        etag = first.headers["etag"]
+        not_modified = client.get("/datasets/load", params=params, headers={"If-None-Match": etag})
+        other_seed = client.get("/datasets/load", params={**params, "seed_value": 43}, headers={"If-None-Match": etag})
+    assert first.status_code == 200
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert other_seed.status_code == 200
+    assert other_seed.headers["etag"] != etag
+
+
+def test_datasets_load_etag_changes_with_pool_version(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    params = {"project_key": "web_1", "entity_type": "movies", "seed_value": 42, "limit": 5}
+    items = [{"id": i} for i in range(100)]
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool(items)):
+        etag = client.get("/datasets/load", params=params).headers["etag"]
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=DataPool(items, (("/data/web_1/main.json", 9, 2),))):
+        r = client.get("/datasets/load", params=params, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+
+
+def test_datasets_load_cached_body_reused_without_reselecting(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    server._LOAD_RESPONSE_CACHE.clear()
+    params = {"project_key": "web_1", "entity_type": "movies", "seed_value": 7, "limit": 5, "method": "shuffle"}
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool([{"id": i} for i in range(100)])):
+        first = client.get("/datasets/load", params=params)
+        with patch.object(server, "_apply_seeded_selection_indices", side_effect=AssertionError("selection re-run")):
+            second = client.get("/datasets/load", params=params)
+    assert second.status_code == 200
+    assert second.content == first.content
+
+
+def test_datasets_load_serves_cached_gzip_body(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    server._LOAD_RESPONSE_CACHE.clear()
+    items = [{"id": i, "description": "x" * 200} for i in range(100)]
+    params = {"project_key": "web_1", "entity_type": "movies", "seed_value": 7, "limit": 50}
+    offloaded = []
+    to_thread = asyncio.to_thread
+
+    async def _recording_to_thread(func, *args):
+        offloaded.append(func)
+        return await to_thread(func, *args)
+
+    monkeypatch.setattr(server.asyncio, "to_thread", _recording_to_thread)
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool(items)):
+        zipped = client.get("/datasets/load", params=params, headers={"Accept-Encoding": "gzip"})
+        again = client.get("/datasets/load", params=params, headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/datasets/load", params=params, headers={"Accept-Encoding": "identity"})
+        revalidated = client.get("/datasets/load", params=params, headers={"If-None-Match": zipped.headers["etag"]})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["etag"].endswith('-gzip"')
+    # Compressed once, off the event loop; the second request reuses the cached copy
+    assert offloaded == [server._LOAD_RESPONSE_CACHE.gzipped] and again.content == zipped.content
+    assert "content-encoding" not in plain.headers
+    assert zipped.json() == plain.json()
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == zipped.headers["etag"]
+
+
+def test_datasets_load_distribute_proportional_allocation(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    mock_data = [{"id": i, "category": "big" if i < 80 else "small"} for i in range(100)]
+    params = {"project_key": "web_1", "entity_type": "products", "seed_value": 7, "limit": 10, "method": "distribute"}
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=DataPool(mock_data)):
+        proportional = client.get("/datasets/load", params={**params, "allocation": "proportional"})
+        equal = client.get("/datasets/load", params=params)
+        invalid = client.get("/datasets/load", params={**params, "allocation": "random"})
+    assert [item["category"] for item in proportional.json()["data"]].count("big") == 8
+    assert [item["category"] for item in equal.json()["data"]].count("big") == 5
+    assert invalid.status_code == 422
+
+
+# --- /datasets/load pagination ---
+def _walk_pages(client, params, first_page_params):
+    pages = [client.get("/datasets/load", params={**params, **first_page_params}).json()]
+    while pages[-1]["metadata"]["nextCursor"]:
+        pages.append(client.get("/datasets/load", params={**params, "cursor": pages[-1]["metadata"]["nextCursor"]}).json())
+    return pages
+
+
+@pytest.mark.parametrize("method", ["select", "shuffle", "filter"])
+def test_datasets_load_pages_cover_seeded_order_once(client, monkeypatch, method):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    items = [{"id": i, "cat": "AB"[i % 2]} for i in range(95)]
+    params = {"project_key": "web_1", "entity_type": "movies", "seed_value": 42, "limit": 20, "method": method, "filter_key": "cat", "filter_values": "A"}
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool(items)):
+        pages = _walk_pages(client, params, {"offset": 0})
+    ids = [item["id"] for page in pages for item in page["data"]]
+    expected_total = 48 if method == "filter" else 95
+    assert len(ids) == len(set(ids)) == expected_total
+    assert pages[0]["metadata"]["offset"] == 0 and pages[1]["metadata"]["offset"] == 20
+    assert all(page["metadata"]["total"] == expected_total for page in pages)
+    if method == "shuffle":
+        assert ids == [item["id"] for item in seeded_shuffle(items, 42)]
+    if method == "filter":
+        assert all(i % 2 == 0 for i in ids)
+
+
+def test_datasets_load_offset_page_matches_cursor_page(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    params = {"project_key": "web_1", "entity_type": "movies", "seed_value": 7, "limit": 10}
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool([{"id": i} for i in range(50)])):
+        first = client.get("/datasets/load", params={**params, "offset": 0}).json()
+        by_cursor = client.get("/datasets/load", params={**params, "cursor": first["metadata"]["nextCursor"]}).json()
+        by_offset = client.get("/datasets/load", params={**params, "offset": 10}).json()
+    assert by_cursor["data"] == by_offset["data"]
+    assert by_cursor["metadata"]["poolVersion"] == first["metadata"]["poolVersion"]
+
+
+def test_datasets_load_original_data_pages_in_file_order(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "false")
+    params = {"project_key": "web_1", "entity_type": "movies", "seed_value": 9, "limit": 4}
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=DataPool([{"id": i} for i in range(10)])):
+        pages = _walk_pages(client, params, {"offset": 0})
+    assert [[item["id"] for item in page["data"]] for page in pages] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert pages[-1]["metadata"]["nextCursor"] is None
+
+
+def test_datasets_load_cursor_rejected_after_pool_changes(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    params = {"project_key": "web_1", "entity_type": "movies", "seed_value": 7, "limit": 10}
+    items = [{"id": i} for i in range(50)]
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool(items)):
+        cursor = client.get("/datasets/load", params={**params, "offset": 0}).json()["metadata"]["nextCursor"]
+    appended = DataPool(items + [{"id": 50}], (("/data/web_1/main.json", 1, 3),))
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=appended):
+        r = client.get("/datasets/load", params={**params, "cursor": cursor})
+    assert r.status_code == 409
+
+
+def test_datasets_load_pagination_errors(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    params = {"project_key": "web_1", "entity_type": "movies", "seed_value": 7, "limit": 10}
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool([{"id": i} for i in range(50)])):
+        cursor = client.get("/datasets/load", params={**params, "offset": 0}).json()["metadata"]["nextCursor"]
+        both = client.get("/datasets/load", params={**params, "offset": 0, "cursor": cursor})
+        garbage = client.get("/datasets/load", params={**params, "cursor": "not-a-cursor"})
+        other_seed = client.get("/datasets/load", params={**params, "seed_value": 8, "cursor": cursor})
+        distribute = client.get("/datasets/load", params={**params, "method": "distribute", "offset": 0})
+        negative = client.get("/datasets/load", params={**params, "offset": -1})
+    assert both.status_code == 400
+    assert garbage.status_code == 400
+    assert other_seed.status_code == 400
+    assert distribute.status_code == 400
+    assert negative.status_code == 422
+
+
+def test_datasets_load_unpaginated_metadata_unchanged(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool([{"id": i} for i in range(50)])):
+        meta = client.get("/datasets/load", params={"project_key": "web_1", "entity_type": "movies", "seed_value": 7, "limit": 10}).json()["metadata"]
+    assert "nextCursor" not in meta and "offset" not in meta
+
+
+# --- /datasets/load fields projection ---
+def test_datasets_load_fields_projection(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    items = [{"id": i, "title": f"t{i}", "price": i * 2, "reviews": [{"text": "long"}] * 5} for i in range(40)]
+    params = {"project_key": "web_3", "entity_type": "products", "seed_value": 11, "limit": 5}
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool(items)):
+        full = client.get("/datasets/load", params=params).json()
+        projected = client.get("/datasets/load", params={**params, "fields": "title, id,title,missing"}).json()
+        paged = client.get("/datasets/load", params={**params, "fields": "price", "offset": 0}).json()
+    assert projected["data"] == [{"title": item["title"], "id": item["id"]} for item in full["data"]]
+    assert projected["metadata"]["fields"] == ["title", "id", "missing"]
+    assert "fields" not in full["metadata"]
+    assert all(list(item) == ["price"] for item in paged["data"])
+
+
+def test_datasets_load_fields_original_data_and_batch(client, monkeypatch):
+    items = [{"id": i, "name": f"n{i}", "menu": ["x"]} for i in range(10)]
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool(items)):
+        original = client.get("/datasets/load", params={"project_key": "web_7", "entity_type": "restaurants", "seed_value": 1, "limit": 3, "fields": "name"}).json()
+        batch = client.post("/datasets/load-batch", json={"loads": [{"project_key": "web_7", "entity_type": "restaurants", "seed_value": 1, "limit": 2, "fields": "id"}]}).json()
+    assert original["data"] == [{"name": "n0"}, {"name": "n1"}, {"name": "n2"}]
+    assert batch["results"][0]["data"] == [{"id": 0}, {"id": 1}]
+
+
+def _ndjson_lines(response):
+    return [orjson.loads(line) for line in response.text.splitlines()]
+
+
+def test_datasets_load_ndjson_matches_json_body(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    items = [{"id": i, "cat": "AB"[i % 3 == 0]} for i in range(60)]
+    params = {"project_key": "web_1", "entity_type": "movies", "seed_value": 9, "limit": 12, "method": "distribute", "filter_key": "cat"}
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool(items)):
+        body = client.get("/datasets/load", params=params).json()
+        by_param = client.get("/datasets/load", params={**params, "format": "ndjson"})
+        by_accept = client.get("/datasets/load", params=params, headers={"Accept": "application/x-ndjson"})
+        forced_json = client.get("/datasets/load", params={**params, "format": "json"}, headers={"Accept": "application/x-ndjson"})
+    assert by_param.headers["content-type"].startswith("application/x-ndjson")
+    assert "etag" not in by_param.headers
+    lines = _ndjson_lines(by_param)
+    assert lines[:-1] == body["data"]
+    assert lines[-1] == {"message": body["message"], "metadata": body["metadata"], "count": body["count"]}
+    assert by_accept.text == by_param.text
+    assert forced_json.json() == body
+
+
+def test_datasets_load_ndjson_pages_and_fields(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    items = [{"id": i, "title": f"t{i}"} for i in range(30)]
+    params = {"project_key": "web_1", "entity_type": "movies", "seed_value": 4, "limit": 10, "method": "shuffle", "offset": 10, "fields": "id"}
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool(items)):
+        page = client.get("/datasets/load", params=params).json()
+        streamed = _ndjson_lines(client.get("/datasets/load", params={**params, "format": "ndjson"}))
+        rejected = client.get("/datasets/load", params={**params, "method": "distribute", "format": "ndjson"})
+    assert streamed[:-1] == page["data"]
+    assert streamed[-1]["metadata"] == page["metadata"]
+    assert rejected.status_code == 400
+
+
+def test_datasets_export_streams_full_pool_in_chunks(client, monkeypatch):
+    monkeypatch.setattr(server, "_NDJSON_CHUNK_ITEMS", 7)
+    items = [{"id": i, "name": f"n{i}"} for i in range(30)]
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=_versioned_pool(items)) as load:
+        response = client.get("/datasets/export", params={"project_key": "web_1", "entity_type": "movies"})
+        projected = _ndjson_lines(client.get("/datasets/export", params={"project_key": "web_1", "entity_type": "movies", "fields": "name"}))
+    assert load.call_args.kwargs == {"full_pool": True}
+    lines = _ndjson_lines(response)
+    assert lines[:-1] == items
+    assert lines[-1]["count"] == 30
+    assert lines[-1]["metadata"]["totalAvailable"] == 30
+    assert lines[-1]["metadata"]["poolVersion"]
+    assert projected[:-1] == [{"name": item["name"]} for item in items]
+    assert projected[-1]["metadata"]["fields"] == ["name"]
+
+
+def test_datasets_export_empty_pool_404_and_error_500(client):
+    params = {"project_key": "web_1", "entity_type": "movies"}
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, return_value=DataPool([])):
+        assert client.get("/datasets/export", params=params).status_code == 404
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, side_effect=RuntimeError("boom")):
+        response = client.get("/datasets/export", params=params)
+    assert response.status_code == 500
+    assert "boom" in response.json()["detail"]
+
+
+# --- POST /datasets/load-batch ---
+def _pools_by_entity(pools):
+    async def _load(project_key, entity_type, *, seed_value=None):
+        if entity_type not in pools:
+            raise ValueError("Invalid entity_type: only alphanumeric, underscore, hyphen allowed")
+        return pools[entity_type]
+
+    return AsyncMock(side_effect=_load)
+
+
+def test_datasets_load_batch_matches_single_loads(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    pools = {"doctors": _versioned_pool([{"id": i} for i in range(30)]), "appointments": _versioned_pool([{"id": i, "category": "AB"[i % 2]} for i in range(30)])}
+    loads = [
+        {"project_key": "web_14", "entity_type": "doctors", "seed_value": 42, "limit": 5},
+        {"project_key": "web_14", "entity_type": "appointments", "seed_value": 42, "limit": 4, "method": "distribute"},
+        {"project_key": "web_14", "entity_type": "doctors", "seed_value": 43, "limit": 3, "method": "shuffle"},
+    ]
+    loader = _pools_by_entity(pools)
+    with patch.object(server, "load_pool_async", loader):
+        r = client.post("/datasets/load-batch", json={"loads": loads})
+        batch_loads = [c.args[1] for c in loader.call_args_list]
+        singles = [client.get("/datasets/load", params=spec).json() for spec in loads]
+    assert r.status_code == 200
+    body = r.json()
+    assert body["count"] == 3
+    assert body["results"] == singles
+    # doctors is loaded once for both doctors specs within the batch
+    assert batch_loads == ["doctors", "appointments"]
+
+
+def test_datasets_load_batch_reports_errors_per_spec(client, monkeypatch):
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    pools = {"doctors": _versioned_pool([{"id": 1}]), "empty": DataPool([])}
+    loads = [
+        {"project_key": "web_14", "entity_type": "doctors", "seed_value": 2, "limit": 1},
+        {"project_key": "web_14", "entity_type": "empty", "seed_value": 2},
+        {"project_key": "web_14", "entity_type": "bad..name", "seed_value": 2},
+    ]
+    with patch.object(server, "load_pool_async", _pools_by_entity(pools)):
+        r = client.post("/datasets/load-batch", json={"loads": loads})
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert results[0]["count"] == 1
+    assert results[1]["error"]["status_code"] == 404
+    assert results[2]["error"]["status_code"] == 400
+
+
+def test_datasets_load_batch_unexpected_error_is_500_entry(client):
+    with patch.object(server, "load_pool_async", new_callable=AsyncMock, side_effect=RuntimeError("disk gone")):
+        r = client.post("/datasets/load-batch", json={"loads": [{"project_key": "web_1", "entity_type": "movies", "seed_value": 1}]})
+    assert r.json()["results"][0]["error"] == {"status_code": 500, "detail": "Failed to load dataset: disk gone"}
+
+
+def test_datasets_load_batch_validates_specs(client):
+    assert client.post("/datasets/load-batch", json={"loads": []}).status_code == 422
+    too_many = [{"project_key": "web_1", "entity_type": "movies", "seed_value": 1}] * (server.DATASET_BATCH_MAX_LOADS + 1)
+    assert client.post("/datasets/load-batch", json={"loads": too_many}).status_code == 422
+    bad_limit = [{"project_key": "web_1", "entity_type": "movies", "seed_value": 1, "limit": 501}]
+    assert client.post("/datasets/load-batch", json={"loads": bad_limit}).status_code == 422
+
+
 # --- GET /datasets/pools and GET /datasets/pool/info (require pool) ---
 def test_datasets_pools_returns_503_without_pool(client):
     r = client.get("/datasets/pools")
@@ -907,6 +1297,249 @@ def test_save_events_db_returns_none_results_500(client_with_pool):
     assert r.status_code == 500
 
 
+def _batch_rows(first_id, count):
+    created = datetime.now(timezone.utc)
+    # RETURNING order is not guaranteed; the endpoint must order by id
+    return [{"id": first_id + i, "created_at": created} for i in reversed(range(count))]
+
+
+def test_save_events_batch_single_insert_keeps_header_precedence(client_with_pool):
+    server.app.state.pool.fetch = AsyncMock(return_value=_batch_rows(10, 3))
+    events = [
+        {"web_agent_id": "body-agent", "validator_id": "v9", "web_url": "https://example.com:8443/a?x=1", "data": {"event": "click"}},
+        {"web_url": "https://example.com/b", "data": {"event": "view"}},
+        {"web_agent_id": "other", "web_url": "http://shop.test/c", "data": {"n": [1, 2]}},
+    ]
+    r = client_with_pool.post("/save_events/batch", json={"events": events}, headers={"X-Validator-Id": "v-header", "X-WebAgent-Id": "  "})
+    assert r.status_code == 201
+    data = r.json()
+    assert data["count"] == 3
+    assert [e["event_id"] for e in data["events"]] == [10, 11, 12]
+    server.app.state.pool.fetch.assert_awaited_once()
+    sql, web_agent_ids, web_urls, validator_ids, payloads = server.app.state.pool.fetch.await_args.args
+    assert sql == server.INSERT_EVENTS_BATCH_SQL
+    assert web_agent_ids == ["body-agent", "UNKNOWN_AGENT", "other"]
+    assert web_urls == ["https://example.com:8443", "https://example.com", "http://shop.test"]
+    assert validator_ids == ["v-header"] * 3
+    # Serialized by the connection's jsonb codec, not beforehand
+    assert payloads == [{"event": "click"}, {"event": "view"}, {"n": [1, 2]}]
+
+
+def test_save_events_batch_identity_matches_single_save(client_with_pool):
+    event = {"web_url": "https://example.com/page", "validator_id": "v2", "data": {"event": "click"}}
+    headers = {"X-WebAgent-Id": "agent-h"}
+    server.app.state.pool.fetch = AsyncMock(return_value=_batch_rows(1, 1))
+    assert client_with_pool.post("/save_events/", json=event, headers=headers).status_code == 201
+    assert client_with_pool.post("/save_events/batch", json={"events": [event]}, headers=headers).status_code == 201
+    single_args = server.app.state.pool.fetchrow.await_args.args[1:]
+    batch_args = server.app.state.pool.fetch.await_args.args[1:]
+    assert tuple(column[0] for column in batch_args) == single_args
+
+
+def test_save_events_batch_validation_and_errors(client_with_pool):
+    event = {"web_url": "https://example.com/page", "data": {}}
+    assert client_with_pool.post("/save_events/batch", json={"events": []}).status_code == 422
+    assert client_with_pool.post("/save_events/batch", json={"events": [event, {"web_url": "nope", "data": {}}]}).status_code == 422
+    server.app.state.pool.fetch = AsyncMock(return_value=_batch_rows(1, 1))
+    assert client_with_pool.post("/save_events/batch", json={"events": [event, event]}).status_code == 500
+
+    class _FakePostgresError(PostgresError):
+        pgcode = "23505"
+
+    server.app.state.pool.fetch = AsyncMock(side_effect=_FakePostgresError("dup"))
+    r = client_with_pool.post("/save_events/batch", json={"events": [event]})
+    assert r.status_code == 500
+    assert "23505" in r.json()["detail"]
+
+
+def test_save_events_reject_identifiers_longer_than_their_columns(client_with_pool):
+    event = {"web_url": "https://example.com/page", "data": {}}
+    too_long = "x" * 256
+    assert client_with_pool.post("/save_events/", json={**event, "validator_id": too_long}).status_code == 422
+    r = client_with_pool.post("/save_events/", json=event, headers={"X-WebAgent-Id": too_long})
+    assert r.status_code == 422
+    assert "X-WebAgent-Id" in r.json()["detail"]
+    assert client_with_pool.post("/save_events/batch", json={"events": [event]}, headers={"X-Validator-Id": too_long}).status_code == 422
+    server.app.state.pool.fetchrow.assert_not_awaited()
+    assert client_with_pool.post("/save_events/", json=event, headers={"X-WebAgent-Id": "x" * 255}).status_code == 201
+
+
+def test_save_events_batch_returns_503_without_pool(client):
+    r = client.post("/save_events/batch", json={"events": [{"web_url": "https://example.com", "data": {}}]})
+    assert r.status_code == 503
+
+
+class _IdReservingPool:
+    """Stands in for the DB pool behind an EventBuffer: only reserves ids."""
+
+    def __init__(self, first_id=500):
+        self.next_id = first_id
+
+    async def fetch(self, sql, count):
+        rows = [{"id": self.next_id + i} for i in range(count)]
+        self.next_id += count
+        return rows
+
+
+def test_save_events_write_behind_queues_and_reads_back(client_with_pool, monkeypatch):
+    buffer = EventBuffer(_IdReservingPool(), max_events=10, flush_events=5)
+    monkeypatch.setattr(server.app.state, "event_buffer", buffer, raising=False)
+    r = client_with_pool.post(
+        "/save_events/",
+        json={"web_url": "https://example.com/page", "data": {"event": "type"}},
+        headers={"X-WebAgent-Id": "agent1", "X-Validator-Id": "v1"},
+    )
+    assert r.status_code == 201
+    assert r.json()["event_id"] == 500
+    server.app.state.pool.fetchrow.assert_not_awaited()
+    assert len(buffer) == 1
+
+    events = client_with_pool.get("/get_events/", params={"web_url": "https://example.com", "web_agent_id": "agent1", "validator_id": "v1"}).json()
+    assert [e["id"] for e in events] == [500, 1]
+    assert events[0]["data"] == {"event": "type"}
+    other_key = client_with_pool.get("/get_events/", params={"web_url": "https://example.com", "web_agent_id": "agent2", "validator_id": "v1"}).json()
+    assert [e["id"] for e in other_key] == [1]
+
+    reset = client_with_pool.delete("/reset_events/", params={"web_url": "https://example.com", "web_agent_id": "agent1", "validator_id": "v1"})
+    assert reset.json()["deleted_count"] == 3
+    assert len(buffer) == 0
+
+
+def test_save_events_write_behind_full_buffer_returns_429(client_with_pool, monkeypatch):
+    buffer = EventBuffer(_IdReservingPool(), max_events=1, flush_events=5)
+    monkeypatch.setattr(server.app.state, "event_buffer", buffer, raising=False)
+    event = {"web_agent_id": "agent1", "web_url": "https://example.com/page", "data": {}}
+    assert client_with_pool.post("/save_events/", json=event).status_code == 201
+    r = client_with_pool.post("/save_events/", json=event)
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "1"
+
+
+def test_reset_validator_events_needs_partitioned_schema(client_with_pool, monkeypatch):
+    buffer = EventBuffer(_IdReservingPool(), flush_events=5)
+    monkeypatch.setattr(server.app.state, "event_buffer", buffer, raising=False)
+    monkeypatch.setattr(server.app.state, "events_partitioned", False, raising=False)
+    client_with_pool.post("/save_events/", json={"web_url": "https://example.com", "validator_id": "v1", "data": {}})
+    server.app.state.pool.fetchrow = AsyncMock()
+    r = client_with_pool.delete("/reset_events/validator", params={"validator_id": "v1"})
+    assert r.status_code == 409
+    assert "002_events_partitioned.sql" in r.json()["detail"]
+    server.app.state.pool.fetchrow.assert_not_awaited()
+    assert len(buffer) == 1
+
+
+def test_reset_validator_events_partitioned_truncates(client_with_pool, monkeypatch):
+    buffer = EventBuffer(_IdReservingPool(), flush_events=5)
+    monkeypatch.setattr(server.app.state, "event_buffer", buffer, raising=False)
+    monkeypatch.setattr(server.app.state, "events_partitioned", True, raising=False)
+    client_with_pool.post("/save_events/", json={"web_url": "https://example.com", "validator_id": "v1", "data": {}})
+    client_with_pool.post("/save_events/", json={"web_url": "https://example.com", "validator_id": "v2", "data": {}})
+    server.app.state.pool.fetchrow = AsyncMock(return_value={"deleted": 120000, "truncated": True})
+    r = client_with_pool.delete("/reset_events/validator", params={"validator_id": "v1"})
+    assert r.status_code == 200
+    assert r.json() == {"message": "Successfully deleted about 120001 events for validator 'v1'", "validator_id": "v1", "deleted_count": 120001, "approximate": True}
+    assert [e.validator_id for e in buffer.unflushed(("https://example.com", "UNKNOWN_AGENT", "v2"))] == ["v2"] and len(buffer) == 1
+    assert server.app.state.pool.fetchrow.await_args.args == (server.RESET_VALIDATOR_EVENTS_SQL, "v1")
+    # A validator without a partition yet: its rows were deleted from events_default and counted
+    server.app.state.pool.fetchrow = AsyncMock(return_value={"deleted": 3, "truncated": False})
+    r = client_with_pool.delete("/reset_events/validator", params={"validator_id": "v3"})
+    assert r.json() == {"message": "Successfully deleted 3 events for validator 'v3'", "validator_id": "v3", "deleted_count": 3, "approximate": False}
+    assert client_with_pool.delete("/reset_events/validator").status_code == 422
+
+
+def test_reset_validator_events_errors(client_with_pool, monkeypatch):
+    class _FakePostgresError(PostgresError):
+        pgcode = "55P03"
+
+    monkeypatch.setattr(server.app.state, "events_partitioned", True, raising=False)
+    server.app.state.pool.fetchrow = AsyncMock(side_effect=_FakePostgresError("lock timeout"))
+    r = client_with_pool.delete("/reset_events/validator", params={"validator_id": "v1"})
+    assert r.status_code == 500
+    assert "validator reset: 55P03" in r.json()["detail"]
+
+
+def test_reset_validator_events_returns_503_without_pool(client):
+    assert client.delete("/reset_events/validator", params={"validator_id": "v1"}).status_code == 503
+
+
+def _event_rows(ids, base=datetime(2020, 1, 1, tzinfo=timezone.utc)):
+    return [{"id": i, "web_agent_id": "agent1", "web_url": "https://example.com", "validator_id": "v1", "data": '{"n": %d}' % i, "created_at": base + timedelta(seconds=i)} for i in ids]
+
+
+_EVENTS_KEY_PARAMS = {"web_url": "https://example.com/page", "web_agent_id": "agent1", "validator_id": "v1"}
+
+
+def test_get_events_incremental_keyset_and_cursor(client_with_pool):
+    pool = server.app.state.pool
+    pool.fetch = AsyncMock(return_value=_event_rows([1, 2, 3]))
+    first = client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "limit": 2})
+    assert first.status_code == 200
+    assert [e["id"] for e in first.json()] == [1, 2]
+    assert first.headers["x-has-more"] == "true"
+    sql, *args = pool.fetch.await_args.args
+    assert sql == server.SELECT_EVENTS_AFTER_SQL
+    assert args[:3] == ["https://example.com", "agent1", "v1"] and args[4:6] == [0, 3]
+    # Only events older than the settle margin are paged
+    settled = datetime.now(timezone.utc) - timedelta(milliseconds=server.EVENTS_PAGE_SETTLE_MS)
+    assert timedelta(0) <= settled - args[6] < timedelta(seconds=5)
+
+    pool.fetch = AsyncMock(return_value=_event_rows([3]))
+    second = client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "cursor": first.headers["x-next-cursor"]})
+    assert [e["id"] for e in second.json()] == [3]
+    assert second.headers["x-has-more"] == "false"
+    after = pool.fetch.await_args.args[4:6]
+    assert tuple(after) == (datetime(2020, 1, 1, 0, 0, 2, tzinfo=timezone.utc), 2)
+
+    # Nothing new: the cursor stays where it was so the next poll resumes from there
+    pool.fetch = AsyncMock(return_value=[])
+    idle = client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "cursor": second.headers["x-next-cursor"]})
+    assert idle.json() == []
+    assert idle.headers["x-next-cursor"] == second.headers["x-next-cursor"]
+
+
+def test_get_events_since_and_after_id_positions(client_with_pool):
+    pool = server.app.state.pool
+    pool.fetch = AsyncMock(return_value=_event_rows([7]))
+    client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "since": "2020-01-01T00:00:05"})
+    assert tuple(pool.fetch.await_args.args[4:7]) == (datetime(2020, 1, 1, 0, 0, 5, tzinfo=timezone.utc), 2**31 - 1, server.EVENTS_PAGE_MAX_LIMIT + 1)
+
+    position = datetime(2020, 1, 1, 0, 0, 6, tzinfo=timezone.utc)
+    pool.fetchval = AsyncMock(return_value=position)
+    r = client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "after_id": 6, "limit": 10})
+    assert [e["id"] for e in r.json()] == [7]
+    assert pool.fetchval.await_args.args == (server.SELECT_EVENT_POSITION_SQL, 6, "https://example.com", "agent1", "v1")
+    assert tuple(pool.fetch.await_args.args[4:7]) == (position, 6, 11)
+
+    pool.fetchval = AsyncMock(return_value=None)
+    assert client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "after_id": 99}).status_code == 404
+
+
+def test_get_events_incremental_rejects_bad_positions(client_with_pool):
+    assert client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "after_id": 1, "since": "2020-01-01T00:00:00Z"}).status_code == 400
+    assert client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "cursor": "not-a-cursor"}).status_code == 400
+    naive = server._encode_events_cursor((datetime(2020, 1, 1), 1))
+    assert client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "cursor": naive}).json() == {"detail": "Invalid cursor"}
+    assert client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "limit": 0}).status_code == 422
+
+
+def test_get_events_incremental_merges_write_behind_events(client_with_pool, monkeypatch):
+    buffer = EventBuffer(_IdReservingPool(first_id=900), flush_events=5)
+    monkeypatch.setattr(server.app.state, "event_buffer", buffer, raising=False)
+    assert client_with_pool.post("/save_events/", json={**_EVENTS_KEY_PARAMS, "data": {"n": 900}}).status_code == 201
+    server.app.state.pool.fetch = AsyncMock(return_value=_event_rows([1, 2]))
+    r = client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "limit": 2})
+    assert [e["id"] for e in r.json()] == [1, 2]
+    # Just queued: held back until it is older than the settle margin
+    assert r.headers["x-has-more"] == "false"
+    server.app.state.pool.fetch = AsyncMock(return_value=[])
+    pending = client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "cursor": r.headers["x-next-cursor"]})
+    assert pending.json() == [] and pending.headers["x-next-cursor"] == r.headers["x-next-cursor"]
+    monkeypatch.setattr(server, "EVENTS_PAGE_SETTLE_MS", 0)
+    rest = client_with_pool.get("/get_events/", params={**_EVENTS_KEY_PARAMS, "cursor": r.headers["x-next-cursor"]})
+    assert [e["id"] for e in rest.json()] == [900]
+    assert rest.json()[0]["data"] == {"n": 900}
+
+
 def test_get_events_postgres_error_returns_500(client_with_pool):
     """When DB fetch raises PostgresError, get_events should return 500."""
     from asyncpg.exceptions import PostgresError
@@ -928,6 +1561,53 @@ def test_get_events_postgres_error_returns_500(client_with_pool):
     assert r.status_code == 500
 
 
+def test_events_connection_runs_event_statements_prepared(monkeypatch):
+    conn = server.EventsConnection.__new__(server.EventsConnection)
+    # Never connected: Connection.__del__ sees a closed connection
+    conn._aborted = True
+    select, delete = MagicMock(), MagicMock()
+    select.fetch = AsyncMock(return_value=["prepared row"])
+    delete.fetchval = AsyncMock(return_value=3)
+    conn._event_statements = {server.SELECT_EVENTS_SQL: select, server.DELETE_EVENTS_SQL: delete}
+    fallback = AsyncMock(return_value=["cached row"])
+    monkeypatch.setattr(asyncpg.Connection, "fetch", fallback)
+    monkeypatch.setattr(asyncpg.Connection, "is_in_transaction", lambda self: False)
+
+    assert asyncio.run(conn.fetch(server.SELECT_EVENTS_SQL, "u", "a", "v")) == ["prepared row"]
+    select.fetch.assert_awaited_once_with("u", "a", "v", timeout=None)
+    assert asyncio.run(conn.fetchval(server.DELETE_EVENTS_SQL, "u", "a", "v")) == 3
+    assert asyncio.run(conn.fetch("SELECT 1")) == ["cached row"]
+
+    # A statement invalidated by a schema change is dropped and the query re-prepared by asyncpg
+    select.fetch = AsyncMock(side_effect=InvalidCachedStatementError("cached statement plan is invalid"))
+    assert asyncio.run(conn.fetch(server.SELECT_EVENTS_SQL, "u", "a", "v")) == ["cached row"]
+    assert list(conn._event_statements) == [server.DELETE_EVENTS_SQL]
+    assert fallback.await_args.args == (server.SELECT_EVENTS_SQL, "u", "a", "v")
+
+
+def test_init_db_connection_registers_jsonb_codec_and_prepares_statements():
+    conn = MagicMock()
+    conn.set_type_codec = AsyncMock()
+    conn.prepare = AsyncMock(side_effect=lambda sql: f"statement:{sql}")
+    asyncio.run(server.init_db_connection(conn))
+    codec = conn.set_type_codec.await_args
+    assert codec.args == ("jsonb",) and codec.kwargs["format"] == "binary" and codec.kwargs["schema"] == "pg_catalog"
+    # Kept on the connection, which runs the event statements through them
+    assert conn._event_statements == {sql: f"statement:{sql}" for sql in server.PREPARED_EVENT_STATEMENTS}
+    assert {server.INSERT_EVENT_SQL, server.SELECT_EVENTS_SQL, server.DELETE_EVENTS_SQL} <= set(conn._event_statements)
+
+    # Before the events table exists the connection is still usable
+    conn.prepare = AsyncMock(side_effect=UndefinedTableError('relation "events" does not exist'))
+    asyncio.run(server.init_db_connection(conn))
+    assert conn.prepare.await_count == 1 and conn._event_statements == {}
+
+    encode, decode = codec.kwargs["encoder"], codec.kwargs["decoder"]
+    assert encode({"a": [1, "é"]}) == b'\x01{"a":[1,"\xc3\xa9"]}'
+    # Text is already JSON (write-behind COPY rows): passed through as is
+    assert encode('{"n": 1}') == b'\x01{"n": 1}'
+    assert decode(encode({"a": [1, "é"]})) == {"a": [1, "é"]}
+
+
 def test_init_db_pool_retries_and_raises_on_postgres_error(monkeypatch):
     """init_db_pool retries on PostgresError and eventually raises RuntimeError."""
     from asyncpg.exceptions import PostgresError
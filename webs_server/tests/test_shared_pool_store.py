@@ -0,0 +1,104 @@
+# Unit tests for shared_pool_store (packed, memory-mapped pools shared across workers).
+"""
+Unit tests for shared_pool_store: build a store from a temp BASE_PATH, attach it, and check that
+data_handler serves pools from the mapping only while the files are unchanged.
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+import data_handler as dh
+import shared_pool_store as sps
+from seeded_selector import IndexSelector
+
+
+@pytest.fixture(autouse=True)
+def patch_base_path(tmp_path, monkeypatch):
+    """Point data_handler.BASE_PATH at a temp dir with one project and reset caches/store."""
+    base = tmp_path / "data"
+    proj = base / "web_1_demo"
+    proj.mkdir(parents=True)
+    (proj / "main.json").write_text(json.dumps({"movies": ["./movies.json", "./movies_2.json"]}), encoding="utf-8")
+    (proj / "movies.json").write_text(json.dumps([{"id": 1, "title": "é"}, {"id": 2}]), encoding="utf-8")
+    (proj / "movies_2.json").write_text(json.dumps([{"id": 3}]), encoding="utf-8")
+    monkeypatch.setattr(dh, "BASE_PATH", str(base))
+    monkeypatch.setenv("ENABLE_DYNAMIC_V2", "true")
+    dh.clear_pool_cache()
+    yield base
+    dh.set_shared_pool_source(None)
+    dh.clear_pool_cache()
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / "pools.bin")
+    assert sps.build_shared_store(path) == 2
+    dh.clear_pool_cache()
+    attached = sps.attach_shared_store(path)
+    assert attached is not None
+    yield attached
+    sps.detach_shared_store(attached)
+
+
+def _no_parse(*args, **kwargs):
+    raise AssertionError("data file parsed despite shared store")
+
+
+def test_attached_store_serves_pools_without_parsing(store, monkeypatch):
+    monkeypatch.setattr(dh, "_parse_json_file_to_items", _no_parse)
+    full = dh.load_pool("web_1_demo", "movies", seed_value=5)
+    first = dh.load_pool("web_1_demo", "movies", seed_value=1)
+    assert len(full) == 3
+    assert full.encoded[0] == b'{"id":1,"title":"\xc3\xa9"}'
+    assert full.encoded[1:] == [b'{"id":2}', b'{"id":3}']
+    assert full.items == [{"id": 1, "title": "é"}, {"id": 2}, {"id": 3}]
+    assert first.items == [{"id": 1, "title": "é"}, {"id": 2}]
+
+
+def test_store_hits_are_logged_apart_from_cache_misses(store, monkeypatch, patch_base_path):
+    logger = MagicMock()
+    monkeypatch.setattr(dh, "logger", logger)
+    dh.load_pool("web_1_demo", "movies", seed_value=5)
+    assert [c.args[0] for c in logger.debug.call_args_list] == ["Pool loaded from shared store"]
+    (Path(patch_base_path) / "web_1_demo" / "movies.json").write_text(json.dumps([{"id": 9}]), encoding="utf-8")
+    dh.load_pool("web_1_demo", "movies", seed_value=5)
+    assert logger.debug.call_args_list[-1].args[0] == "Pool cache miss"
+
+
+def test_iter_project_pools_yields_both_load_modes_of_safe_entities(patch_base_path):
+    main = Path(patch_base_path) / "web_1_demo" / "main.json"
+    main.write_text(json.dumps({"movies": ["./movies.json", "./movies_2.json"], "../bad": ["./movies.json"], "empty": []}), encoding="utf-8")
+    pools = {key[1:]: len(pool) for key, pool in dh.iter_project_pools()}
+    assert pools == {("movies", True): 2, ("movies", False): 3}
+    assert dh.is_safe_name("web_1_demo") and not dh.is_safe_name("../bad") and not dh.is_safe_name("")
+
+
+def test_mapped_pool_selection_decodes_only_picked_items(store):
+    pool = dh.load_pool("web_1_demo", "movies", seed_value=5)
+    assert pool[2] == {"id": 3}
+    assert [item["id"] for item in pool] == [1, 2, 3]
+    assert IndexSelector(pool).materialize([2, 0]) == [{"id": 3}, {"id": 1, "title": "é"}]
+    assert pool._items is None
+
+
+def test_mapped_items_index_errors(store):
+    encoded = dh.load_pool("web_1_demo", "movies", seed_value=5).encoded
+    assert encoded[-1] == b'{"id":3}'
+    with pytest.raises(IndexError):
+        encoded[3]
+
+
+def test_changed_files_fall_back_to_parsing(store, patch_base_path):
+    (Path(patch_base_path) / "web_1_demo" / "movies_2.json").write_text(json.dumps([{"id": 3}, {"id": 4}]), encoding="utf-8")
+    pool = dh.load_pool("web_1_demo", "movies", seed_value=5)
+    assert pool.items == [{"id": 1, "title": "é"}, {"id": 2}, {"id": 3}, {"id": 4}]
+
+
+def test_attach_missing_or_invalid_store_returns_none(tmp_path):
+    assert sps.attach_shared_store(str(tmp_path / "missing.bin")) is None
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"not a pool store at all")
+    assert sps.attach_shared_store(str(bad)) is None